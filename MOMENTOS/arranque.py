@@ -0,0 +1,120 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+# Presupuesto de arranque del núcleo numérico.
+# Cada módulo de cálculo se importa en un intérprete nuevo con `python -X importtime`:
+# no debe arrastrar bibliotecas de interfaz o de gráficos (ni scipy, que sólo se carga
+# al resolver sistemas grandes) y su tiempo acumulado debe quedar dentro del presupuesto.
+# Además se mide el arranque en frío de la CLI por lotes resolviendo un caso pequeño.
+# Los presupuestos son relativos a importar sólo NumPy en la misma máquina (de ~45 ms a
+# más de 100 ms según el equipo): un tope absoluto no se sostiene de una máquina a otra.
+# Sale con código 1 si algo se pasa; --factor escala los presupuestos en máquinas ruidosas.
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Importación acumulada como múltiplo de la de NumPy sola
+PRESUPUESTOS = {
+    "cargas": 1.5,
+    "singularidades": 1.5,
+    "rigidez": 1.5,
+    "combinaciones": 1.5,
+    "influencia": 1.5,
+    "viga": 1.6,
+    "cache": 1.75,
+    "procesar": 1.65,
+    "informes": 2.0,
+    "montecarlo": 1.65,
+    "trabajador": 0.25,
+}
+PROHIBIDOS = ("matplotlib", "tkinter", "scipy", "ipywidgets", "prompt_toolkit", "indeterminatebeam")
+# Arranque en frío de la CLI como múltiplo de `python -c "import numpy"`
+ARRANQUE_CLI = 2.0
+CASO_CLI = '{"id": 1, "longitud": 7, "apoyos": [[0, "rollerSupport"], [5, "simpleSupport"], ' \
+    '[7, "fixedSupport"]], "puntuales": [[1000, 2]], "distribuidas": [[2000, 2000, 1, 4]]}\n'
+
+_LINEA = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+
+def tiempos_importacion(modulo):
+    # {módulo importado: tiempo acumulado en ms}, tal como lo informa -X importtime
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=DIRECTORIO, capture_output=True, text=True, check=True,
+    ).stderr
+    tiempos = {}
+    for linea in salida.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia:
+            tiempos[coincidencia.group(3)] = int(coincidencia.group(1)) / 1000
+    return tiempos
+
+
+def importacion(modulo, repeticiones=3):
+    # (mejor tiempo acumulado en ms, módulos importados) en intérpretes nuevos
+    tiempos = [tiempos_importacion(modulo) for _ in range(repeticiones)]
+    return min(t[modulo] for t in tiempos), set(tiempos[0])
+
+
+def verificar_modulo(modulo, presupuesto, base, factor=1.0):
+    # (ms acumulados, lista de problemas); base son los ms de importar NumPy solo
+    ms, importados = importacion(modulo)
+    problemas = [f"importa {nombre}" for nombre in PROHIBIDOS if nombre in importados]
+    limite = presupuesto * base * factor
+    if ms > limite:
+        problemas.append(f"{ms:.0f} ms > {limite:.0f} ms ({presupuesto:g} × NumPy)")
+    return ms, problemas
+
+
+def _pared(argumentos, repeticiones):
+    # Mejor tiempo de pared en ms de un intérprete nuevo
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=DIRECTORIO, check=True, stdout=subprocess.DEVNULL)
+        mejor = min(mejor, (time.perf_counter() - inicio) * 1000)
+    return mejor
+
+
+def arranque_numpy(repeticiones=5):
+    # Referencia del arranque en frío: `python -c "import numpy"`
+    return _pared(["-c", "import numpy"], repeticiones)
+
+
+def arranque_cli(repeticiones=5):
+    # Mejor tiempo de pared de `python procesar.py caso.jsonl` en ms, intérprete incluido
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, "caso.jsonl")
+        with open(entrada, "w") as archivo:
+            archivo.write(CASO_CLI)
+        return _pared([os.path.join(DIRECTORIO, "procesar.py"), entrada], repeticiones)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba el presupuesto de importación y arranque.")
+    parser.add_argument("--factor", type=float, default=1.0, help="escala de todos los presupuestos")
+    args = parser.parse_args(argv)
+
+    base, _ = importacion("numpy")
+    print(f"{'numpy':>16} {base:7.1f} ms  referencia")
+    fallos = 0
+    for modulo, presupuesto in PRESUPUESTOS.items():
+        ms, problemas = verificar_modulo(modulo, presupuesto, base, args.factor)
+        fallos += bool(problemas)
+        print(f"{modulo:>16} {ms:7.1f} ms  {'; '.join(problemas) or 'ok'}")
+
+    base = arranque_numpy()
+    ms = arranque_cli()
+    limite = ARRANQUE_CLI * base * args.factor
+    fallos += ms > limite
+    print(f"{'CLI en frío':>16} {ms:7.1f} ms  {'ok' if ms <= limite else f'> {limite:.0f} ms'}"
+          f" (python -c 'import numpy': {base:.1f} ms)")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
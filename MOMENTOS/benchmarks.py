@@ -0,0 +1,484 @@
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")  # Mediciones de dibujo sin pantalla
+
+import numpy as np
+
+from cargas import PUNTUAL
+from lotes import VigaBatch
+from viga import Viga
+
+
+def _cronometrar(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def _viga_con_cargas(n, longitud=10.0):
+    viga = Viga(longitud)
+    for i in range(n):
+        viga.agregar_carga_puntual(1.0, longitud * (i + 0.5) / n)
+    return viga
+
+
+def bench_agregar_carga(tamanos=(10, 100, 1_000, 10_000), repeticiones=2_000):
+    # Costo de agregar una carga y pedir las reacciones sobre una viga con n cargas:
+    # debe mantenerse plano, frente a la suma completa que crece con n
+    for n in tamanos:
+        viga = _viga_con_cargas(n)
+
+        def incremental():
+            # Sólo se cronometra el alta; la baja devuelve la viga a n cargas
+            inicio = time.perf_counter()
+            viga.agregar_carga_puntual(1.0, 5.0)
+            viga.calcular_reacciones()
+            segundos = time.perf_counter() - inicio
+            viga.eliminar_carga_puntual(5.0, tolerancia=0.0)
+            return segundos
+
+        def suma_completa():
+            sum(c[0] for c in viga.cargas_puntuales)
+            sum(c[0] * c[1] for c in viga.cargas_puntuales)
+
+        completa = _cronometrar(suma_completa, 20)
+        yield n, sum(incremental() for _ in range(repeticiones)) / repeticiones, completa
+
+
+def _mezcla(rng, longitud, n_puntuales, n_distribuidas):
+    # Puntuales y distribuidas lineales en posiciones al azar
+    n_vigas = len(longitud)
+    puntuales = (
+        rng.uniform(1, 10, (n_vigas, n_puntuales)),
+        rng.uniform(0, 1, (n_vigas, n_puntuales)) * longitud[:, None],
+    )
+    tramos = np.sort(rng.uniform(0, 1, (n_vigas, n_distribuidas, 2)), axis=-1) * longitud[:, None, None]
+    distribuidas = (
+        rng.uniform(1, 5, (n_vigas, n_distribuidas)),
+        rng.uniform(1, 5, (n_vigas, n_distribuidas)),
+        tramos[..., 0],
+        tramos[..., 1],
+    )
+    return VigaBatch(longitud, puntuales, distribuidas)
+
+
+def bench_lote(n_vigas=100_000, repeticiones=3):
+    # Casos por segundo de VigaBatch: una carga puntual, puntual + uniforme y mezclas
+    # al azar de puntuales y distribuidas lineales
+    rng = np.random.default_rng(0)
+    longitud = rng.uniform(5, 15, n_vigas)
+    puntuales = (rng.uniform(1, 10, (n_vigas, 1)), rng.uniform(0, 1, (n_vigas, 1)) * longitud[:, None])
+    q = rng.uniform(1, 5, (n_vigas, 1))
+    distribuidas = (q, q, np.zeros((n_vigas, 1)), longitud[:, None])
+
+    for nombre, lote in (
+        ("puntual", VigaBatch(longitud, puntuales)),
+        ("puntual + uniforme", VigaBatch(longitud, puntuales, distribuidas)),
+        ("4 puntuales + 2 lin.", _mezcla(rng, longitud, 4, 2)),
+        ("10 puntuales + 2 lin.", _mezcla(rng, longitud, 10, 2)),
+    ):
+        yield nombre, n_vigas / _cronometrar(lote.resolver, repeticiones)
+
+
+def _cargar_script(nombre):
+    # Los scripts de interfaz tienen espacios en el nombre y extensión .PY: se cargan por ruta
+    ruta = Path(__file__).with_name(nombre)
+    nombre_modulo = ruta.stem.replace(" ", "_")
+    spec = spec_from_file_location(nombre_modulo, ruta, loader=SourceFileLoader(nombre_modulo, str(ruta)))
+    modulo = module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def bench_dibujo(tamanos=(10, 100, 1_000), cuadros=100):
+    # Cuadros por segundo de MOMENTOS 4 con el backend Agg: arrastre de una carga
+    # (blitting sobre el fondo guardado) frente al redibujo completo de dibujar_cargas
+    import matplotlib.pyplot as plt
+
+    script = _cargar_script("MOMENTOS 4.PY")
+    for n in tamanos:
+        interfaz = script.InterfazGrafica(_viga_con_cargas(n))
+        interfaz.dibujar_cargas()
+        completo = _cronometrar(interfaz.dibujar_cargas, max(3, cuadros // 10))
+
+        fila = interfaz.viga.cargas.indices(PUNTUAL)[n // 2]
+        _, x = interfaz.viga.cargas.fila(fila)
+        interfaz.on_click(SimpleNamespace(inaxes=interfaz.ax, xdata=x))
+        posiciones = iter(np.linspace(1.0, interfaz.viga.longitud - 1.0, cuadros))
+
+        def arrastre():
+            interfaz.on_motion(SimpleNamespace(inaxes=interfaz.ax, xdata=next(posiciones)))
+            interfaz.aplicar_movimiento()
+
+        arrastrar = _cronometrar(arrastre, cuadros)
+        interfaz.on_release(None)
+        plt.close(interfaz.fig)
+        yield n, 1 / arrastrar, 1 / completo
+
+
+def tablas():
+    print(f"{'cargas':>8} {'incremental (us)':>18} {'suma completa (us)':>20}")
+    for n, incremental, completa in bench_agregar_carga():
+        print(f"{n:>8} {incremental * 1e6:>18.2f} {completa * 1e6:>20.2f}")
+
+    print()
+    for nombre, casos in bench_lote():
+        print(f"{nombre:>22} {casos:>12.0f} casos/s")
+
+    print()
+    print(f"{'cargas':>8} {'arrastre (fps)':>16} {'redibujo completo (fps)':>25}")
+    for n, arrastre, completo in bench_dibujo():
+        print(f"{n:>8} {arrastre:>16.1f} {completo:>25.1f}")
+
+
+# Suite con resultados en JSON para comparar entre commits en la misma máquina:
+#   python benchmarks.py correr -o base.json [--filtro momentos] [--max-cargas 1000]
+#   python benchmarks.py comparar base.json nuevo.json [--umbral 1.1]
+# Cada escenario tiene una rejilla de parámetros; su función prepara los datos (fuera
+# de la medición) y devuelve la operación a cronometrar, o None si no está disponible.
+
+ESCENARIOS = {}
+CARGAS = (1, 10, 100, 1_000, 10_000, 100_000)
+MUESTRAS = (500, 5_000, 50_000, 1_000_000, "adaptativo")
+
+
+def escenario(nombre, **rejilla):
+    def registrar(preparar):
+        ESCENARIOS[nombre] = (preparar, rejilla)
+        return preparar
+
+    return registrar
+
+
+def _combinaciones(rejilla):
+    claves = list(rejilla)
+    combinaciones = [{}]
+    for clave in claves:
+        combinaciones = [dict(c, **{clave: valor}) for c in combinaciones for valor in rejilla[clave]]
+    return combinaciones
+
+
+_VARIANTES = {
+    # La Viga de viga.py es la que usan MOMENTOS.PY y MOMENTOS 4.PY; M5.PY la extiende
+    "viga": lambda: Viga,
+    "M5": lambda: _cargar_script("M5.PY").Viga,
+}
+_vigas = {}  # (variante, n) -> viga ya cargada: dar de alta 100k cargas lleva segundos
+
+
+def _viga_variante(variante, n):
+    if (variante, n) not in _vigas:
+        viga = _VARIANTES[variante]()(10.0)
+        for i in range(n):
+            viga.agregar_carga_puntual(1.0, 10.0 * (i + 0.5) / n)
+        _vigas[variante, n] = viga
+    return _vigas[variante, n]
+
+
+@escenario("reacciones", variante=tuple(_VARIANTES), cargas=CARGAS)
+def _reacciones(variante, cargas):
+    # Mover una carga y pedir las reacciones: el paso de cada cuadro al arrastrar
+    viga = _viga_variante(variante, cargas)
+    estado = {"fila": viga.cargas.indices(PUNTUAL)[cargas // 2], "x": 1.0}
+
+    def operacion():
+        estado["x"] = 9.0 - estado["x"]
+        estado["fila"] = viga.mover_carga_puntual(estado["fila"], estado["x"])
+        viga.calcular_reacciones()
+
+    return operacion
+
+
+@escenario("momentos", variante=tuple(_VARIANTES), cargas=CARGAS, muestras=MUESTRAS)
+def _momentos(variante, cargas, muestras):
+    # Cálculo completo (la versión se invalida en cada repetición) y muestreo
+    viga = _viga_variante(variante, cargas)
+    puntos = None if muestras == "adaptativo" else muestras
+
+    def operacion():
+        viga.version += 1
+        viga.calcular_momentos(puntos=puntos)
+
+    return operacion
+
+
+class _Valor:
+    # Sustituye a las variables de Tk: sólo se usa get()
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+# Los escenarios de dibujo no llegan a 100k cargas: cada carga es un artista Text de
+# matplotlib, y un cuadro de f2 con 10k cargas ya lleva ~17 s (preparar MOMENTOS 4 con
+# 10k, ~35 s). Con 100k la rejilla tardaría horas sin decir nada nuevo: el coste por
+# carga es lineal y ya se ve entre 100 y 1k (o 10k).
+def _analizador(cargas):
+    # BeamAnalyzer sobre una figura Agg, sin ventana de Tk, ya dibujado una vez
+    try:
+        import f2
+    except ImportError:
+        return None
+    import matplotlib.pyplot as plt
+
+    app = f2.BeamAnalyzer.__new__(f2.BeamAnalyzer)
+    app.beam_length = _Valor(10.0)
+    app.loads = [
+        {"type": tipo, "magnitude": 1.0, "position": 10.0 * (i + 0.5) / cargas, "start": 1.0, "end": 4.0}
+        for i, tipo in zip(range(cargas), ["pointLoad", "pointLoad", "distributedLoad", "torque"] * cargas)
+    ]
+    app.supports = [{"type": "simpleSupport", "position": 0.0}, {"type": "rollerSupport", "position": 10.0}]
+    app.figure, app.ax = plt.subplots(figsize=(10, 3))
+    app.create_plot_artists()
+    app.update_plot()
+    return app
+
+
+@escenario("update_plot_f2", cargas=(1, 10, 100, 1_000))
+def _update_plot(cargas):
+    # Cada llamada mueve una carga puntual, como al editar la lista, para no medir un
+    # refresco sin cambios
+    app = _analizador(cargas)
+    if app is None:
+        return None
+    carga = app.loads[0]
+    carga["position"] = 1.0
+
+    def operacion():
+        carga["position"] = 10.0 - carga["position"]
+        app.update_plot()
+
+    return operacion
+
+
+@escenario("agregar_quitar_f2", cargas=(1, 10, 100, 1_000))
+def _agregar_quitar(cargas):
+    # Alterna agregar y quitar una carga puntual: cambia el número de textos, que es lo
+    # que antes obligaba a redibujar todo el gráfico
+    app = _analizador(cargas)
+    if app is None:
+        return None
+    nueva = {"type": "pointLoad", "magnitude": 2.0, "position": 3.0, "start": 1.0, "end": 4.0}
+
+    def operacion():
+        if app.loads[-1] is nueva:
+            app.loads.pop()
+        else:
+            app.loads.append(nueva)
+        app.update_plot()
+
+    return operacion
+
+
+@escenario("arrastre_momentos4", cargas=(10, 100, 1_000, 10_000))
+def _arrastre(cargas):
+    # Un cuadro de arrastre con blitting en MOMENTOS 4
+    interfaz = _cargar_script("MOMENTOS 4.PY").InterfazGrafica(_viga_con_cargas(cargas))
+    interfaz.dibujar_cargas()
+    _, x = interfaz.viga.cargas.fila(interfaz.viga.cargas.indices(PUNTUAL)[cargas // 2])
+    interfaz.on_click(SimpleNamespace(inaxes=interfaz.ax, xdata=x))
+    estado = {"x": 1.0}
+
+    def operacion():
+        estado["x"] = interfaz.viga.longitud - estado["x"]
+        interfaz.on_motion(SimpleNamespace(inaxes=interfaz.ax, xdata=estado["x"]))
+        interfaz.aplicar_movimiento()
+
+    return operacion
+
+
+@escenario("lote", vigas=(1_000, 100_000))
+def _lote(vigas):
+    rng = np.random.default_rng(0)
+    longitud = rng.uniform(5, 15, vigas)
+    q = rng.uniform(1, 5, (vigas, 1))
+    lote = VigaBatch(
+        longitud,
+        (rng.uniform(1, 10, (vigas, 1)), rng.uniform(0, 1, (vigas, 1)) * longitud[:, None]),
+        (q, q, np.zeros((vigas, 1)), longitud[:, None]),
+    )
+    return lote.resolver
+
+
+def _casos(n):
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        caso = {
+            "id": i,
+            "longitud": 10.0,
+            "puntuales": rng.uniform(0.5, 9.5, (3, 2)).tolist(),
+            "distribuidas": [[2.0, 3.0, 1.0, 4.0]],
+        }
+        if i % 2:
+            caso["apoyos"] = [[0.0, "simpleSupport"], [6.0, "rollerSupport"], [10.0, "fixedSupport"]]
+        yield caso
+
+
+# Con un solo núcleo repartir entre procesos sólo añade el coste de arrancarlos: allí
+# la rejilla se queda en el caso en serie
+_NUCLEOS = os.cpu_count() or 1
+
+
+@escenario("procesar", casos=(1_000,), procesos=tuple(sorted({1, min(2, _NUCLEOS), _NUCLEOS})))
+def _procesar(casos, procesos):
+    # La CLI por lotes sin E/S: en serie o repartida entre procesos
+    from paralelo import resolver_en_paralelo
+    from procesar import resolver_casos
+
+    datos = list(_casos(casos))
+    if procesos == 1:
+        return lambda: list(resolver_casos(datos))
+    return lambda: list(resolver_en_paralelo(datos, procesos))
+
+
+def medir(operacion, tiempo_minimo=0.2, repeticiones_min=3, repeticiones_max=10_000):
+    # Como timeit: cada muestra agrupa las llamadas necesarias para durar >= 1 ms
+    inicio = time.perf_counter()
+    operacion()  # Calentamiento (cachés, importaciones perezosas)
+    llamadas = max(1, int(1e-3 / max(time.perf_counter() - inicio, 1e-9)))
+    muestras, total = [], 0.0
+    while len(muestras) < repeticiones_min or (total < tiempo_minimo and len(muestras) < repeticiones_max):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            operacion()
+        duracion = time.perf_counter() - inicio
+        muestras.append(duracion / llamadas)
+        total += duracion
+    return {
+        "muestras": len(muestras),
+        "llamadas_por_muestra": llamadas,
+        "min": min(muestras),
+        "mediana": statistics.median(muestras),
+        "media": statistics.fmean(muestras),
+        "desviacion": statistics.pstdev(muestras),
+    }
+
+
+def _version(modulo):
+    try:
+        return __import__(modulo).__version__
+    except ImportError:
+        return None
+
+
+def metadatos():
+    def git(*argumentos):
+        try:
+            return subprocess.run(
+                ["git", *argumentos], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "cambios_sin_commit": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": _version("numpy"),
+        "scipy": _version("scipy"),
+        "matplotlib": _version("matplotlib"),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+def _clave(resultado):
+    return resultado["escenario"], json.dumps(resultado["parametros"], sort_keys=True)
+
+
+def correr(filtro=None, max_cargas=None, tiempo_minimo=0.2):
+    # Generador de resultados; con filtro, sólo los escenarios cuyo nombre lo contiene
+    import matplotlib.pyplot as plt
+
+    for nombre, (preparar, rejilla) in ESCENARIOS.items():
+        if filtro and not re.search(filtro, nombre):
+            continue
+        for parametros in _combinaciones(rejilla):
+            if max_cargas is not None and parametros.get("cargas", 0) > max_cargas:
+                continue
+            operacion = preparar(**parametros)
+            if operacion is None:
+                continue
+            resultado = {"escenario": nombre, "parametros": parametros}
+            resultado.update(medir(operacion, tiempo_minimo))
+            plt.close("all")
+            yield resultado
+
+
+def comparar(base, nuevo, umbral=1.1):
+    # Filas (escenario, parámetros, base, nuevo, cociente) de lo que está en ambos,
+    # comparando el mínimo de las muestras (lo menos sensible al ruido)
+    anteriores = {_clave(r): r for r in base["resultados"]}
+    filas = []
+    for resultado in nuevo["resultados"]:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is not None:
+            cociente = resultado["min"] / anterior["min"]
+            filas.append((*_clave(resultado), anterior["min"], resultado["min"], cociente, cociente > umbral))
+    return filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de cálculo, dibujo y lotes.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("tablas", help="las tablas resumidas de siempre")
+    parser_correr = subcomandos.add_parser("correr", help="corre la suite y guarda JSON")
+    parser_correr.add_argument("-o", "--salida", help="archivo JSON (por defecto, salida estándar)")
+    parser_correr.add_argument("--filtro", help="expresión regular sobre el nombre del escenario")
+    parser_correr.add_argument("--max-cargas", type=int, help="omite los puntos con más cargas")
+    parser_correr.add_argument("--tiempo-minimo", type=float, default=0.2, help="segundos por punto")
+    parser_comparar = subcomandos.add_parser("comparar", help="compara dos JSON; sale con 1 si empeora")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("nuevo")
+    parser_comparar.add_argument("--umbral", type=float, default=1.1, help="cociente nuevo/base tolerado")
+    args = parser.parse_args(argv)
+
+    if args.comando == "tablas":
+        tablas()
+        return 0
+
+    if args.comando == "correr":
+        resultados = []
+        for resultado in correr(args.filtro, args.max_cargas, args.tiempo_minimo):
+            resultados.append(resultado)
+            print(f"{resultado['escenario']:>20} {json.dumps(resultado['parametros']):<55} "
+                  f"{resultado['min'] * 1e6:>14.1f} us", file=sys.stderr)
+        documento = json.dumps({"metadatos": metadatos(), "resultados": resultados}, indent=1)
+        if args.salida:
+            with open(args.salida, "w") as salida:
+                salida.write(documento + "\n")
+        else:
+            print(documento)
+        return 0
+
+    with open(args.base) as base, open(args.nuevo) as nuevo:
+        filas = comparar(json.load(base), json.load(nuevo), args.umbral)
+    for nombre, parametros, anterior, actual, cociente, peor in filas:
+        marca = "  <-- más lento" if peor else ""
+        print(f"{nombre:>20} {parametros:<55} {anterior * 1e6:>12.1f} {actual * 1e6:>12.1f} us "
+              f"{cociente:>6.2f}x{marca}")
+    return 1 if any(fila[-1] for fila in filas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from rigidez import resolver_continua_cargas, restricciones
+from singularidades import Diagramas, PolinomioPorTramos, resolver_cargas
+
+# Caché de resultados direccionada por contenido.
+# La clave es un hash de la viga en forma canónica: posiciones cuantizadas respecto de
+# la longitud, magnitudes y EI redondeadas a una mantisa fija (así 0.1 + 0.2 y 0.3 dan
+# la misma clave), cargas nulas descartadas y filas ordenadas. El valor guarda las
+# reacciones y, por diagrama, los polinomios exactos, los extremos y el muestreo
+# adaptativo. Delante hay un LRU en memoria; detrás, una base SQLite con los arreglos
+# como bytes planos que se leen sin copia con np.frombuffer. La base también tiene un
+# tope de filas: al pasarlo se borran las de uso más antiguo. El archivo (y su
+# directorio) sólo se crea con la primera escritura.
+
+DIAGRAMAS = ("cortante", "momento", "giro", "flecha")
+TOLERANCIA_POSICION = 1e-9  # Relativa a la longitud
+BITS_MANTISA = 40  # Error relativo ~1e-12 en magnitudes y EI
+_VERSION_CLAVE = b"momentos-cache-1"
+
+ESPERA_BLOQUEO_S = 30.0  # Lo que espera una escritura a que otro proceso suelte la base
+FILAS_DISCO = 50_000  # ~3 KB por caso: unos 150 MB en disco
+FRACCION_DESALOJO = 0.1  # Al pasar el tope se borra de una vez esta parte de las filas
+
+RUTA_POR_DEFECTO = os.path.join(os.path.expanduser("~"), ".cache", "momentos", "resultados.sqlite")
+
+
+def _mantisa(valores):
+    mantisa, exponente = np.frexp(np.asarray(valores, dtype=float))
+    return np.rint(mantisa * 2.0**BITS_MANTISA).astype(np.int64), exponente.astype(np.int64)
+
+
+def clave_caso(longitud, columnas, apoyos=None, EI=1.0):
+    # Hash hexadecimal de la forma canónica; apoyos None es la viga simplemente apoyada
+    tipo, magnitud, magnitud_fin, posicion, fin = (np.asarray(c) for c in columnas)
+    escala = TOLERANCIA_POSICION * longitud
+    vivas = (magnitud != 0) | (magnitud_fin != 0)
+    filas = np.column_stack(
+        [
+            tipo[vivas].astype(np.int64),
+            np.rint(posicion[vivas] / escala).astype(np.int64),
+            np.rint(fin[vivas] / escala).astype(np.int64),
+            *_mantisa(magnitud[vivas]),
+            *_mantisa(magnitud_fin[vivas]),
+        ]
+    )
+    filas = filas[np.lexsort(filas.T[::-1])]
+
+    resumen = hashlib.blake2b(_VERSION_CLAVE, digest_size=16)
+    resumen.update(np.concatenate([*_mantisa([longitud, EI])]).tobytes())
+    resumen.update(filas.tobytes())
+    if apoyos:
+        soportes = _soportes(longitud, apoyos)
+        resumen.update(b"apoyos")
+        resumen.update(soportes[orden_apoyos(longitud, apoyos)].tobytes())
+    return resumen.hexdigest()
+
+
+def _soportes(longitud, apoyos):
+    escala = TOLERANCIA_POSICION * longitud
+    return np.array([(np.rint(x / escala), *restricciones(r)) for x, r in apoyos], dtype=np.int64)
+
+
+def orden_apoyos(longitud, apoyos):
+    # Orden canónico de los apoyos: el de la clave y el de las reacciones guardadas
+    soportes = _soportes(longitud, apoyos)
+    return np.lexsort(soportes.T[::-1])
+
+
+def calcular_registro(longitud, columnas, apoyos=None, EI=1.0):
+    # Arreglos planos con todo lo que se guarda de un caso
+    if apoyos:
+        diagramas = resolver_continua_cargas(longitud, apoyos, columnas, EI)
+        reacciones = np.array(diagramas.reacciones, dtype=float).reshape(-1, 3)
+    else:
+        diagramas = resolver_cargas(longitud, columnas, EI=EI)
+        reacc_a, reacc_b = diagramas.reacciones
+        reacciones = np.array([[0.0, reacc_a, 0.0], [longitud, reacc_b, 0.0]])
+
+    registro = {"reacciones": reacciones}
+    for nombre in DIAGRAMAS:
+        polinomio = getattr(diagramas, nombre)
+        x, valores = polinomio.muestrear_adaptativo()
+        registro[nombre + "_cortes"] = polinomio.cortes
+        registro[nombre + "_coef"] = polinomio.coef
+        registro[nombre + "_extremos"] = np.array(polinomio.extremos(), dtype=float)
+        registro[nombre + "_x"] = x
+        registro[nombre + "_valores"] = valores
+    for arreglo in registro.values():
+        arreglo.flags.writeable = False  # Compartidos entre quienes lean de la caché
+    return registro
+
+
+class Resultado:
+    # Vista de un registro: reacciones (x, fuerza, momento), extremos y muestras por
+    # diagrama, y los diagramas exactos reconstruidos a pedido. El registro guarda las
+    # reacciones en el orden canónico de los apoyos; orden (el de orden_apoyos) las
+    # devuelve al orden en que los dio quien pregunta
+    def __init__(self, registro, simple, clave=None, orden=None):
+        self.registro = registro
+        self.simple = simple
+        self.clave = clave
+        self.reacciones = registro["reacciones"]
+        if orden is not None:
+            self.reacciones = self.reacciones[np.argsort(orden)]
+        self.extremos = {n: tuple(registro[n + "_extremos"].tolist()) for n in DIAGRAMAS}
+        self.muestras = {n: (registro[n + "_x"], registro[n + "_valores"]) for n in DIAGRAMAS}
+
+    def diagramas(self):
+        polinomios = [
+            PolinomioPorTramos(self.registro[n + "_cortes"], self.registro[n + "_coef"]) for n in DIAGRAMAS
+        ]
+        # Mismo formato de reacciones que el cálculo directo
+        if self.simple:
+            reacciones = (float(self.reacciones[0, 1]), float(self.reacciones[1, 1]))
+        else:
+            reacciones = [tuple(fila) for fila in self.reacciones.tolist()]
+        return Diagramas(reacciones, *polinomios)
+
+
+def _codificar(registro):
+    esquema = [(nombre, arreglo.shape) for nombre, arreglo in registro.items()]
+    datos = b"".join(np.ascontiguousarray(a, dtype=float).tobytes() for a in registro.values())
+    return json.dumps(esquema), datos
+
+
+def _decodificar(esquema, datos):
+    plano = np.frombuffer(datos, dtype=float)
+    registro, desde = {}, 0
+    for nombre, forma in json.loads(esquema):
+        tamano = int(np.prod(forma))
+        registro[nombre] = plano[desde : desde + tamano].reshape(forma)
+        desde += tamano
+    return registro
+
+
+class CacheResultados:
+    # ruta None: sólo memoria. Seguro entre hilos (la usa también el trabajador de Tk)
+    def __init__(self, ruta=None, capacidad=256, filas_disco=FILAS_DISCO):
+        self.ruta = ruta
+        self.capacidad = capacidad
+        self.filas_disco = filas_disco
+        self._memoria = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.aciertos_memoria = self.aciertos_disco = self.fallos = 0
+        self._base = None
+        self._filas = 0  # Estimación de las filas en disco; se recuenta antes de desalojar
+
+    def _conexion(self, crear=False):
+        # La base se abre al usarla; si no existe, sólo una escritura la crea
+        if self._base is None and self.ruta is not None and (crear or os.path.exists(self.ruta)):
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+            base = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO_S, check_same_thread=False)
+            base.execute("PRAGMA journal_mode=WAL")
+            base.execute(
+                "CREATE TABLE IF NOT EXISTS resultados (clave TEXT PRIMARY KEY, esquema TEXT, datos BLOB, uso REAL)"
+            )
+            if "uso" not in [columna[1] for columna in base.execute("PRAGMA table_info(resultados)")]:
+                base.execute("ALTER TABLE resultados ADD COLUMN uso REAL DEFAULT 0")  # Bases anteriores
+            base.execute("CREATE INDEX IF NOT EXISTS resultados_uso ON resultados (uso)")
+            base.commit()
+            (self._filas,) = base.execute("SELECT COUNT(*) FROM resultados").fetchone()
+            self._base = base
+        return self._base
+
+    def _recordar(self, clave, registro):
+        self._memoria[clave] = registro
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def obtener(self, clave):
+        with self._cerrojo:
+            registro = self._memoria.get(clave)
+            if registro is not None:
+                self._memoria.move_to_end(clave)
+                self.aciertos_memoria += 1
+                return registro
+            base = self._conexion()
+            if base is not None:
+                fila = base.execute("SELECT esquema, datos FROM resultados WHERE clave = ?", (clave,)).fetchone()
+                if fila is not None:
+                    with base:
+                        base.execute("UPDATE resultados SET uso = ? WHERE clave = ?", (time.time(), clave))
+                    registro = _decodificar(*fila)
+                    self._recordar(clave, registro)
+                    self.aciertos_disco += 1
+                    return registro
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, registro):
+        with self._cerrojo:
+            self._recordar(clave, registro)
+            base = self._conexion(crear=True)
+            if base is not None:
+                with base:
+                    base.execute(
+                        "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?)",
+                        (clave, *_codificar(registro), time.time()),
+                    )
+                self._filas += 1
+                if self._filas > self.filas_disco:
+                    self._desalojar(base)
+
+    def _desalojar(self, base):
+        # Otros procesos también escriben: se recuenta y se baja de una vez bajo el tope,
+        # así el recuento y el borrado se pagan una vez cada muchas escrituras
+        with base:
+            (filas,) = base.execute("SELECT COUNT(*) FROM resultados").fetchone()
+            sobran = filas - int(self.filas_disco * (1 - FRACCION_DESALOJO))
+            if filas > self.filas_disco and sobran > 0:
+                base.execute(
+                    "DELETE FROM resultados WHERE clave IN (SELECT clave FROM resultados ORDER BY uso LIMIT ?)",
+                    (sobran,),
+                )
+                filas -= sobran
+        self._filas = filas
+
+    def resolver(self, longitud, columnas, apoyos=None, EI=1.0):
+        clave = clave_caso(longitud, columnas, apoyos, EI)
+        orden = orden_apoyos(longitud, apoyos) if apoyos else None
+        registro = self.obtener(clave)
+        if registro is None:
+            canonicos = [apoyos[i] for i in orden] if apoyos else apoyos
+            registro = calcular_registro(longitud, columnas, canonicos, EI)
+            self.guardar(clave, registro)
+        return Resultado(registro, not apoyos, clave, orden)
+
+    def cerrar(self):
+        # Desde aquí sólo queda el LRU en memoria
+        if self._base is not None:
+            self._base.close()
+            self._base = None
+        self.ruta = None
@@ -0,0 +1,146 @@
+import numpy as np
+
+# Tabla de cargas en arreglos contiguos de NumPy.
+# Cada fila es una carga; "posicion" es el punto de aplicación (o el inicio de una
+# distribuida) y "fin" el final de la distribuida (igual a posicion en las demás).
+
+PUNTUAL, DISTRIBUIDA, MOMENTO = 0, 1, 2
+
+_COLUMNAS = ("magnitud", "magnitud_fin", "posicion", "fin")
+_ARREGLOS = ("_tipo", "_magnitud", "_magnitud_fin", "_posicion", "_fin", "_caso", "_activa")
+_COLA_MAXIMA = 64  # Filas nuevas que se buscan linealmente antes de reordenar el índice
+
+
+class TablaCargas:
+    __slots__ = (
+        "_tipo", "_magnitud", "_magnitud_fin", "_posicion", "_fin", "_caso", "_activa",
+        "_n", "_borradas", "_indice", "_ordenadas", "version",
+    )
+
+    def __init__(self, capacidad=16):
+        self._tipo = np.zeros(capacidad, dtype=np.int8)
+        for columna in _COLUMNAS:
+            setattr(self, "_" + columna, np.zeros(capacidad))
+        self._caso = np.zeros(capacidad, dtype=np.int32)  # Código del caso de carga
+        self._activa = np.zeros(capacidad, dtype=bool)
+        self._n = 0
+        self._borradas = 0
+        # Índice ordenado por posición de las primeras _ordenadas filas;
+        # las posteriores forman una cola corta que se recorre linealmente
+        self._indice = np.zeros(0, dtype=np.intp)
+        self._ordenadas = 0
+        self.version = 0
+
+    def __len__(self):
+        return self._n - self._borradas
+
+    def __iter__(self):
+        for fila in np.flatnonzero(self._activa[: self._n]):
+            yield self.fila(fila)
+
+    def _crecer(self):
+        capacidad = 2 * len(self._tipo)
+        for nombre in _ARREGLOS:
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=viejo.dtype)
+            nuevo[: self._n] = viejo[: self._n]
+            setattr(self, nombre, nuevo)
+
+    def agregar(self, tipo, magnitud, posicion, fin=None, magnitud_fin=None, caso=0):
+        if self._n == len(self._tipo):
+            self._crecer()
+        i = self._n
+        self._tipo[i] = tipo
+        self._magnitud[i] = magnitud
+        self._magnitud_fin[i] = magnitud if magnitud_fin is None else magnitud_fin
+        self._posicion[i] = posicion
+        self._fin[i] = posicion if fin is None else fin
+        self._caso[i] = caso
+        self._activa[i] = True
+        self._n += 1
+        self.version += 1
+        if self._n - self._ordenadas > _COLA_MAXIMA:
+            self._reindexar()
+        return i
+
+    def _reindexar(self):
+        self._indice = np.argsort(self._posicion[: self._n], kind="stable")
+        self._ordenadas = self._n
+
+    def buscar(self, posicion, tolerancia, tipo=None):
+        # Filas activas con |posicion - x| <= tolerancia: O(log n) sobre el índice más la cola
+        posiciones = self._posicion[self._indice]
+        desde = np.searchsorted(posiciones, posicion - tolerancia, side="left")
+        hasta = np.searchsorted(posiciones, posicion + tolerancia, side="right")
+        candidatas = np.concatenate([self._indice[desde:hasta], np.arange(self._ordenadas, self._n)])
+        elegidas = self._activa[candidatas] & (np.abs(self._posicion[candidatas] - posicion) <= tolerancia)
+        if tipo is not None:
+            elegidas &= self._tipo[candidatas] == tipo
+        return np.sort(candidatas[elegidas])
+
+    def eliminar(self, filas):
+        # Baja perezosa: la fila queda con magnitud cero hasta la próxima compactación
+        filas = np.asarray(filas, dtype=np.intp)
+        self._activa[filas] = False
+        self._magnitud[filas] = 0.0
+        self._magnitud_fin[filas] = 0.0
+        self._borradas += len(filas)
+        self.version += 1
+        if self._borradas > max(_COLA_MAXIMA, self._n // 2):
+            self.compactar()
+
+    def mover(self, fila, posicion):
+        # Baja de la fila y alta al final de la cola: no obliga a reordenar el índice.
+        # Devuelve la fila nueva (los números de fila cambian al compactar)
+        tipo, magnitud, magnitud_fin = self._tipo[fila], self._magnitud[fila], self._magnitud_fin[fila]
+        caso = self._caso[fila]
+        self.eliminar([fila])
+        return self.agregar(tipo, magnitud, posicion, magnitud_fin=magnitud_fin, caso=caso)
+
+    def copiar(self):
+        # Copia independiente (p. ej. para calcular en otro hilo mientras se sigue editando)
+        copia = TablaCargas.__new__(TablaCargas)
+        for nombre in _ARREGLOS + ("_indice",):
+            setattr(copia, nombre, getattr(self, nombre).copy())
+        copia._n, copia._borradas, copia._ordenadas = self._n, self._borradas, self._ordenadas
+        copia.version = self.version
+        return copia
+
+    def compactar(self):
+        vivas = np.flatnonzero(self._activa[: self._n])
+        for nombre in _ARREGLOS:
+            columna = getattr(self, nombre)
+            columna[: len(vivas)] = columna[vivas]
+            columna[len(vivas) : self._n] = 0
+        self._n = len(vivas)
+        self._borradas = 0
+        self._reindexar()
+
+    def fila(self, i):
+        tipo = self._tipo[i]
+        if tipo == DISTRIBUIDA:
+            return (
+                float(self._magnitud[i]), float(self._magnitud_fin[i]),
+                float(self._posicion[i]), float(self._fin[i]),
+            )
+        return float(self._magnitud[i]), float(self._posicion[i])
+
+    def indices(self, tipo):
+        return np.flatnonzero(self._activa[: self._n] & (self._tipo[: self._n] == tipo))
+
+    def filas(self, tipo):
+        return [self.fila(i) for i in self.indices(tipo)]
+
+    def columnas(self):
+        # Vistas sin copia (tipo, magnitud, magnitud_fin, posicion, fin) de las filas usadas
+        n = self._n
+        return (
+            self._tipo[:n], self._magnitud[:n], self._magnitud_fin[:n], self._posicion[:n], self._fin[:n]
+        )
+
+    def casos(self):
+        # Vista sin copia del código de caso de cada fila usada (alineada con columnas())
+        return self._caso[: self._n]
+
+    def activas(self):
+        return self._activa[: self._n]
@@ -0,0 +1,58 @@
+import numpy as np
+
+from singularidades import PolinomioPorTramos
+
+# Combinaciones de casos de carga por superposición.
+# Cada caso se resuelve una vez; sus diagramas se reescriben sobre los cortes comunes
+# a todos los casos, y los diagramas mayorados de todas las combinaciones salen de un
+# único producto de la matriz de factores (combinaciones × casos) por los coeficientes.
+
+DIAGRAMAS = ("cortante", "momento", "giro", "flecha")
+
+
+class Combinaciones:
+    # por_caso: {caso: Diagramas}; combinaciones: {nombre: {caso: factor}}
+    def __init__(self, longitud, por_caso, combinaciones, puntos=501):
+        if not por_caso:
+            raise ValueError("La viga no tiene cargas que combinar.")
+        self.casos = list(por_caso)
+        self.nombres = list(combinaciones)
+        for nombre, factores in combinaciones.items():
+            desconocidos = set(factores) - set(self.casos)
+            if desconocidos:
+                raise ValueError(f"Casos de carga desconocidos en {nombre}: {sorted(desconocidos)}")
+        self.factores = np.array(
+            [[factores.get(caso, 0.0) for caso in self.casos] for factores in combinaciones.values()],
+            dtype=float,
+        ).reshape(len(self.nombres), len(self.casos))
+
+        diagramas = list(por_caso.values())
+        # Giro y flecha pueden cortar además en los cambios de sección
+        self.cortes = np.unique(
+            np.concatenate([getattr(d, nombre).cortes for d in diagramas for nombre in DIAGRAMAS])
+        )
+        self.x = np.unique(np.concatenate([self.cortes, np.linspace(0.0, longitud, puntos)]))
+        self.coef = {}
+        self.valores = {}
+        for nombre in DIAGRAMAS:
+            polinomios = [getattr(d, nombre) for d in diagramas]
+            grado = max(p.coef.shape[1] for p in polinomios) - 1
+            coef = np.stack([p.refinar(self.cortes, grado).coef for p in polinomios])
+            self.coef[nombre] = np.tensordot(self.factores, coef, axes=1)
+            self.valores[nombre] = self.factores @ np.stack([p(self.x) for p in polinomios])
+
+    def diagrama(self, combinacion, nombre="momento"):
+        # Diagrama exacto (polinomio por tramos) de una combinación
+        return PolinomioPorTramos(self.cortes, self.coef[nombre][self.nombres.index(combinacion)])
+
+    def envolvente(self, nombre="momento"):
+        # (máximo, combinación que lo da, mínimo, combinación que lo da) en cada punto de x
+        valores = self.valores[nombre]
+        i_max, i_min = valores.argmax(axis=0), valores.argmin(axis=0)
+        columnas = np.arange(valores.shape[1])
+        nombres = np.array(self.nombres, dtype=object)
+        return valores[i_max, columnas], nombres[i_max], valores[i_min, columnas], nombres[i_min]
+
+    def extremos(self, nombre="momento"):
+        # {combinación: (x_max, máximo, x_min, mínimo)} exactos
+        return {c: self.diagrama(c, nombre).extremos() for c in self.nombres}
@@ -0,0 +1,143 @@
+import numpy as np
+
+from cargas import DISTRIBUIDA
+from rigidez import (
+    anular_fijos, cargas_nodales, crear_nodos, desplazamientos, ensamblar_banda, intensidades,
+    nodo_cercano, primero_en_nodo, residuo_nodal, restricciones, rigidez_elementos, sumar_diagonal,
+)
+from singularidades import Diagramas, PolinomioPorTramos, fuera_de_la_viga
+
+# Modo de elementos finitos para vigas largas de muchos tramos.
+# Elementos de viga de dos nodos (flecha hacia arriba y giro antihorario por nodo) con
+# la rigidez exacta de Timoshenko (phi = 12·EI/(κGA·l²); sin GA es Euler-Bernoulli),
+# sección propia por elemento, apoyos rígidos y resortes. La matriz se ensambla en banda
+# y se resuelve con LAPACK (gbsv) a través de rigidez.desplazamientos: tiempo y memoria
+# O(elementos). Las fuerzas de empotramiento de la carga lineal son exactas también
+# con cortante, así que los valores nodales lo son; dentro de cada elemento cortante,
+# momento, giro y flecha se recuperan por equilibrio en coordenadas locales.
+
+
+def _por_elemento(valor, medios):
+    # Propiedad de sección: número, función de x, o (inicios, valores) constante por tramos
+    if callable(valor):
+        return np.asarray(valor(medios), dtype=float) * np.ones_like(medios)
+    if isinstance(valor, tuple):
+        inicios, valores = (np.asarray(v, dtype=float) for v in valor)
+        return valores[np.clip(np.searchsorted(inicios, medios, side="right") - 1, 0, None)]
+    return np.full_like(medios, float(valor))
+
+
+def crear_malla(longitud, puntos, tamano_maximo=None):
+    # Nodos en los puntos dados y, si se pide, elementos de largo <= tamano_maximo
+    nodos = crear_nodos(longitud, puntos)
+    if tamano_maximo is None:
+        return nodos
+    largos = np.diff(nodos)
+    partes = np.maximum(1, np.ceil(largos / tamano_maximo).astype(int))
+    paso = np.repeat(largos / partes, partes)
+    indice = np.arange(partes.sum()) - np.repeat(np.cumsum(partes) - partes, partes)
+    return np.append(np.repeat(nodos[:-1], partes) + indice * paso, nodos[-1])
+
+
+def empotramiento(l, w1, w2, phi):
+    # Viga biempotrada de largo l con carga lineal w1 -> w2 (hacia abajo): reacciones
+    # hacia arriba y momentos internos (positivos flectando hacia abajo) en cada extremo
+    d = w2 - w1
+    reaccion_i = w1 * l / 2 + d * l * (3 / 20 + phi / 6) / (1 + phi)
+    momento_i = -reaccion_i * l / 2 + w1 * l**2 / 6 + d * l**2 / 24
+    reaccion_j = (w1 + w2) * l / 2 - reaccion_i
+    momento_j = momento_i + reaccion_i * l - w1 * l**2 / 2 - d * l**2 / 6
+    return reaccion_i, momento_i, reaccion_j, momento_j
+
+
+def resolver_elementos(longitud, apoyos, columnas, EI=1.0, GA=None, resortes=None, tamano_maximo=None):
+    # apoyos: filas (posicion, tipo) como en rigidez; resortes: filas (posicion,
+    # k_vertical, k_giro). EI y GA (rigidez a cortante κGA) por elemento como en
+    # _por_elemento. Las reacciones van en el orden de apoyos y después resortes.
+    tipo, _, _, posicion, fin = columnas
+    apoyos = list(apoyos or ())
+    x_apoyo = np.array([float(x) for x, _ in apoyos])
+    restriccion = np.array([restricciones(t) for _, t in apoyos], dtype=int).reshape(-1, 3)
+    resortes = np.asarray(resortes if resortes is not None else np.zeros((0, 3)), dtype=float).reshape(-1, 3)
+    if np.any(fuera_de_la_viga(longitud, x_apoyo)) or np.any(fuera_de_la_viga(longitud, resortes[:, 0])):
+        raise ValueError(f"Hay apoyos o resortes fuera de la viga [0, {longitud:g}]")
+
+    puntos = [x_apoyo, resortes[:, 0], posicion, fin]
+    for propiedad in (EI, GA):
+        if isinstance(propiedad, tuple):
+            puntos.append(np.asarray(propiedad[0], dtype=float))
+    nodos = crear_malla(longitud, np.concatenate(puntos), tamano_maximo)
+    l = np.diff(nodos)
+    medios = nodos[:-1] + l / 2
+    rigidez_flexion = _por_elemento(EI, medios)
+    flexibilidad_cortante = np.zeros_like(l) if GA is None else 1.0 / _por_elemento(GA, medios)
+    phi = 12 * rigidez_flexion * flexibilidad_cortante / l**2
+
+    # Cargas: puntuales y momentos en los nodos; distribuidas con empotramiento exacto
+    distribuida = tipo == DISTRIBUIDA
+    f = cargas_nodales(nodos, tuple(c[~distribuida] for c in columnas))
+    w1, w2 = intensidades(nodos, columnas)
+    reaccion_i, momento_i, reaccion_j, momento_j = empotramiento(l, w1, w2, phi)
+    equivalentes = np.stack([-reaccion_i, momento_i, -reaccion_j, -momento_j], axis=1)
+    f[:-2] += np.column_stack([equivalentes[:, 0], equivalentes[:, 1]]).ravel()
+    f[2:] += np.column_stack([equivalentes[:, 2], equivalentes[:, 3]]).ravel()
+
+    k = rigidez_elementos(l, rigidez_flexion, phi)
+    sistema = ensamblar_banda(k)
+    nodo_resorte = nodo_cercano(nodos, resortes[:, 0])
+    sumar_diagonal(sistema, 2 * nodo_resorte, resortes[:, 1])
+    sumar_diagonal(sistema, 2 * nodo_resorte + 1, resortes[:, 2])
+    nodo_apoyo = nodo_cercano(nodos, x_apoyo)
+    fijos = np.unique(
+        np.concatenate([2 * nodo_apoyo[restriccion[:, 1] == 1], 2 * nodo_apoyo[restriccion[:, 2] == 1] + 1])
+    ).astype(int)
+    # Se cuentan grados restringidos y no apoyos, como en rigidez._sistema: dos apoyos o
+    # resortes en el mismo nodo son uno
+    restringidos = np.union1d(
+        fijos, np.concatenate([2 * nodo_resorte[resortes[:, 1] != 0], 2 * nodo_resorte[resortes[:, 2] != 0] + 1])
+    )
+    if not np.any(restringidos % 2 == 0) or len(restringidos) < 2:
+        raise ValueError("Apoyos insuficientes: la viga es un mecanismo.")
+    u = desplazamientos(anular_fijos(sistema, fijos), fijos, f)
+
+    residuo = residuo_nodal(k, u, f)
+    reacciones = list(
+        zip(
+            x_apoyo,
+            np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 1] == 1), residuo[2 * nodo_apoyo], 0.0),
+            np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 2] == 1), residuo[2 * nodo_apoyo + 1], 0.0),
+        )
+    )
+    reacciones += list(
+        zip(resortes[:, 0], -resortes[:, 1] * u[2 * nodo_resorte], -resortes[:, 2] * u[2 * nodo_resorte + 1])
+    )
+
+    # Fuerzas sobre cada elemento en sus extremos: K_e·u_e + empotramiento
+    extremos = np.einsum("eij,ej->ei", k, np.lib.stride_tricks.sliding_window_view(u, 4)[::2]) - equivalentes
+    cortante_i, momento_i = extremos[:, 0], -extremos[:, 1]
+    v_i, giro_i = u[:-2:2], u[1:-2:2]
+    d = (w2 - w1) / l
+    c = 1.0 / rigidez_flexion
+    g = flexibilidad_cortante
+    return Diagramas(
+        reacciones,
+        PolinomioPorTramos(nodos, np.column_stack([cortante_i, -w1, -d / 2])),
+        PolinomioPorTramos(nodos, np.column_stack([momento_i, cortante_i, -w1 / 2, -d / 6])),
+        PolinomioPorTramos(
+            nodos, np.column_stack([giro_i, momento_i * c, cortante_i * c / 2, -w1 * c / 6, -d * c / 24])
+        ),
+        PolinomioPorTramos(
+            nodos,
+            np.column_stack(
+                [
+                    v_i,
+                    giro_i - cortante_i * g,
+                    momento_i * c / 2 + w1 * g / 2,
+                    cortante_i * c / 6 + d * g / 6,
+                    -w1 * c / 24,
+                    -d * c / 120,
+                ]
+            ),
+        ),
+    )
+
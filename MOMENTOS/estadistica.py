@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+
+# Estadística en flujo para resultados de Monte Carlo.
+# Acumulador recibe las muestras por bloques y guarda sólo una cantidad fija de números:
+# media y suma de cuadrados de Welford (cada bloque se combina con la fórmula de Chan,
+# estable aunque los bloques sean grandes), extremos exactos y un histograma de ancho
+# adaptable para los cuantiles. Sobre esos resúmenes se hacen pruebas t de una o dos
+# colas e intervalos de confianza para la media respecto de un umbral.
+
+BINS = 2**15  # 256 kB por acumulador
+ALTERNATIVAS = ("dos_colas", "mayor", "menor")  # H₁: μ ≠ umbral, μ > umbral, μ < umbral
+
+
+class Acumulador:
+    def __init__(self, bins=BINS):
+        if bins < 2 or bins % 2:
+            raise ValueError("El histograma necesita una cantidad par de bins")
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.descartados = 0  # Muestras no finitas
+        self._conteos = np.zeros(bins, dtype=np.int64)
+        self._origen = None
+        self._ancho = None
+
+    def agregar(self, valores):
+        valores = np.asarray(valores, dtype=float).ravel()
+        finitos = np.isfinite(valores)
+        if not finitos.all():
+            self.descartados += int(np.count_nonzero(~finitos))
+            valores = valores[finitos]
+        m = len(valores)
+        if m == 0:
+            return
+
+        media = float(valores.mean())
+        m2 = float(np.square(valores - media).sum())
+        total = self.n + m
+        delta = media - self.media
+        self.media += delta * m / total
+        self._m2 += m2 + delta**2 * self.n * m / total
+        self.n = total
+
+        menor, mayor = float(valores.min()), float(valores.max())
+        self.minimo, self.maximo = min(self.minimo, menor), max(self.maximo, mayor)
+        self._cubrir(menor, mayor)
+        indices = np.clip(((valores - self._origen) / self._ancho).astype(np.int64), 0, len(self._conteos) - 1)
+        self._conteos += np.bincount(indices, minlength=len(self._conteos))
+
+    def _cubrir(self, menor, mayor):
+        bins = len(self._conteos)
+        if self._origen is None:
+            # El primer bloque ocupa la mitad central: deja margen para los siguientes
+            rango = max(mayor - menor, abs(menor) * 1e-12, 1e-300)
+            self._ancho = 2 * rango / bins
+            self._origen = menor - rango / 2
+            return
+        # Si una muestra cae fuera, se funden bins de a pares (el ancho se duplica) y el
+        # histograma se corre hacia el lado que falta cubrir
+        while menor < self._origen or mayor >= self._origen + bins * self._ancho:
+            fundidos = self._conteos.reshape(-1, 2).sum(axis=1)
+            self._conteos = np.zeros(bins, dtype=np.int64)
+            if menor < self._origen:
+                self._conteos[bins // 2 :] = fundidos
+                self._origen -= bins * self._ancho
+            else:
+                self._conteos[: bins // 2] = fundidos
+            self._ancho *= 2
+
+    @property
+    def varianza(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def desvio(self):
+        return math.sqrt(self.varianza)
+
+    @property
+    def resolucion(self):
+        # Error máximo de los cuantiles: el ancho de un bin
+        return self._ancho
+
+    def cuantil(self, p):
+        # Interpolación lineal dentro del bin; p escalar o arreglo en [0, 1]
+        if self.n == 0:
+            raise ValueError("No hay muestras")
+        p = np.asarray(p, dtype=float)
+        acumulado = np.cumsum(self._conteos)
+        objetivo = p * self.n
+        k = np.minimum(np.searchsorted(acumulado, objetivo, side="left"), len(acumulado) - 1)
+        antes = acumulado[k] - self._conteos[k]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraccion = np.where(self._conteos[k] > 0, (objetivo - antes) / self._conteos[k], 0.0)
+        valor = np.clip(self._origen + (k + fraccion) * self._ancho, self.minimo, self.maximo)
+        return float(valor) if valor.ndim == 0 else valor
+
+
+def _t_student():
+    # scipy sólo se carga al hacer una prueba
+    from scipy.stats import t
+
+    return t
+
+
+def _validar(alternativa):
+    if alternativa not in ALTERNATIVAS:
+        raise ValueError(f"Alternativa desconocida: {alternativa!r} (una de {', '.join(ALTERNATIVAS)})")
+
+
+def intervalo_confianza(acumulador, nivel=0.95, alternativa="dos_colas"):
+    # (inferior, superior) para la media; con una cola el otro extremo es infinito
+    _validar(alternativa)
+    if acumulador.n < 2:
+        raise ValueError("El intervalo de confianza necesita al menos dos muestras")
+    error = acumulador.desvio / math.sqrt(acumulador.n)
+    grados = acumulador.n - 1
+    if error == 0:
+        # Todas las muestras iguales: la media es exacta y el intervalo se reduce a ella
+        margen = 0.0
+    elif alternativa == "dos_colas":
+        margen = _t_student().ppf(1 - (1 - nivel) / 2, grados) * error
+    else:
+        margen = _t_student().ppf(nivel, grados) * error
+    if alternativa == "dos_colas":
+        return acumulador.media - margen, acumulador.media + margen
+    if alternativa == "mayor":
+        return acumulador.media - margen, math.inf
+    return -math.inf, acumulador.media + margen
+
+
+class PruebaT:
+    def __init__(self, **campos):
+        self.__dict__.update(campos)
+
+    def describir(self):
+        signo = {"dos_colas": ("=", "≠"), "mayor": ("≤", ">"), "menor": ("≥", "<")}[self.alternativa]
+        colas = "dos colas" if self.alternativa == "dos_colas" else "una cola"
+        inferior, superior = self.intervalo
+        return "\n".join(
+            [
+                f"Prueba t de {colas} (n = {self.n}, α = {self.alfa:g})",
+                f"H₀: μ {signo[0]} {self.umbral:.6g}    H₁: μ {signo[1]} {self.umbral:.6g}",
+                f"media = {self.media:.6g}, t = {self.estadistico:.4f}, p = {self.p:.4g}",
+                f"intervalo de confianza {1 - self.alfa:.0%}: [{inferior:.6g}, {superior:.6g}]",
+                "Se rechaza H₀" if self.rechaza else "No se rechaza H₀",
+            ]
+        )
+
+
+def prueba_t(acumulador, umbral, alternativa="dos_colas", alfa=0.05):
+    # Prueba t de una muestra para la media del acumulador contra el umbral
+    _validar(alternativa)
+    if acumulador.n < 2:
+        raise ValueError("La prueba t necesita al menos dos muestras")
+    t = _t_student()
+    grados = acumulador.n - 1
+    diferencia = acumulador.media - umbral
+    error = acumulador.desvio / math.sqrt(acumulador.n)
+    if error == 0:
+        # Sin varianza la media es exacta: t es ±∞ (0 en el umbral) y H₀ se rechaza
+        # con certeza si la media la contradice, nunca si no
+        estadistico = math.copysign(math.inf, diferencia) if diferencia else 0.0
+        contradice = {"dos_colas": diferencia != 0, "mayor": diferencia > 0, "menor": diferencia < 0}
+        p = 0.0 if contradice[alternativa] else 1.0
+    else:
+        estadistico = diferencia / error
+        if alternativa == "dos_colas":
+            p = 2 * t.sf(abs(estadistico), grados)
+        elif alternativa == "mayor":
+            p = t.sf(estadistico, grados)
+        else:
+            p = t.cdf(estadistico, grados)
+    return PruebaT(
+        alternativa=alternativa, umbral=umbral, alfa=alfa, n=acumulador.n, media=acumulador.media,
+        estadistico=float(estadistico), grados=grados, p=float(p), rechaza=bool(p < alfa),
+        intervalo=intervalo_confianza(acumulador, 1 - alfa, alternativa),
+    )
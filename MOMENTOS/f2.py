@@ -3,7 +3,21 @@ from tkinter import messagebox
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
+
+import instrumentos
+from instrumentos import medido
+from render import GrupoTextos, Renderizador
+from rigidez import resolver_continua
+from trabajador import Trabajador
+
+# Color y leyenda de cada tipo de apoyo
+SUPPORT_STYLES = {
+    "simpleSupport": ("blue", "Apoyo Simple"),
+    "fixedSupport": ("red", "Apoyo Fijo"),
+    "rollerSupport": ("green", "Apoyo Deslizante"),
+    "hingedSupport": ("purple", "Apoyo Articulado"),
+}
 
 class BeamAnalyzer:
     def __init__(self, master):
@@ -22,6 +36,9 @@ class BeamAnalyzer:
         # Configuración de la interfaz
         self.create_widgets()
 
+        # El cálculo corre en segundo plano; sólo cuenta la última modificación
+        self.worker = Trabajador(self.master)
+
     def create_widgets(self):
         # Frame para la entrada de datos
         frame_inputs = tk.Frame(self.master)
@@ -104,11 +121,17 @@ class BeamAnalyzer:
         # Botón para realizar cálculos estructurales
         tk.Button(self.master, text="Calcular Resultados", command=self.calculate_results).pack(pady=10)
 
+        # Resultados en vivo, actualizados tras cada cambio de cargas o apoyos
+        self.results_label = tk.Label(self.master, justify="left")
+        self.results_label.pack(padx=10)
+
         # Crear área para el gráfico
         self.figure, self.ax = plt.subplots(figsize=(10, 3))
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.master)
         self.canvas.get_tk_widget().pack()
+        self.create_plot_artists()
 
+    @medido("evento.add_load")
     def add_load(self):
         load_type = self.load_type.get()
         magnitude = self.load_magnitude.get()
@@ -138,16 +161,20 @@ class BeamAnalyzer:
         self.loads_display.insert(tk.END, f"{load_type} - Magnitud: {magnitude} N")
 
         self.update_plot()  # Actualizar el gráfico en tiempo real
+        self.refresh_results()
 
+    @medido("evento.remove_load")
     def remove_load(self):
         try:
             selected_load_index = self.loads_display.curselection()[0]
             del self.loads[selected_load_index]
             self.loads_display.delete(selected_load_index)
             self.update_plot()  # Actualizar el gráfico en tiempo real
+            self.refresh_results()
         except IndexError:
             messagebox.showerror("Error", "No se ha seleccionado ninguna carga para quitar.")
 
+    @medido("evento.add_support")
     def add_support(self):
         support_type = self.support_type.get()
         position = self.support_position.get()
@@ -163,65 +190,173 @@ class BeamAnalyzer:
         }
         self.supports.append(new_support)
         self.update_plot()  # Actualizar el gráfico en tiempo real
+        self.refresh_results()
 
+    @medido("evento.remove_support")
     def remove_support(self):
         try:
             selected_support_index = self.supports_display.curselection()[0]
             del self.supports[selected_support_index]
             self.update_plot()  # Actualizar el gráfico en tiempo real
+            self.refresh_results()
         except IndexError:
             messagebox.showerror("Error", "No se ha seleccionado ningún apoyo para quitar.")
 
+    @medido("dibujo.artistas")
+    def create_plot_artists(self):
+        # Los artistas se crean una vez; update_plot sólo cambia sus datos
+        self.ax.set_ylim(-0.5, 0.5)
+        self.ax.set_title("Gráfico de la Viga con Cargas y Apoyos")
+        (self.beam_line,) = self.ax.plot([], [], color="black", linewidth=4)
+        self.plotted_length = None
+
+        self.render = Renderizador(self.ax)
+        self.support_markers = {
+            support_type: self.render.agregar(
+                self.ax.scatter([], [], color=color, s=200, zorder=5, label=label)
+            )
+            for support_type, (color, label) in SUPPORT_STYLES.items()
+        }
+        self.distributed_lines = self.render.agregar(
+            LineCollection([], colors="orange", linewidths=6, label="Carga Distribuida")
+        )
+        self.ax.add_collection(self.distributed_lines)
+        self.point_labels = GrupoTextos(
+            self.ax, self.render, flecha=dict(arrowstyle="->", color="green"),
+            color="green", fontsize=12, ha="center", va="bottom",
+        )
+        self.torque_labels = GrupoTextos(self.ax, self.render, color="purple", fontsize=12, ha="center")
+        self.legend_entries = None  # Artistas que lista la leyenda (sólo los presentes)
+        self.plotted_groups = {}  # Datos con que se dibujó cada grupo de artistas
+
+    def update_legend(self):
+        # La leyenda está en el fondo y sólo lista lo que hay en el gráfico: se rehace (y con
+        # ella el fondo) cuando cambia el conjunto de tipos presentes, no en cada edición
+        present = {s["type"] for s in self.supports}
+        entries = [marker for support_type, marker in self.support_markers.items() if support_type in present]
+        if any(l["type"] == "distributedLoad" for l in self.loads):
+            entries.append(self.distributed_lines)
+        if entries == self.legend_entries:
+            return
+        if self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        if entries:
+            self.ax.legend(handles=entries, loc="upper left")
+        self.legend_entries = entries
+        self.render.invalidar()
+
+    @medido("dibujo.update_plot")
     def update_plot(self):
-        # Limpiar gráfico actual
-        self.ax.clear()
+        # La viga, los ejes y la leyenda forman el fondo: sólo se redibuja todo si cambia la
+        # longitud o los tipos presentes
+        length = self.beam_length.get()
+        if length != self.plotted_length:
+            self.beam_line.set_data([0, length], [0, 0])
+            self.ax.set_xlim(-0.5, length + 0.5)
+            self.plotted_length = length
+            self.render.invalidar()
+
+        self.update_legend()
 
-        # Crear una representación gráfica de la viga
-        self.ax.plot([0, self.beam_length.get()], [0, 0], color="black", linewidth=4)
+        # Apoyos y cargas están siempre animados (la reserva de textos crece por
+        # duplicación), así que agregar o quitar una carga sólo cuesta un blit; de cada
+        # grupo sólo se actualizan los artistas si cambiaron sus datos
 
         # Dibujar los apoyos
-        for support in self.supports:
-            if support["type"] == "simpleSupport":
-                self.ax.scatter(support["position"], 0, color="blue", s=200, zorder=5, label="Apoyo Simple")
-            elif support["type"] == "fixedSupport":
-                self.ax.scatter(support["position"], 0, color="red", s=200, zorder=5, label="Apoyo Fijo")
-            elif support["type"] == "rollerSupport":
-                self.ax.scatter(support["position"], 0, color="green", s=200, zorder=5, label="Apoyo Deslizante")
-            elif support["type"] == "hingedSupport":
-                self.ax.scatter(support["position"], 0, color="purple", s=200, zorder=5, label="Apoyo Articulado")
+        supports = tuple((s["type"], s["position"]) for s in self.supports)
+        if self.plotted_groups.get("supports") != supports:
+            for support_type, marker in self.support_markers.items():
+                positions = [s["position"] for s in self.supports if s["type"] == support_type]
+                marker.set_offsets(np.column_stack([positions, np.zeros(len(positions))]))
+            self.plotted_groups["supports"] = supports
 
         # Dibujar las cargas
-        for load in self.loads:
-            if load["type"] == "pointLoad":
-                self.ax.annotate(f"{load['magnitude']} N", (load["position"], 0.1),
-                                 color="green", fontsize=12, ha="center", va="bottom", 
-                                 arrowprops=dict(arrowstyle="->", color="green"))
-            elif load["type"] == "distributedLoad":
-                self.ax.plot([load["start"], load["end"]], [0.1, 0.1], color="orange", linewidth=6, label="Carga Distribuida")
-            elif load["type"] == "torque":
-                self.ax.annotate("Torque", (load["position"], 0.1), color="purple", fontsize=12, ha="center")
+        point_loads = tuple((l["position"], l["magnitude"]) for l in self.loads if l["type"] == "pointLoad")
+        if self.plotted_groups.get("points") != point_loads:
+            self.point_labels.actualizar(
+                [position for position, _ in point_loads],
+                [0.1] * len(point_loads),
+                [f"{magnitude} N" for _, magnitude in point_loads],
+            )
+            self.plotted_groups["points"] = point_loads
+        distributed = tuple((l["start"], l["end"]) for l in self.loads if l["type"] == "distributedLoad")
+        if self.plotted_groups.get("distributed") != distributed:
+            self.distributed_lines.set_segments([[(start, 0.1), (end, 0.1)] for start, end in distributed])
+            self.plotted_groups["distributed"] = distributed
+        torques = tuple(l["position"] for l in self.loads if l["type"] == "torque")
+        if self.plotted_groups.get("torques") != torques:
+            self.torque_labels.actualizar(torques, [0.1] * len(torques), ["Torque"] * len(torques))
+            self.plotted_groups["torques"] = torques
 
         # Actualizar el gráfico
-        self.ax.set_xlim(-0.5, self.beam_length.get() + 0.5)
-        self.ax.set_ylim(-0.5, 0.5)
-        self.ax.set_title("Gráfico de la Viga con Cargas y Apoyos")
-        self.ax.legend(loc="upper left")
-        self.canvas.draw()
-
+        self.render.refrescar()
+
+    def solve_inputs(self):
+        # Copia de los datos tomada en el hilo de Tk: el cálculo no lee widgets ni listas vivas
+        supports = [dict(support) for support in self.supports]
+        apoyos = [(support["position"], support["type"]) for support in supports]
+        puntuales = [(l["magnitude"], l["position"]) for l in self.loads if l["type"] == "pointLoad"]
+        distribuidas = [
+            (l["magnitude"], l["magnitude"], l["start"], l["end"])
+            for l in self.loads
+            if l["type"] == "distributedLoad"
+        ]
+        momentos = [(l["magnitude"], l["position"]) for l in self.loads if l["type"] == "torque"]
+        EI = self.young_modulus.get() * self.inertia.get()
+        length = self.beam_length.get()
+
+        # Resolver la viga continua por el método de rigidez con los apoyos declarados
+        def solve():
+            diagramas = resolver_continua(length, apoyos, puntuales, distribuidas, momentos, EI=EI)
+            return supports, diagramas
+
+        return solve
+
+    def refresh_results(self):
+        # Recalcular tras cada edición; sin apoyos la viga es un mecanismo y no se calcula
+        # hasta que se coloque el primero (el botón Calcular sí informa del error)
+        if not self.supports:
+            self.worker.cancelar()
+            self.results_label.config(text="")
+            return
+        self.request_solve()
+
+    def request_solve(self, on_done=None):
+        # Una petición nueva deja sin efecto a la anterior si aún no ha terminado
+        self.results_label.config(text="Calculando...")
+        self.worker.enviar(
+            self.solve_inputs(),
+            lambda result: self.show_results(result, on_done),
+            lambda error: self.show_solve_error(error, on_done is not None),
+        )
+
+    def show_solve_error(self, error, notify=False):
+        if not isinstance(error, (KeyError, ValueError)):
+            raise error
+        message = f"No se puede resolver la viga: {error}"
+        self.results_label.config(text=message)
+        if notify:
+            messagebox.showerror("Error", message)
+
+    @medido("evento.show_results")
+    def show_results(self, result, on_done=None):
+        supports, diagramas = result
+
+        result_message = diagramas.resumen([f"Reacción en {support['type']}" for support in supports])
+
+        self.results_label.config(text=result_message)
+        if on_done is not None:
+            on_done(result_message)
+
+    @medido("evento.calculate_results")
     def calculate_results(self):
-        # Realizar un cálculo estructural simple de las reacciones en los apoyos
-        total_load = sum([load["magnitude"] for load in self.loads])
-        left_reaction = total_load / 2
-        right_reaction = total_load / 2
-
-        # Mostrar resultados básicos
-        result_message = f"Reacción en Apoyo Izquierdo: {left_reaction} N\n"
-        result_message += f"Reacción en Apoyo Derecho: {right_reaction} N"
-
-        messagebox.showinfo("Resultados del Cálculo", result_message)
+        self.request_solve(lambda message: messagebox.showinfo("Resultados del Cálculo", message))
 
 
 # Crear la ventana principal
-root = tk.Tk()
-app = BeamAnalyzer(root)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = BeamAnalyzer(root)
+    if instrumentos.activo():
+        instrumentos.panel_tk(root)
+    root.mainloop()
@@ -1,7 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
-import numpy as np
-import matplotlib.pyplot as plt
+
+import instrumentos
+from instrumentos import medido
+from rigidez import resolver_continua
+
+# Tipos de apoyo de la interfaz en los términos del método de rigidez
+SUPPORT_TYPES = {"Simple": "hingedSupport", "Empotrado": "fixedSupport", "Rolado": "rollerSupport"}
 
 class BeamAnalyzer:
     def __init__(self, master):
@@ -89,6 +94,7 @@ class BeamAnalyzer:
         # Botón para realizar cálculos estructurales
         tk.Button(self.master, text="Calcular Resultados", command=self.calculate_results).pack(pady=10)
 
+    @medido("evento.add_load")
     def add_load(self):
         load_type = self.load_type.get()
         magnitude = self.load_magnitude.get()
@@ -114,8 +120,11 @@ class BeamAnalyzer:
         self.loads.append(new_load)
         self.loads_display.insert(tk.END, f"{load_type} - Magnitud: {magnitude} N")
 
+    @medido("dibujo.draw_beam")
     def draw_beam(self):
-        # Crear una representación gráfica de la viga usando matplotlib
+        # Crear una representación gráfica de la viga usando matplotlib (se importa al dibujar)
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 3))
         ax.plot([0, self.beam_length.get()], [0, 0], color="black", linewidth=6, label="Viga")  # La viga
 
@@ -159,12 +168,35 @@ class BeamAnalyzer:
 
         plt.show()
 
+    @medido("evento.calculate_results")
     def calculate_results(self):
-        # Este método puede realizar los cálculos estructurales correspondientes.
-        # Aquí, por ahora, solo se mostrará un mensaje de confirmación.
-        messagebox.showinfo("Cálculos Completados", "Los cálculos estructurales se han realizado correctamente.")
+        # Resolver la viga con los apoyos de los extremos por el método de rigidez
+        length = self.beam_length.get()
+        supports = [
+            (0.0, SUPPORT_TYPES[self.left_support.get()]),
+            (length, SUPPORT_TYPES[self.right_support.get()]),
+        ]
+        try:
+            diagramas = resolver_continua(
+                length,
+                supports,
+                [(l["magnitude"], l["position"]) for l in self.loads if l["type"] == "pointLoad"],
+                [(l["magnitude"], l["magnitude"], l["start"], l["end"]) for l in self.loads if l["type"] == "distributedLoad"],
+                [(l["magnitude"], l["position"]) for l in self.loads if l["type"] == "torque"],
+                EI=self.young_modulus.get() * self.inertia.get(),
+            )
+        except ValueError as error:
+            messagebox.showerror("Error", f"No se puede resolver la viga: {error}")
+            return
+
+        result_message = diagramas.resumen([f"Reacción apoyo {side}" for side in ("izquierdo", "derecho")])
+
+        messagebox.showinfo("Cálculos Completados", result_message)
 
 # Crear la ventana principal
-root = tk.Tk()
-app = BeamAnalyzer(root)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = BeamAnalyzer(root)
+    if instrumentos.activo():
+        instrumentos.panel_tk(root)
+    root.mainloop()
@@ -0,0 +1,34 @@
+import numpy as np
+
+# Diagrama de momentos de una viga simplemente apoyada, muestreado en una malla fija,
+# como suma de los aportes de cada carga puntual. Mover una carga resta su aporte
+# anterior y suma el nuevo: O(muestras) por movimiento, sin importar cuántas cargas haya.
+
+
+class DiagramaIncremental:
+    def __init__(self, viga, puntos=500):
+        self.viga = viga
+        self.puntos = puntos
+        self.sincronizar()
+
+    def sincronizar(self):
+        # Recalcula todo desde la viga (al empezar y al soltar la carga, para no acumular redondeo)
+        self.longitud = self.viga.longitud
+        self.x, self.momentos = self.viga.calcular_momentos(self.puntos)
+        self.momentos = self.momentos.copy()
+        self.version = self.viga.version
+
+    def aporte(self, magnitud, posicion):
+        # Momento de una carga puntual aislada: P·min(x, a)·(L - max(x, a)) / L
+        L = self.longitud
+        return magnitud * np.minimum(self.x, posicion) * (L - np.maximum(self.x, posicion)) / L
+
+    def mover_carga_puntual(self, fila, posicion):
+        # Mueve la carga en la viga y actualiza el diagrama; devuelve la fila nueva
+        if self.version != self.viga.version:
+            raise ValueError("La viga cambió fuera del diagrama incremental; hay que sincronizar.")
+        magnitud, anterior = self.viga.cargas.fila(fila)
+        self.momentos += self.aporte(magnitud, posicion) - self.aporte(magnitud, anterior)
+        fila = self.viga.mover_carga_puntual(fila, posicion)
+        self.version = self.viga.version
+        return fila
@@ -0,0 +1,97 @@
+import numpy as np
+
+from rigidez import reacciones_unitarias
+
+# Líneas de influencia y envolventes de cargas móviles.
+# Para una disposición de apoyos se calculan una vez las reacciones debidas a una
+# carga unitaria en cada punto de una malla uniforme; el momento y el cortante en
+# cada sección salen por estática (términos de Macaulay de las reacciones y de la
+# carga). Un tren de ejes es entonces una correlación de esas matrices con los
+# pesos de los ejes sobre la malla: unas pocas sumas de rebanadas desplazadas.
+
+
+class Envolventes:
+    def __init__(self, secciones, momento_max, momento_min, cortante_max, cortante_min):
+        self.secciones = secciones
+        self.momento_max = momento_max
+        self.momento_min = momento_min
+        self.cortante_max = cortante_max
+        self.cortante_min = cortante_min
+
+
+class LineasInfluencia:
+    # apoyos: filas (posicion, tipo) como en rigidez; None para la viga simplemente
+    # apoyada en sus extremos. Las secciones coinciden con la malla de la carga.
+    def __init__(self, longitud, apoyos=None, puntos=201, EI=1.0):
+        self.longitud = float(longitud)
+        self.posiciones = np.linspace(0.0, self.longitud, puntos)
+        self.paso = self.posiciones[1] - self.posiciones[0]
+        x, xi = self.posiciones[:, None], self.posiciones[None, :]
+
+        if apoyos is None:
+            self.x_apoyo = np.array([0.0, self.longitud])
+            reacc_b = self.posiciones / self.longitud
+            self.reacciones = np.column_stack([1.0 - reacc_b, reacc_b])
+            self.momentos_apoyo = np.zeros_like(self.reacciones)
+        else:
+            self.x_apoyo, self.reacciones, self.momentos_apoyo = reacciones_unitarias(
+                self.longitud, apoyos, self.posiciones, EI
+            )
+
+        # Matrices secciones × posiciones de la carga unitaria
+        # Como en los diagramas, en x = longitud vale el límite por la izquierda: el
+        # apoyo del extremo final no cuenta en ninguna sección
+        brazo = np.maximum(x - self.x_apoyo, 0.0)
+        a_la_derecha = ((x >= self.x_apoyo) & (self.x_apoyo < self.longitud)).astype(float)
+        self.momento = (
+            brazo @ self.reacciones.T - a_la_derecha @ self.momentos_apoyo.T - np.maximum(x - xi, 0.0)
+        )
+        cortante_apoyos = a_la_derecha @ self.reacciones.T
+        # En la sección donde está la carga el cortante salta: se guardan ambos lados
+        self.cortante_izquierda = cortante_apoyos - (x > xi)
+        self.cortante_derecha = cortante_apoyos - (x >= xi)
+
+    def _pesos(self, ejes):
+        # Cada eje (P, distancia detrás del primero) repartido linealmente entre los
+        # dos nodos de la malla que lo rodean
+        ejes = np.atleast_2d(np.asarray(ejes, dtype=float))
+        magnitud, distancia = ejes[:, 0], ejes[:, 1] - ejes[:, 1].min()
+        nodo = np.floor(distancia / self.paso + 1e-9).astype(int)
+        fraccion = np.clip(distancia / self.paso - nodo, 0.0, 1.0)
+        return np.bincount(
+            np.concatenate([nodo, nodo + 1]),
+            np.concatenate([magnitud * (1 - fraccion), magnitud * fraccion]),
+        )
+
+    def efecto_tren(self, influencia, ejes):
+        # Efecto en cada sección para cada posición del primer eje, desde que entra
+        # a la viga hasta que sale el último: matriz secciones × posiciones del tren
+        pesos = self._pesos(ejes)
+        n_secciones, n_posiciones = influencia.shape
+        ancho = len(pesos)
+        relleno = np.zeros((n_secciones, n_posiciones + 2 * ancho))
+        relleno[:, ancho : ancho + n_posiciones] = influencia
+        pasos = n_posiciones + ancho - 1
+        efecto = np.zeros((n_secciones, pasos))
+        for desplazamiento in np.flatnonzero(pesos):
+            inicio = ancho - desplazamiento
+            efecto += pesos[desplazamiento] * relleno[:, inicio : inicio + pasos]
+        return efecto
+
+    def envolventes(self, ejes, ambos_sentidos=True):
+        # ejes: filas (magnitud, posición relativa en el tren), cargas hacia abajo
+        trenes = [np.asarray(ejes, dtype=float)]
+        if ambos_sentidos:
+            invertido = trenes[0].copy()
+            invertido[:, 1] = -invertido[:, 1]
+            trenes.append(invertido)
+
+        extremos = {}
+        for nombre, matrices in (
+            ("momento", (self.momento,)),
+            ("cortante", (self.cortante_izquierda, self.cortante_derecha)),
+        ):
+            efectos = [self.efecto_tren(m, tren) for m in matrices for tren in trenes]
+            extremos[nombre + "_max"] = np.max([e.max(axis=1) for e in efectos], axis=0)
+            extremos[nombre + "_min"] = np.min([e.min(axis=1) for e in efectos], axis=0)
+        return Envolventes(self.posiciones, **extremos)
@@ -0,0 +1,372 @@
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cache import CacheResultados
+from instrumentos import medido
+from procesar import ERRORES_CASO, LECTORES, detectar_formato, preparar_caso
+from singularidades import resultantes
+
+# Memorias de cálculo en DOCX, una por viga, a partir de los mismos archivos de casos
+# que procesar.py. Cada informe se arma con una lista de secciones (datos, reacciones,
+# diagramas, comprobaciones) sobre una plantilla de Word opcional, que aporta estilos,
+# membrete y márgenes. La imagen de los diagramas se dibuja una vez por viga distinta
+# (la clave de la caché de resultados) sobre una figura que se reutiliza, y vigas
+# idénticas comparten el PNG. Los casos van en bloques a procesos hijos con un número
+# acotado de bloques en vuelo, y los informes salen a un directorio o a un zip a medida
+# que llegan, así que la memoria queda bajo un techo fijo aunque el lote sea enorme.
+#
+#   python informes.py casos.jsonl -o informes.zip --procesos 0
+#   python informes.py casos.csv -o informes/ --plantilla membrete.docx
+
+LIMITE_FLECHA = 360  # Flecha admisible L / 360
+TAMANO_BLOQUE = 16
+MEMORIA_MB = 256  # Techo para los informes en vuelo hacia el proceso principal
+MEMORIA_IMAGENES_MB = 32  # Por proceso
+TAMANO_ESTIMADO = 256 * 1024  # Bytes de un informe hasta ver los primeros
+TITULO = "Memoria de cálculo: viga {id}"
+ESTILO_TABLA = "Table Grid"
+DIAGRAMAS = (("cortante", "Cortante"), ("momento", "Momento flector"), ("flecha", "Flecha"))
+
+
+class Imagenes:
+    # PNG de los diagramas por clave de caso, en un LRU acotado en bytes. La figura se
+    # crea una sola vez (sin pyplot, que guarda estado global) y sólo cambian sus datos
+    def __init__(self, capacidad_bytes=MEMORIA_IMAGENES_MB * 2**20, dpi=110):
+        self.capacidad_bytes = capacidad_bytes
+        self.dpi = dpi
+        self._png = OrderedDict()
+        self._bytes = 0
+        self._figura = None
+        self.dibujadas = self.reutilizadas = 0
+
+    def _crear_figura(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figura = Figure(figsize=(7, 6.5))
+        FigureCanvasAgg(figura)
+        figura.subplots_adjust(left=0.12, right=0.97, top=0.95, bottom=0.08, hspace=0.35)
+        ejes = figura.subplots(len(DIAGRAMAS), 1, sharex=True)
+        lineas = []
+        for ax, (_, titulo) in zip(ejes, DIAGRAMAS):
+            ax.set_title(titulo, fontsize=9, loc="left")
+            ax.axhline(0, color="black", linewidth=0.8)
+            ax.grid(True, alpha=0.3)
+            lineas.append(ax.plot([], [], color="tab:blue")[0])
+        ejes[-1].set_xlabel("x")
+        self._figura = (figura, ejes, lineas, [None] * len(DIAGRAMAS))
+
+    @medido("informe.imagen")
+    def _dibujar(self, muestras):
+        if self._figura is None:
+            self._crear_figura()
+        figura, ejes, lineas, rellenos = self._figura
+        for i, (ax, linea, (nombre, _)) in enumerate(zip(ejes, lineas, DIAGRAMAS)):
+            x, valores = muestras[nombre]
+            linea.set_data(x, valores)
+            if rellenos[i] is not None:
+                rellenos[i].remove()
+            rellenos[i] = ax.fill_between(x, valores, color="tab:blue", alpha=0.2)
+            ax.relim()
+            ax.autoscale_view()
+        salida = io.BytesIO()
+        figura.savefig(salida, format="png", dpi=self.dpi)
+        self.dibujadas += 1
+        return salida.getvalue()
+
+    def png(self, resultado):
+        datos = self._png.get(resultado.clave)
+        if datos is not None:
+            self._png.move_to_end(resultado.clave)
+            self.reutilizadas += 1
+            return datos
+        datos = self._dibujar(resultado.muestras)
+        self._png[resultado.clave] = datos
+        self._bytes += len(datos)
+        while self._bytes > self.capacidad_bytes and len(self._png) > 1:
+            self._bytes -= len(self._png.popitem(last=False)[1])
+        return datos
+
+
+def comprobaciones(longitud, columnas, resultado, limite_flecha=LIMITE_FLECHA):
+    # [(descripción, valor, admisible, cumple)]: equilibrio de fuerzas y de momentos
+    # respecto de x = 0 (reacciones hacia arriba, momentos horarios) y flecha máxima
+    fuerza, momento = resultantes(*columnas)
+    x, reaccion, momento_reaccion = np.asarray(resultado.reacciones).T
+    escala = max(abs(fuerza), float(np.abs(reaccion).max(initial=0.0)), 1e-300)
+    residuo_fuerza = float(reaccion.sum() - fuerza)
+    residuo_momento = float((x * reaccion).sum() + momento_reaccion.sum() - momento)
+    _, flecha_max, _, flecha_min = resultado.extremos["flecha"]
+    flecha = max(abs(flecha_max), abs(flecha_min))
+    admisible = longitud / limite_flecha
+    return [
+        ("Equilibrio vertical ΣR − ΣP", residuo_fuerza, 1e-9 * escala, abs(residuo_fuerza) <= 1e-9 * escala),
+        (
+            "Equilibrio de momentos en x = 0",
+            residuo_momento, 1e-9 * escala * longitud, abs(residuo_momento) <= 1e-9 * escala * longitud,
+        ),
+        (f"Flecha máxima ≤ L/{limite_flecha:g}", flecha, admisible, flecha <= admisible),
+    ]
+
+
+def preparar_informe(caso, cache, imagenes, limite_flecha=LIMITE_FLECHA):
+    # Todo lo que usan las secciones, ya calculado
+    longitud, columnas, apoyos, EI = preparar_caso(caso)
+    resultado = cache.resolver(longitud, columnas, apoyos, EI)
+    return {
+        "id": caso["id"],
+        "caso": caso,
+        "longitud": longitud,
+        "EI": EI,
+        "reacciones": resultado.reacciones,
+        "extremos": resultado.extremos,
+        "png": imagenes.png(resultado),
+        "comprobaciones": comprobaciones(longitud, columnas, resultado, limite_flecha),
+    }
+
+
+def _numero(valor):
+    return f"{valor:.6g}"
+
+
+def _tabla(doc, encabezados, filas):
+    tabla = doc.add_table(rows=1, cols=len(encabezados))
+    try:
+        tabla.style = ESTILO_TABLA
+    except KeyError:  # La plantilla no trae ese estilo: queda el de tabla por defecto
+        pass
+    for celda, texto in zip(tabla.rows[0].cells, encabezados):
+        celda.text = texto
+    for fila in filas:
+        for celda, valor in zip(tabla.add_row().cells, fila):
+            celda.text = valor if isinstance(valor, str) else _numero(valor)
+    return tabla
+
+
+def seccion_datos(doc, datos):
+    caso = datos["caso"]
+    doc.add_heading("Datos", level=2)
+    doc.add_paragraph(f"Longitud L = {_numero(datos['longitud'])}    EI = {_numero(datos['EI'])}")
+    apoyos = caso.get("apoyos") or [(0.0, "simpleSupport"), (datos["longitud"], "rollerSupport")]
+    _tabla(doc, ("Apoyo", "x"), [(tipo, float(x)) for x, tipo in apoyos])
+    cargas = (
+        [("Puntual", float(P), "", float(x), "") for P, x in caso.get("puntuales") or ()]
+        + [("Distribuida", float(q1), float(q2), float(a), float(b)) for q1, q2, a, b in caso.get("distribuidas") or ()]
+        + [("Momento", float(M), "", float(x), "") for M, x in caso.get("momentos") or ()]
+    )
+    doc.add_paragraph("Cargas (hacia abajo; momentos en sentido horario):")
+    _tabla(doc, ("Tipo", "Magnitud", "Magnitud final", "Posición", "Fin"), cargas)
+
+
+def seccion_reacciones(doc, datos):
+    doc.add_heading("Reacciones", level=2)
+    _tabla(doc, ("x", "Fuerza (hacia arriba)", "Momento"), datos["reacciones"].tolist())
+
+
+def seccion_diagramas(doc, datos):
+    from docx.shared import Cm
+
+    doc.add_heading("Diagramas", level=2)
+    doc.add_picture(io.BytesIO(datos["png"]), width=Cm(16))
+    filas = []
+    for nombre, titulo in DIAGRAMAS:
+        x_max, maximo, x_min, minimo = datos["extremos"][nombre]
+        filas.append((titulo, maximo, x_max, minimo, x_min))
+    _tabla(doc, ("Diagrama", "Máximo", "x", "Mínimo", "x"), filas)
+
+
+def seccion_comprobaciones(doc, datos):
+    doc.add_heading("Comprobaciones", level=2)
+    _tabla(
+        doc,
+        ("Comprobación", "Valor", "Admisible", "Resultado"),
+        [(texto, valor, admisible, "Cumple" if cumple else "No cumple")
+         for texto, valor, admisible, cumple in datos["comprobaciones"]],
+    )
+
+
+SECCIONES = (seccion_datos, seccion_reacciones, seccion_diagramas, seccion_comprobaciones)
+
+
+@medido("informe.docx")
+def generar_informe(datos, plantilla=None, secciones=SECCIONES):
+    # Bytes del DOCX; plantilla son los bytes de un .docx base (None: el de python-docx)
+    from docx import Document
+
+    doc = Document(io.BytesIO(plantilla) if plantilla is not None else None)
+    doc.add_heading(TITULO.format(**datos), level=1)
+    for seccion in secciones:
+        seccion(doc, datos)
+    salida = io.BytesIO()
+    doc.save(salida)
+    return salida.getvalue()
+
+
+def nombre_archivo(numero, identificador):
+    # El número de orden evita choques entre identificadores repetidos o que se sanean igual
+    return f"{numero:06d}_" + re.sub(r"[^\w.-]+", "_", str(identificador)) + ".docx"
+
+
+_estados = {}  # Por proceso: caché de resultados, imágenes y plantilla por configuración
+
+
+def _estado(ruta_cache, ruta_plantilla):
+    if (ruta_cache, ruta_plantilla) not in _estados:
+        plantilla = None
+        if ruta_plantilla is not None:
+            with open(ruta_plantilla, "rb") as archivo:
+                plantilla = archivo.read()
+        _estados[ruta_cache, ruta_plantilla] = (CacheResultados(ruta_cache), Imagenes(), plantilla)
+    return _estados[ruta_cache, ruta_plantilla]
+
+
+def informar_bloque(casos, primero=1, directorio=None, ruta_cache=None, ruta_plantilla=None, limite_flecha=LIMITE_FLECHA):
+    # Corre en el proceso hijo. Con `directorio` cada informe se escribe ahí mismo y sólo
+    # vuelve el resumen; sin él vuelven también los bytes, para el zip
+    cache, imagenes, plantilla = _estado(ruta_cache, ruta_plantilla)
+    salida = []
+    for numero, caso in enumerate(casos, primero):
+        if "error" in caso:
+            salida.append(({"id": caso.get("id"), "error": caso["error"]}, None))
+            continue
+        try:
+            datos = preparar_informe(caso, cache, imagenes, limite_flecha)
+        except ERRORES_CASO as error:
+            salida.append(({"id": caso.get("id"), "error": str(error) or type(error).__name__}, None))
+            continue
+        contenido = generar_informe(datos, plantilla)
+        resumen = {
+            "id": datos["id"],
+            "archivo": nombre_archivo(numero, datos["id"]),
+            "cumple": all(cumple for *_, cumple in datos["comprobaciones"]),
+            "bytes": len(contenido),
+        }
+        if directorio is not None:
+            with open(os.path.join(directorio, resumen["archivo"]), "wb") as archivo:
+                archivo.write(contenido)
+            contenido = None
+        salida.append((resumen, contenido))
+    return salida
+
+
+class SalidaDirectorio:
+    def __init__(self, ruta):
+        os.makedirs(ruta, exist_ok=True)
+        self.directorio = ruta
+
+    def escribir(self, nombre, contenido):
+        pass  # Ya lo escribió el proceso que generó el informe
+
+    def cerrar(self):
+        pass
+
+
+class SalidaZip:
+    # Los DOCX ya vienen comprimidos: se guardan tal cual, cada uno apenas llega
+    directorio = None
+
+    def __init__(self, ruta):
+        self.archivo = zipfile.ZipFile(ruta, "w", zipfile.ZIP_STORED)
+
+    def escribir(self, nombre, contenido):
+        self.archivo.writestr(nombre, contenido)
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+def abrir_salida(ruta):
+    return SalidaZip(ruta) if ruta.lower().endswith(".zip") else SalidaDirectorio(ruta)
+
+
+def _bloques(casos, tamano):
+    # (número del primer caso, casos)
+    bloque, primero = [], 1
+    for caso in casos:
+        bloque.append(caso)
+        if len(bloque) == tamano:
+            yield primero, bloque
+            primero += tamano
+            bloque = []
+    if bloque:
+        yield primero, bloque
+
+
+def generar_informes(
+    casos, salida, procesos=1, tamano_bloque=TAMANO_BLOQUE, memoria_mb=MEMORIA_MB,
+    ruta_cache=None, ruta_plantilla=None, limite_flecha=LIMITE_FLECHA,
+):
+    # Generador con el resumen de cada caso, en el orden de entrada. Los bloques en vuelo
+    # se limitan para que sus informes quepan en memoria_mb, con el tamaño estimado por el
+    # informe más grande visto hasta el momento
+    opciones = (salida.directorio, ruta_cache, ruta_plantilla, limite_flecha)
+
+    def entregar(resultados):
+        for resumen, contenido in resultados:
+            if contenido is not None:
+                salida.escribir(resumen["archivo"], contenido)
+            yield resumen
+
+    if procesos == 1:
+        for primero, bloque in _bloques(casos, tamano_bloque):
+            yield from entregar(informar_bloque(bloque, primero, *opciones))
+        return
+
+    procesos = procesos or os.cpu_count() or 1
+    estimado = TAMANO_ESTIMADO
+
+    def en_vuelo():
+        return max(procesos, int(memoria_mb * 2**20 // (tamano_bloque * estimado)))
+
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        pendientes = deque()
+        for primero, bloque in _bloques(casos, tamano_bloque):
+            pendientes.append(ejecutor.submit(informar_bloque, bloque, primero, *opciones))
+            while len(pendientes) >= en_vuelo():
+                resultados = pendientes.popleft().result()
+                estimado = max([estimado] + [r.get("bytes", 0) for r, _ in resultados])
+                yield from entregar(resultados)
+        while pendientes:
+            yield from entregar(pendientes.popleft().result())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una memoria de cálculo DOCX por viga.")
+    parser.add_argument("entrada", nargs="?", help="archivo de casos JSONL o CSV (por defecto, entrada estándar)")
+    parser.add_argument("-o", "--salida", required=True, help="directorio o archivo .zip de informes")
+    parser.add_argument("--formato-entrada", choices=sorted(LECTORES))
+    parser.add_argument("--plantilla", help="documento .docx base con estilos y membrete")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos (0: uno por núcleo)")
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument("--memoria-mb", type=float, default=MEMORIA_MB, help="techo para informes en vuelo")
+    parser.add_argument("--limite-flecha", type=float, default=LIMITE_FLECHA, help="flecha admisible L / N")
+    parser.add_argument("--cache", metavar="RUTA", help="base SQLite de resultados ya calculados")
+    args = parser.parse_args(argv)
+
+    entrada = open(args.entrada, newline="") if args.entrada else sys.stdin
+    salida = abrir_salida(args.salida)
+    try:
+        casos = LECTORES[detectar_formato(args.entrada, args.formato_entrada)](entrada)
+        resumenes = generar_informes(
+            casos, salida, args.procesos, args.tamano_bloque, args.memoria_mb,
+            args.cache, args.plantilla, args.limite_flecha,
+        )
+        for resumen in resumenes:
+            print(json.dumps(resumen))
+    finally:
+        salida.cerrar()
+        if entrada is not sys.stdin:
+            entrada.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Instrumentación opcional de las fases de cálculo y dibujo.
+# Desactivada, cada fase marcada cuesta una consulta a una bandera. Activada (con
+# MOMENTOS_PERFIL=1 o activar()), acumula por fase llamadas, tiempo total y máximo,
+# lleva contadores y guarda los eventos para una traza de Chrome (chrome://tracing o
+# Perfetto). Una fase elegida puede perfilarse con cProfile en su próxima ejecución.
+#
+# Variables de entorno:
+#   MOMENTOS_PERFIL=1                   activa la instrumentación al importar
+#   MOMENTOS_TRAZA=traza.json           escribe la traza al salir
+#   MOMENTOS_PERFIL_FASE=evento.on_click  perfila la próxima ejecución de esa fase...
+#   MOMENTOS_PERFIL_SALIDA=fase.prof      ...y guarda ahí el volcado de cProfile
+
+MAX_EVENTOS = 200_000  # Los más antiguos se descartan: la memoria no crece sin límite
+
+
+class _Registro:
+    def __init__(self):
+        self.activo = False
+        self.cerrojo = threading.Lock()
+        self.fases = {}  # nombre -> [llamadas, total (s), máximo (s)]
+        self.contadores = {}
+        self.eventos = deque(maxlen=MAX_EVENTOS)
+        self.origen = time.perf_counter()
+        self.perfil = None  # (fase, ruta) armada para cProfile
+
+
+_registro = _Registro()
+
+
+def activo():
+    return _registro.activo
+
+
+def activar(activo=True):
+    _registro.activo = activo
+
+
+def reiniciar():
+    with _registro.cerrojo:
+        _registro.fases.clear()
+        _registro.contadores.clear()
+        _registro.eventos.clear()
+        _registro.origen = time.perf_counter()
+
+
+def contar(nombre, cantidad=1):
+    if not _registro.activo:
+        return
+    with _registro.cerrojo:
+        _registro.contadores[nombre] = _registro.contadores.get(nombre, 0) + cantidad
+        _registro.eventos.append(
+            {
+                "name": nombre, "ph": "C", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (time.perf_counter() - _registro.origen) * 1e6,
+                "args": {"valor": _registro.contadores[nombre]},
+            }
+        )
+
+
+def _registrar(nombre, inicio, duracion):
+    with _registro.cerrojo:
+        estadistica = _registro.fases.setdefault(nombre, [0, 0.0, 0.0])
+        estadistica[0] += 1
+        estadistica[1] += duracion
+        estadistica[2] = max(estadistica[2], duracion)
+        _registro.eventos.append(
+            {
+                "name": nombre, "cat": nombre.split(".")[0], "ph": "X",
+                "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (inicio - _registro.origen) * 1e6, "dur": duracion * 1e6,
+            }
+        )
+
+
+class _Fase:
+    __slots__ = ("nombre", "inicio", "perfilador")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.perfilador = None
+
+    def __enter__(self):
+        armado = _registro.perfil
+        if armado is not None and armado[0] == self.nombre:
+            _registro.perfil = None
+            self.perfilador = (cProfile.Profile(), armado[1])
+            self.perfilador[0].enable()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        _registrar(self.nombre, self.inicio, time.perf_counter() - self.inicio)
+        if self.perfilador is not None:
+            perfil, ruta = self.perfilador
+            perfil.disable()
+            perfil.dump_stats(ruta)
+        return False
+
+
+class _Nula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_NULA = _Nula()
+
+
+def fase(nombre):
+    # with fase("dibujo.canvas"): ...
+    return _Fase(nombre) if _registro.activo else _NULA
+
+
+def medido(nombre):
+    # Decorador: la función entera es una fase
+    def decorar(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _registro.activo:
+                return funcion(*args, **kwargs)
+            with _Fase(nombre):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorar
+
+
+def perfilar_proxima(nombre, ruta):
+    # La próxima ejecución de la fase `nombre` corre bajo cProfile y se vuelca en `ruta`
+    # (se lee con python -m pstats ruta o snakeviz)
+    _registro.perfil = (nombre, ruta)
+
+
+def resumen():
+    with _registro.cerrojo:
+        fases = sorted(_registro.fases.items(), key=lambda item: -item[1][1])
+        contadores = sorted(_registro.contadores.items())
+    lineas = [f"{'fase':<28} {'llamadas':>9} {'total ms':>10} {'media ms':>9} {'máx ms':>9}"]
+    for nombre, (llamadas, total, maximo) in fases:
+        lineas.append(
+            f"{nombre:<28} {llamadas:>9} {total * 1e3:>10.1f} {total / llamadas * 1e3:>9.3f} {maximo * 1e3:>9.2f}"
+        )
+    for nombre, valor in contadores:
+        lineas.append(f"{nombre:<28} {valor:>9}")
+    return "\n".join(lineas)
+
+
+def guardar_traza(ruta):
+    # Formato de eventos de traza de Chrome
+    with _registro.cerrojo:
+        eventos = list(_registro.eventos)
+    with open(ruta, "w") as archivo:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+
+
+def panel_tk(master, intervalo_ms=500):
+    # Ventana aparte con el resumen, refrescada periódicamente
+    import tkinter as tk
+
+    ventana = tk.Toplevel(master)
+    ventana.title("Estadísticas de rendimiento")
+    etiqueta = tk.Label(ventana, font=("Courier", 9), justify="left", anchor="nw")
+    etiqueta.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def refrescar():
+        etiqueta.config(text=resumen())
+        ventana.after(intervalo_ms, refrescar)
+
+    refrescar()
+    return ventana
+
+
+def panel_matplotlib(fig, intervalo_ms=500):
+    # Texto en una esquina de la figura; se refresca con un temporizador del canvas
+    texto = fig.text(0.01, 0.99, "", family="monospace", fontsize=7, va="top", alpha=0.8)
+    temporizador = fig.canvas.new_timer(interval=intervalo_ms)
+
+    def refrescar():
+        texto.set_text(resumen())
+        fig.canvas.draw_idle()
+
+    temporizador.add_callback(refrescar)
+    temporizador.start()
+    return texto, temporizador
+
+
+def _desde_entorno():
+    # Pedir una traza o un perfil también activa la instrumentación
+    if os.environ.get("MOMENTOS_PERFIL") not in (None, "", "0"):
+        activar()
+    if os.environ.get("MOMENTOS_PERFIL_FASE"):
+        activar()
+        perfilar_proxima(
+            os.environ["MOMENTOS_PERFIL_FASE"], os.environ.get("MOMENTOS_PERFIL_SALIDA", "fase.prof")
+        )
+    if os.environ.get("MOMENTOS_TRAZA"):
+        activar()
+        atexit.register(guardar_traza, os.environ["MOMENTOS_TRAZA"])
+
+
+_desde_entorno()
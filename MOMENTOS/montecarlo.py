@@ -0,0 +1,206 @@
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from cargas import DISTRIBUIDA, MOMENTO, PUNTUAL
+from estadistica import BINS, Acumulador, prueba_t
+from instrumentos import medido
+from lotes import VigaBatch
+
+# Confiabilidad por Monte Carlo de una viga simplemente apoyada.
+# Las cargas de la viga son los valores nominales; a cada una se le pueden dar
+# distribuciones para su magnitud y su posición, y a E e I para la rigidez. Las muestras
+# se generan y resuelven por bloques con VigaBatch (sin bucle por muestra) y sólo pasan
+# a los acumuladores de estadistica.py, así que la memoria no depende de cuántas haya.
+#
+#   resultado = viga.montecarlo(10**6, {0: {"magnitud": Gumbel(10, 2)}}, E=..., I=...)
+#   prueba_t(resultado.momento, umbral=capacidad, alternativa="menor")
+
+BLOQUE = 2**12  # Bloques chicos: menos memoria y los intermedios caben en caché
+
+
+class Normal:
+    def __init__(self, media, desvio):
+        self.media, self.desvio = media, desvio
+
+    def muestrear(self, generador, n):
+        return generador.normal(self.media, self.desvio, n)
+
+
+class LogNormal:
+    # Dada por la media y el desvío de la variable, no de su logaritmo
+    def __init__(self, media, desvio):
+        self.media, self.desvio = media, desvio
+        self._sigma = math.sqrt(math.log1p((desvio / media) ** 2))
+        self._mu = math.log(media) - self._sigma**2 / 2
+
+    def muestrear(self, generador, n):
+        return generador.lognormal(self._mu, self._sigma, n)
+
+
+class Uniforme:
+    def __init__(self, minimo, maximo):
+        self.minimo, self.maximo = minimo, maximo
+
+    def muestrear(self, generador, n):
+        return generador.uniform(self.minimo, self.maximo, n)
+
+
+class Gumbel:
+    # Máximos (cargas variables en un período), dada por su media y su desvío
+    def __init__(self, media, desvio):
+        self.media, self.desvio = media, desvio
+        self._escala = desvio * math.sqrt(6) / math.pi
+        self._moda = media - np.euler_gamma * self._escala
+
+    def muestrear(self, generador, n):
+        return generador.gumbel(self._moda, self._escala, n)
+
+
+def _muestrear(variable, generador, n):
+    # Un número es un valor fijo; cualquier objeto con muestrear(generador, n), una distribución
+    if hasattr(variable, "muestrear"):
+        return np.asarray(variable.muestrear(generador, n), dtype=float)
+    return np.full(n, float(variable))
+
+
+class ResultadoMonteCarlo:
+    # momento: máximo |M| de cada muestra; flecha: máxima |flecha|; cortante: máximo |V|
+    def __init__(self, bins=BINS):
+        self.momento = Acumulador(bins)
+        self.flecha = Acumulador(bins)
+        self.cortante = Acumulador(bins)
+        self.n = 0
+        self.segundos = 0.0
+
+    def agregar(self, resultados):
+        self.momento.agregar(np.maximum(resultados.momento_max, -resultados.momento_min))
+        self.flecha.agregar(resultados.flecha_max)
+        self.cortante.agregar(resultados.cortante_max)
+        self.n += len(resultados.momento_max)
+
+
+def _columnas_nominales(viga):
+    # Filas activas de la tabla, en el orden en que se agregaron las cargas
+    tipo, magnitud, magnitud_fin, posicion, fin = viga.cargas.columnas()
+    activas = viga.cargas.activas()
+    return tipo[activas], magnitud[activas], magnitud_fin[activas], posicion[activas], fin[activas]
+
+
+def _tablas(viga, inciertas, generador, n):
+    # Columnas n × (cargas de cada tipo) para VigaBatch. Las cargas sin incertidumbre
+    # quedan como una fila difundida, sin ocupar memoria por muestra
+    tipo, magnitud, magnitud_fin, posicion, fin = _columnas_nominales(viga)
+    L = viga.longitud
+    columnas = {"magnitud": magnitud, "magnitud_fin": magnitud_fin, "posicion": posicion, "fin": fin}
+    filas = n if inciertas else 1
+    columnas = {nombre: np.repeat(c[None, :], filas, axis=0) for nombre, c in columnas.items()}
+    for indice, variables in inciertas.items():
+        desconocidas = set(variables) - {"magnitud", "magnitud_fin", "posicion", "fin"}
+        if desconocidas:
+            raise ValueError(f"Variables desconocidas para la carga {indice}: {sorted(desconocidas)}")
+        for nombre, variable in variables.items():
+            columnas[nombre][:, indice] = _muestrear(variable, generador, n)
+        # Sin distribución propia, el final acompaña al inicio: una distribuida conserva
+        # su forma al variar la magnitud y su largo al variar la posición
+        if "magnitud" in variables and "magnitud_fin" not in variables:
+            escala = magnitud_fin[indice] / magnitud[indice] if magnitud[indice] else 1.0
+            columnas["magnitud_fin"][:, indice] = columnas["magnitud"][:, indice] * escala
+        if "posicion" in variables and "fin" not in variables:
+            columnas["fin"][:, indice] = columnas["posicion"][:, indice] + (fin[indice] - posicion[indice])
+    # Posiciones dentro de la viga y distribuidas con inicio <= fin
+    inicio = np.clip(np.minimum(columnas["posicion"], columnas["fin"]), 0.0, L)
+    final = np.clip(np.maximum(columnas["posicion"], columnas["fin"]), 0.0, L)
+
+    def de_tipo(columna, codigo):
+        return columna[:, tipo == codigo]
+
+    puntuales = (de_tipo(columnas["magnitud"], PUNTUAL), de_tipo(inicio, PUNTUAL))
+    distribuidas = tuple(
+        de_tipo(c, DISTRIBUIDA) for c in (columnas["magnitud"], columnas["magnitud_fin"], inicio, final)
+    )
+    momentos = (de_tipo(columnas["magnitud"], MOMENTO), de_tipo(inicio, MOMENTO))
+    return puntuales, distribuidas, momentos
+
+
+@medido("montecarlo.bloque")
+def _resolver_bloque(viga, inciertas, E, I, generador, n):
+    puntuales, distribuidas, momentos = _tablas(viga, inciertas, generador, n)
+    if E is None:
+        EI = 1.0 / viga.flexibilidad[0]
+    else:
+        EI = _muestrear(E, generador, n) * _muestrear(I, generador, n)
+    return VigaBatch(np.full(n, float(viga.longitud)), puntuales, distribuidas, momentos).resolver(EI)
+
+
+def simular(viga, muestras, inciertas=None, E=None, I=None, semilla=None, bloque=BLOQUE, bins=BINS):
+    # inciertas: {índice de carga: {"magnitud" | "magnitud_fin" | "posicion" | "fin": variable}},
+    # con el índice en el orden en que se agregaron las cargas activas. E e I van juntos;
+    # sin ellos se usa la EI de la viga. La misma semilla y el mismo bloque repiten el resultado
+    inciertas = inciertas or {}
+    if (E is None) != (I is None):
+        raise ValueError("E e I se dan juntos (sin ninguno se usa la EI de la viga)")
+    if len(viga.flexibilidad) > 1:
+        raise ValueError("Monte Carlo necesita una sección constante")
+    n_cargas = len(_columnas_nominales(viga)[0])
+    if any(not 0 <= indice < n_cargas for indice in inciertas):
+        raise ValueError(f"Índice de carga fuera de rango (la viga tiene {n_cargas} cargas)")
+
+    generador = np.random.default_rng(semilla)
+    resultado = ResultadoMonteCarlo(bins)
+    inicio = time.perf_counter()
+    for desde in range(0, muestras, bloque):
+        resultado.agregar(_resolver_bloque(viga, inciertas, E, I, generador, min(bloque, muestras - desde)))
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def _pico_mb():
+    # Pico de memoria residente; resource sólo existe en Unix (en Windows queda NaN)
+    try:
+        import resource
+    except ImportError:
+        return math.nan
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == "darwin" else pico / 1024  # macOS da bytes, Linux KiB
+
+
+if __name__ == "__main__":
+    # Viga de 10 m con una distribuida de magnitud normal: el momento máximo qL²/8 es
+    # normal con media y desvío conocidos, y sirve para comprobar el flujo completo
+    from viga import Viga
+
+    parser = argparse.ArgumentParser(description="Comprueba el Monte Carlo contra una solución cerrada.")
+    parser.add_argument("--muestras", type=int, default=10**6)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+
+    L, q, desvio_q = 10.0, 2.0, 0.2
+    viga = Viga(L, EI=2.0e4)
+    viga.agregar_carga_distribuida(q, 0.0, L)
+    antes = _pico_mb()
+    resultado = simular(viga, args.muestras, {0: {"magnitud": Normal(q, desvio_q)}}, semilla=args.semilla)
+    momento = resultado.momento
+    esperado = (q * L**2 / 8, desvio_q * L**2 / 8)
+    print(f"{resultado.n} muestras en {resultado.segundos:.1f} s, pico de memoria {antes:.0f} -> {_pico_mb():.0f} MB")
+    print(f"media {momento.media:.5f} (exacta {esperado[0]:.5f}), desvío {momento.desvio:.5f} (exacto {esperado[1]:.5f})")
+
+    from scipy.stats import norm
+
+    p = np.array([0.05, 0.5, 0.95])
+    exactos = norm.ppf(p, *esperado)
+    print("cuantiles 5/50/95 %:", np.round(momento.cuantil(p), 4), "exactos:", np.round(exactos, 4))
+    print(prueba_t(momento, umbral=25.0, alternativa="dos_colas").describir())
+    print(prueba_t(momento, umbral=26.0, alternativa="menor").describir())
+
+    # Tolerancias de varios errores estándar (y la resolución del histograma)
+    error = esperado[1] / math.sqrt(resultado.n)
+    fallos = [
+        abs(momento.media - esperado[0]) > 5 * error,
+        abs(momento.desvio - esperado[1]) > 5 * esperado[1] / math.sqrt(2 * resultado.n),
+        np.max(np.abs(momento.cuantil(p) - exactos)) > 20 * error + momento.resolucion,
+    ]
+    raise SystemExit(1 if any(fallos) else 0)
@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from procesar import ERRORES_CASO, LECTORES, detectar_formato, preparar_caso, resolver_casos, resolver_preparado
+
+# Resolución de muchos casos repartidos en bloques entre procesos.
+# Las cargas de cada bloque viajan en un segmento de memoria compartida (columnas
+# planas más desplazamientos por caso) en lugar de serializarse; cada proceso
+# reconstruye exactamente los mismos arreglos que el camino en serie y llama a la
+# misma función, así que los resultados son idénticos bit a bit y salen en orden.
+
+# Los procesos comparten la base de la caché: si sigue bloqueada pasada la espera de
+# cache.ESPERA_BLOQUEO_S, falla sólo el caso que intentaba escribir
+ERRORES_CASO = ERRORES_CASO + (sqlite3.OperationalError,)
+_COLUMNAS_CARGA = ("tipo", "magnitud", "magnitud_fin", "posicion", "fin")
+_caches = {}  # Por proceso: una conexión a cada base de resultados
+
+
+def _cache(ruta):
+    if ruta is None:
+        return None
+    if ruta not in _caches:
+        from cache import CacheResultados
+
+        _caches[ruta] = CacheResultados(ruta)
+    return _caches[ruta]
+
+
+def _compartir(arreglos):
+    # Copia los arreglos (todos de 8 bytes por elemento) a un único segmento compartido
+    memoria = SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arreglos.values())))
+    esquema, desplazamiento = [], 0
+    for nombre, arreglo in arreglos.items():
+        np.ndarray(arreglo.shape, arreglo.dtype, memoria.buf, desplazamiento)[...] = arreglo
+        esquema.append((nombre, arreglo.dtype.str, arreglo.shape, desplazamiento))
+        desplazamiento += arreglo.nbytes
+    return memoria, (memoria.name, esquema)
+
+
+def empaquetar(casos):
+    # Prepara un bloque de casos; devuelve el segmento compartido, su descripción y
+    # los errores de preparación por posición (esos casos no se envían)
+    preparados, errores = [], {}
+    for i, caso in enumerate(casos):
+        if "error" in caso:
+            errores[i] = {"id": caso.get("id"), "error": caso["error"]}
+            continue
+        try:
+            preparados.append((i, preparar_caso(caso)))
+        except ERRORES_CASO as error:
+            errores[i] = {"id": caso.get("id"), "error": str(error) or type(error).__name__}
+
+    n_cargas = [len(columnas[0]) for _, (_, columnas, _, _) in preparados]
+    n_apoyos = [len(apoyos or ()) for _, (_, _, apoyos, _) in preparados]
+    arreglos = {
+        "longitud": np.array([longitud for _, (longitud, _, _, _) in preparados], dtype=float),
+        "EI": np.array([EI for _, (_, _, _, EI) in preparados], dtype=float),
+        "indice": np.array([i for i, _ in preparados], dtype=np.int64),
+        "cargas_desde": np.concatenate([[0], np.cumsum(n_cargas)]).astype(np.int64),
+        "apoyos_desde": np.concatenate([[0], np.cumsum(n_apoyos)]).astype(np.int64),
+        "x_apoyo": np.array(
+            [x for _, (_, _, apoyos, _) in preparados for x, _ in apoyos or ()], dtype=float
+        ),
+        "restriccion": np.array(
+            [r for _, (_, _, apoyos, _) in preparados for _, r in apoyos or ()], dtype=np.int64
+        ).reshape(-1, 3),
+    }
+    for j, nombre in enumerate(_COLUMNAS_CARGA):
+        partes = [columnas[j] for _, (_, columnas, _, _) in preparados]
+        arreglos[nombre] = np.concatenate(partes) if partes else np.zeros(0)
+    arreglos["tipo"] = arreglos["tipo"].astype(np.int64)
+    memoria, descriptor = _compartir(arreglos)
+    return memoria, descriptor, errores
+
+
+def resolver_bloque(descriptor, identificadores, ruta_cache=None):
+    # Se ejecuta en el proceso hijo: lee el bloque de la memoria compartida
+    cache = _cache(ruta_cache)
+    nombre, esquema = descriptor
+    memoria = SharedMemory(name=nombre)
+    try:
+        datos = {
+            clave: np.ndarray(forma, tipo, memoria.buf, desplazamiento).copy()
+            for clave, tipo, forma, desplazamiento in esquema
+        }
+    finally:
+        memoria.close()
+
+    resultados = []
+    desde_c, desde_a = datos["cargas_desde"], datos["apoyos_desde"]
+    for k, i in enumerate(datos["indice"]):
+        cargas = slice(desde_c[k], desde_c[k + 1])
+        apoyos = [
+            (x, tuple(r))
+            for x, r in zip(
+                datos["x_apoyo"][desde_a[k] : desde_a[k + 1]].tolist(),
+                datos["restriccion"][desde_a[k] : desde_a[k + 1]].tolist(),
+            )
+        ]
+        columnas = tuple(datos[c][cargas] for c in _COLUMNAS_CARGA)
+        try:
+            resultados.append(
+                resolver_preparado(
+                    identificadores[i], float(datos["longitud"][k]), columnas, apoyos or None,
+                    float(datos["EI"][k]), cache,
+                )
+            )
+        except ERRORES_CASO as error:
+            resultados.append({"id": identificadores[i], "error": str(error) or type(error).__name__})
+    return datos["indice"].tolist(), resultados
+
+
+def _liberar(memoria):
+    memoria.close()
+    memoria.unlink()
+
+
+def _bloques(casos, tamano):
+    bloque = []
+    for caso in casos:
+        bloque.append(caso)
+        if len(bloque) == tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def resolver_en_paralelo(casos, procesos=None, tamano_bloque=256, en_vuelo=None, ruta_cache=None):
+    # Generador con los resultados en el orden de entrada. Como mucho hay `en_vuelo`
+    # bloques a la vez en memoria, así que el consumo no depende del total de casos
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = en_vuelo or 2 * procesos
+
+    def recoger(futuro, memoria, bloque, errores):
+        try:
+            indices, resueltos = futuro.result()
+        finally:
+            _liberar(memoria)
+        salida = [None] * len(bloque)
+        for i, resultado in zip(indices, resueltos):
+            salida[i] = resultado
+        for i, error in errores.items():
+            salida[i] = error
+        return salida
+
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        pendientes = deque()
+        try:
+            for bloque in _bloques(casos, tamano_bloque):
+                memoria, descriptor, errores = empaquetar(bloque)
+                identificadores = [caso.get("id") for caso in bloque]
+                try:
+                    futuro = ejecutor.submit(resolver_bloque, descriptor, identificadores, ruta_cache)
+                except BaseException:
+                    _liberar(memoria)
+                    raise
+                pendientes.append((futuro, memoria, bloque, errores))
+                if len(pendientes) >= en_vuelo:
+                    yield from recoger(*pendientes.popleft())
+            while pendientes:
+                yield from recoger(*pendientes.popleft())
+        finally:
+            # Generador cerrado antes de tiempo o un bloque que falló: los segmentos
+            # que quedan se liberan igual (un hijo que aún no los abrió fallará sin más)
+            for futuro, memoria, _, _ in pendientes:
+                futuro.cancel()
+                _liberar(memoria)
+
+
+def verificar(casos, procesos=None, tamano_bloque=256):
+    # Compara el camino en serie con el paralelo; JSON distingue también -0.0 de 0.0
+    casos = list(casos)
+    inicio = time.perf_counter()
+    serie = [json.dumps(r) for r in resolver_casos(casos)]
+    t_serie = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    paralelo = [json.dumps(r) for r in resolver_en_paralelo(casos, procesos, tamano_bloque)]
+    t_paralelo = time.perf_counter() - inicio
+    distintos = [i for i, (a, b) in enumerate(zip(serie, paralelo)) if a != b]
+    if len(serie) != len(paralelo):
+        distintos.append(min(len(serie), len(paralelo)))
+    return distintos, t_serie, t_paralelo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Comprueba que la resolución en paralelo coincide bit a bit con la serie."
+    )
+    parser.add_argument("entrada", help="archivo de casos JSONL o CSV")
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("--tamano-bloque", type=int, default=256)
+    args = parser.parse_args()
+    with open(args.entrada, newline="") as entrada:
+        casos = list(LECTORES[detectar_formato(args.entrada)](entrada))
+    distintos, t_serie, t_paralelo = verificar(casos, args.procesos, args.tamano_bloque)
+    print(f"{len(casos)} casos: serie {t_serie:.2f} s, paralelo {t_paralelo:.2f} s "
+          f"({t_serie / t_paralelo:.2f}x)")
+    if distintos:
+        raise SystemExit(f"{len(distintos)} resultados distintos, el primero en el caso {distintos[0]}")
+    print("Resultados idénticos bit a bit.")
@@ -0,0 +1,236 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+
+import numpy as np
+
+from rigidez import TIPOS_APOYO, resolver_continua_cargas, restricciones
+from singularidades import columnas_de_cargas, resolver_cargas
+
+# Modo por lotes sin pantalla: lee vigas de JSONL o CSV (archivo o entrada estándar),
+# las resuelve una a una y escribe reacciones y envolventes a medida que salen.
+# Todo el recorrido son generadores, así que la memoria no depende del tamaño del archivo.
+# Con --cache, los casos ya resueltos (en esta u otras ejecuciones) se leen de una base SQLite.
+#
+# JSONL, una viga por línea ("apoyos" es opcional: sin él, apoyos simples en los extremos):
+#   {"id": "v1", "longitud": 10, "apoyos": [[0, "simpleSupport"], [10, "rollerSupport"]],
+#    "puntuales": [[P, x]], "distribuidas": [[q1, q2, a, b]], "momentos": [[M, x]], "EI": 1}
+# CSV, una carga o apoyo por fila, con las filas de cada viga seguidas:
+#   caso,longitud,tipo,magnitud,posicion,fin,magnitud_fin,EI
+#   tipo: puntual, distribuida, momento o un tipo de apoyo de TIPOS_APOYO
+
+# Errores que invalidan sólo su caso (datos ilegibles, sistema singular, divisiones por cero)
+ERRORES_CASO = (KeyError, TypeError, ValueError, ArithmeticError, np.linalg.LinAlgError)
+
+DIAGRAMAS = ("cortante", "momento", "flecha")
+CAMPOS = ("id", "reacciones") + tuple(
+    f"{prefijo}{nombre}_{extremo}"
+    for nombre in DIAGRAMAS
+    for extremo in ("max", "min")
+    for prefijo in ("", "x_")
+)
+
+
+def leer_jsonl(lineas):
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        try:
+            caso = json.loads(linea)
+        except ValueError as error:
+            yield {"id": numero, "error": f"JSON inválido: {error}"}
+            continue
+        if not isinstance(caso, dict):
+            yield {"id": numero, "error": f"Se esperaba un objeto JSON, no {type(caso).__name__}"}
+            continue
+        caso.setdefault("id", numero)
+        yield caso
+
+
+def _numero(texto, defecto=None):
+    return defecto if texto is None or texto.strip() == "" else float(texto)
+
+
+def _obligatorio(fila, campo):
+    valor = _numero(fila.get(campo))
+    if valor is None:
+        raise ValueError(f"falta {campo}")
+    return valor
+
+
+COLUMNAS_CSV = ("caso", "longitud", "tipo", "posicion")  # Las que toda fila necesita
+
+
+def leer_csv(lineas):
+    lector = csv.DictReader(lineas)
+    # Sin estas columnas no hay ninguna viga legible: es un error del archivo, no de un caso
+    faltan = [columna for columna in COLUMNAS_CSV if columna not in (lector.fieldnames or ())]
+    if faltan:
+        raise ValueError(f"Al CSV le faltan las columnas {', '.join(faltan)}")
+    # Una fila corta deja su caso en None y termina como registro de error de ese grupo
+    for caso, filas in itertools.groupby(lector, key=lambda fila: fila.get("caso")):
+        viga = {"id": caso, "puntuales": [], "distribuidas": [], "momentos": []}
+        try:
+            _leer_filas(viga, filas)
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            # Un valor ilegible invalida sólo su viga; groupby ya la deja atrás
+            viga["error"] = f"Fila inválida: {error}"
+        yield viga
+
+
+def _leer_filas(viga, filas):
+    for fila in filas:
+        viga["longitud"] = _numero(fila["longitud"], viga.get("longitud"))
+        if _numero(fila.get("EI")) is not None:
+            viga["EI"] = _numero(fila["EI"])
+        tipo = fila["tipo"].strip()
+        posicion = _obligatorio(fila, "posicion")
+        if tipo in TIPOS_APOYO:
+            viga.setdefault("apoyos", []).append((posicion, tipo))
+            continue
+        magnitud = _obligatorio(fila, "magnitud")
+        if tipo == "puntual":
+            viga["puntuales"].append((magnitud, posicion))
+        elif tipo == "momento":
+            viga["momentos"].append((magnitud, posicion))
+        elif tipo == "distribuida":
+            magnitud_fin = _numero(fila.get("magnitud_fin"), magnitud)
+            viga["distribuidas"].append((magnitud, magnitud_fin, posicion, _obligatorio(fila, "fin")))
+        else:
+            viga["error"] = f"Tipo de fila desconocido: {tipo!r}"
+
+
+def _positivo(caso, campo, defecto=None):
+    valor = float(caso[campo] if defecto is None else caso.get(campo, defecto))
+    if not (math.isfinite(valor) and valor > 0):
+        raise ValueError(f"{campo} debe ser un número finito mayor que cero, no {valor!r}")
+    return valor
+
+
+def preparar_caso(caso):
+    # (longitud, columnas de cargas, apoyos, EI) listos para resolver; apoyos es None
+    # en la viga simplemente apoyada en sus extremos
+    longitud = _positivo(caso, "longitud")
+    columnas = columnas_de_cargas(caso.get("puntuales"), caso.get("distribuidas"), caso.get("momentos"))
+    if not all(np.all(np.isfinite(columna)) for columna in columnas[1:]):
+        raise ValueError("Hay cargas con magnitudes o posiciones no finitas")
+    apoyos = None
+    if caso.get("apoyos"):
+        apoyos = [(float(x), restricciones(tipo)) for x, tipo in caso["apoyos"]]
+    return longitud, columnas, apoyos, _positivo(caso, "EI", 1.0)
+
+
+def resolver_preparado(identificador, longitud, columnas, apoyos, EI, cache=None):
+    if cache is not None:
+        resultado = cache.resolver(longitud, columnas, apoyos, EI)
+        return _resultado(identificador, resultado.reacciones.tolist(), resultado.extremos)
+
+    if apoyos:
+        diagramas = resolver_continua_cargas(longitud, apoyos, columnas, EI)
+        reacciones = [[float(x), float(f), float(m)] for x, f, m in diagramas.reacciones]
+    else:
+        diagramas = resolver_cargas(longitud, columnas, EI=EI)
+        reacc_a, reacc_b = diagramas.reacciones
+        reacciones = [[0.0, float(reacc_a), 0.0], [longitud, float(reacc_b), 0.0]]
+
+    return _resultado(
+        identificador, reacciones, {nombre: getattr(diagramas, nombre).extremos() for nombre in DIAGRAMAS}
+    )
+
+
+def _resultado(identificador, reacciones, extremos):
+    resultado = {"id": identificador, "reacciones": reacciones}
+    for nombre in DIAGRAMAS:
+        x_max, maximo, x_min, minimo = extremos[nombre]
+        resultado[f"{nombre}_max"] = float(maximo)
+        resultado[f"x_{nombre}_max"] = float(x_max)
+        resultado[f"{nombre}_min"] = float(minimo)
+        resultado[f"x_{nombre}_min"] = float(x_min)
+    return resultado
+
+
+def resolver_caso(caso, cache=None):
+    return resolver_preparado(caso.get("id"), *preparar_caso(caso), cache=cache)
+
+
+def resolver_casos(casos, cache=None):
+    # Un caso inválido no detiene el lote: se informa en su propia línea
+    for caso in casos:
+        if "error" in caso:
+            yield {"id": caso.get("id"), "error": caso["error"]}
+            continue
+        try:
+            yield resolver_caso(caso, cache)
+        except ERRORES_CASO as error:
+            yield {"id": caso.get("id"), "error": str(error) or type(error).__name__}
+
+
+def escribir_jsonl(resultados, salida):
+    for resultado in resultados:
+        salida.write(json.dumps(resultado) + "\n")
+
+
+def escribir_csv(resultados, salida):
+    escritor = csv.DictWriter(salida, CAMPOS + ("error",), lineterminator="\n")
+    escritor.writeheader()
+    for resultado in resultados:
+        if "reacciones" in resultado:
+            resultado = dict(resultado, reacciones=json.dumps(resultado["reacciones"]))
+        escritor.writerow(resultado)
+
+
+LECTORES = {"jsonl": leer_jsonl, "csv": leer_csv}
+ESCRITORES = {"jsonl": escribir_jsonl, "csv": escribir_csv}
+
+
+def detectar_formato(nombre, indicado=None):
+    if indicado:
+        return indicado
+    return "csv" if nombre and nombre.lower().endswith(".csv") else "jsonl"
+
+
+def argumentos():
+    parser = argparse.ArgumentParser(description="Resuelve vigas por lotes desde JSONL o CSV.")
+    parser.add_argument("entrada", nargs="?", help="archivo de casos (por defecto, entrada estándar)")
+    parser.add_argument("-o", "--salida", help="archivo de resultados (por defecto, salida estándar)")
+    parser.add_argument("--formato-entrada", choices=sorted(LECTORES))
+    parser.add_argument("--formato-salida", choices=sorted(ESCRITORES))
+    parser.add_argument(
+        "--procesos", type=int, default=1, help="procesos de cálculo (0: uno por núcleo)"
+    )
+    parser.add_argument(
+        "--cache", metavar="RUTA", help="base SQLite de resultados ya calculados (se crea si no existe)"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = argumentos().parse_args(argv)
+    entrada = open(args.entrada, newline="") if args.entrada else sys.stdin
+    salida = open(args.salida, "w", newline="") if args.salida else sys.stdout
+    try:
+        casos = LECTORES[detectar_formato(args.entrada, args.formato_entrada)](entrada)
+        if args.procesos == 1:
+            cache = None
+            if args.cache:
+                from cache import CacheResultados
+
+                cache = CacheResultados(args.cache)
+            resultados = resolver_casos(casos, cache)
+        else:
+            from paralelo import resolver_en_paralelo
+
+            resultados = resolver_en_paralelo(casos, args.procesos or None, ruta_cache=args.cache)
+        ESCRITORES[detectar_formato(args.salida, args.formato_salida)](resultados, salida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Capa de dibujo que reutiliza artistas de matplotlib.
+# Los artistas se crean una vez y se actualizan en su sitio (set_data, set_offsets);
+# los que cambian a menudo se marcan como animados y se redibujan sobre un fondo
+# guardado (blitting), así que el costo de un cuadro no crece con el resto del gráfico.
+
+from instrumentos import medido
+
+
+class Renderizador:
+    def __init__(self, ax):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.animados = []
+        self.fondo = None
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    def agregar(self, artista):
+        # Artista nuevo que nunca estuvo en el fondo: no hace falta volver a guardarlo
+        artista.set_animated(True)
+        self.animados.append(artista)
+        return artista
+
+    def animar(self, *artistas):
+        # Artistas ya dibujados en el fondo que pasan a redibujarse en cada refresco
+        for artista in artistas:
+            self.agregar(artista)
+        self.invalidar()
+
+    def fijar(self, *artistas):
+        # Devuelve los artistas al fondo (por ejemplo al terminar un arrastre)
+        for artista in artistas:
+            artista.set_animated(False)
+            self.animados.remove(artista)
+        self.invalidar()
+
+    def _al_dibujar(self, event):
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._dibujar_animados()
+
+    def _dibujar_animados(self):
+        for artista in self.animados:
+            self.ax.draw_artist(artista)
+
+    def invalidar(self):
+        # El fondo cambió (límites, artistas fijos): el próximo refresco dibuja todo
+        self.fondo = None
+
+    @medido("dibujo.canvas")
+    def redibujar(self):
+        # Dibujo completo: necesario cuando cambia el fondo (límites, artistas fijos)
+        self.canvas.draw()
+
+    @medido("dibujo.blit")
+    def refrescar(self):
+        # Sólo los artistas animados sobre el fondo guardado
+        if self.fondo is None:
+            self.redibujar()
+            return
+        self.canvas.restore_region(self.fondo)
+        self._dibujar_animados()
+        self.canvas.blit(self.ax.bbox)
+
+
+class GrupoTextos:
+    # Textos (o anotaciones con flecha) reutilizables: los que sobran se ocultan y, cuando
+    # faltan, la reserva se duplica para no crear artistas en cada carga nueva
+    def __init__(self, ax, renderizador=None, flecha=None, **estilo):
+        self.ax = ax
+        self.renderizador = renderizador
+        self.flecha = flecha
+        self.estilo = estilo
+        self.textos = []
+
+    def _crear(self):
+        if self.flecha is None:
+            texto = self.ax.text(0, 0, "", **self.estilo)
+        else:
+            texto = self.ax.annotate("", (0, 0), arrowprops=self.flecha, **self.estilo)
+        if self.renderizador is not None:
+            self.renderizador.agregar(texto)
+        return texto
+
+    @medido("dibujo.textos")
+    def actualizar(self, x, y, cadenas):
+        if len(self.textos) < len(cadenas):
+            faltan = max(len(cadenas), 2 * len(self.textos)) - len(self.textos)
+            self.textos.extend(self._crear() for _ in range(faltan))
+        for texto, xi, yi, cadena in zip(self.textos, x, y, cadenas):
+            texto.set_position((xi, yi))
+            if self.flecha is not None:
+                texto.xy = (xi, yi)
+            texto.set_text(cadena)
+            texto.set_visible(True)
+        for texto in self.textos[len(cadenas):]:
+            texto.set_visible(False)
@@ -0,0 +1,265 @@
+import numpy as np
+
+from cargas import DISTRIBUIDA, MOMENTO, PUNTUAL
+from singularidades import (
+    columnas_de_cargas, construir_diagramas, fuera_de_la_viga, terminos_momento, terminos_reacciones, validar_cargas,
+)
+
+# Método directo de rigidez para vigas continuas (Euler-Bernoulli).
+# Nodos en apoyos y cargas, dos grados de libertad por nodo (flecha hacia arriba,
+# giro antihorario) y matriz de rigidez en banda: la resolución es O(nodos).
+
+# Restricciones (x, y, giro) como en indeterminatebeam.Support; las cargas son sólo
+# verticales, así que la restricción en x no interviene
+TIPOS_APOYO = {
+    "simpleSupport": (1, 1, 0),
+    "hingedSupport": (1, 1, 0),
+    "rollerSupport": (0, 1, 0),
+    "fixedSupport": (1, 1, 1),
+}
+
+_BANDA = 3  # Semiancho de banda con el orden (v0, θ0, v1, θ1, ...)
+_SEPARACION_MINIMA = 1e-9  # Distancia mínima entre nodos, relativa a la longitud
+_GDL_DENSO = 64  # Hasta aquí se resuelve con NumPy denso: evita importar scipy.linalg (~90 ms)
+
+
+def restricciones(tipo):
+    # (x, y, giro) con 1 donde el apoyo restringe; se valida aquí para que un apoyo mal
+    # escrito sea un error de su caso y no de todo el bloque
+    if isinstance(tipo, str):
+        if tipo not in TIPOS_APOYO:
+            raise ValueError(f"Tipo de apoyo desconocido: {tipo!r}")
+        return TIPOS_APOYO[tipo]
+    restriccion = tuple(int(r) for r in tipo)
+    if len(restriccion) != 3 or not set(restriccion) <= {0, 1}:
+        raise ValueError(f"Restricción inválida {list(tipo)!r}: se esperan tres valores 0 o 1 (x, y, giro)")
+    return restriccion
+
+
+def rigidez_elementos(l, EI, phi=0.0):
+    # Matrices de rigidez 4 × 4 de todos los elementos a la vez. phi = 12·EI/(κGA·l²)
+    # agrega la deformación por cortante (Timoshenko); con phi = 0 es Euler-Bernoulli
+    k = np.empty((len(l), 4, 4))
+    c = EI / (l**3 * (1 + phi))
+    k[:, 0] = np.stack([12 * c, 6 * l * c, -12 * c, 6 * l * c], axis=1)
+    k[:, 1] = np.stack([6 * l * c, (4 + phi) * l**2 * c, -6 * l * c, (2 - phi) * l**2 * c], axis=1)
+    k[:, 2] = -k[:, 0]
+    k[:, 3] = np.stack([6 * l * c, (2 - phi) * l**2 * c, -6 * l * c, (4 + phi) * l**2 * c], axis=1)
+    return k
+
+
+def ensamblar_banda(k):
+    # Matriz global en el formato de scipy.linalg.solve_banded: ab[u + i - j, j] = K[i, j]
+    n_elementos = len(k)
+    ab = np.zeros((2 * _BANDA + 1, 2 * (n_elementos + 1)))
+    columnas = 2 * np.arange(n_elementos)
+    for fila in range(4):
+        for columna in range(4):
+            ab[_BANDA + fila - columna, columnas + columna] += k[:, fila, columna]
+    return ab
+
+
+def intensidades(nodos, columnas):
+    # Intensidad total de las distribuidas (hacia abajo) al inicio y al final de cada
+    # elemento: q(x) = constante + pendiente·x por diferencias acumuladas
+    # Una carga fuera de la viga es un error; lo que sobra por redondeo va al nodo extremo
+    validar_cargas(nodos[-1], columnas)
+    tipo, magnitud, magnitud_fin, posicion, fin = columnas
+    n_nodos = len(nodos)
+    distribuida = tipo == DISTRIBUIDA
+    a, b = posicion[distribuida], fin[distribuida]
+    q1, q2 = magnitud[distribuida], magnitud_fin[distribuida]
+    pendiente = np.divide(q2 - q1, b - a, out=np.zeros_like(a), where=b != a)
+    desde, hasta = nodo_cercano(nodos, a), nodo_cercano(nodos, b)
+    constante = np.cumsum(
+        np.bincount(desde, q1 - pendiente * a, n_nodos) - np.bincount(hasta, q1 - pendiente * a, n_nodos)
+    )[:-1]
+    inclinacion = np.cumsum(
+        np.bincount(desde, pendiente, n_nodos) - np.bincount(hasta, pendiente, n_nodos)
+    )[:-1]
+    return constante + inclinacion * nodos[:-1], constante + inclinacion * nodos[1:]
+
+
+def cargas_nodales(nodos, columnas):
+    # Vector de cargas nodales equivalentes (fuerzas hacia arriba, momentos antihorarios)
+    # Una carga fuera de la viga es un error; lo que sobra por redondeo va al nodo extremo
+    validar_cargas(nodos[-1], columnas)
+    tipo, magnitud, _, posicion, _ = columnas
+    n_nodos = len(nodos)
+    f = np.zeros(2 * n_nodos)
+
+    nodo = nodo_cercano(nodos, posicion)
+    puntual, momento = tipo == PUNTUAL, tipo == MOMENTO
+    f[0::2] -= np.bincount(nodo[puntual], weights=magnitud[puntual], minlength=n_nodos)
+    f[1::2] -= np.bincount(nodo[momento], weights=magnitud[momento], minlength=n_nodos)
+
+    w1, w2 = intensidades(nodos, columnas)
+    l = np.diff(nodos)
+    equivalentes = np.stack(
+        [
+            -l * (7 * w1 + 3 * w2) / 20,
+            -(l**2) * (3 * w1 + 2 * w2) / 60,
+            -l * (3 * w1 + 7 * w2) / 20,
+            l**2 * (2 * w1 + 3 * w2) / 60,
+        ],
+        axis=1,
+    )
+    f[: 2 * (n_nodos - 1)] += equivalentes[:, :2].ravel()
+    f[2:] += equivalentes[:, 2:].ravel()
+    return f
+
+
+def resolver_continua(longitud, apoyos, puntuales=None, distribuidas=None, momentos=None, EI=1.0):
+    # apoyos: filas (posicion, tipo), con tipo una clave de TIPOS_APOYO o restricciones (x, y, giro)
+    return resolver_continua_cargas(
+        longitud, apoyos, columnas_de_cargas(puntuales, distribuidas, momentos), EI
+    )
+
+
+def _sistema(longitud, apoyos, puntos, EI):
+    # Nodos y matriz en banda con los grados restringidos ya anulados
+    # (fila y columna a cero y uno en la diagonal)
+    x_apoyo = np.array([float(x) for x, _ in apoyos])
+    restriccion = np.array([restricciones(t) for _, t in apoyos]).reshape(-1, 3)
+    if np.any(fuera_de_la_viga(longitud, x_apoyo)):
+        raise ValueError(f"Hay apoyos fuera de la viga [0, {longitud:g}]")
+    nodos = crear_nodos(longitud, np.concatenate([x_apoyo, puntos]))
+
+    k = rigidez_elementos(np.diff(nodos), EI)
+    nodo_apoyo = nodo_cercano(nodos, x_apoyo)
+    fijos = np.unique(
+        np.concatenate([2 * nodo_apoyo[restriccion[:, 1] == 1], 2 * nodo_apoyo[restriccion[:, 2] == 1] + 1])
+    )
+    # Se cuentan grados restringidos y no apoyos: dos apoyos en el mismo punto son uno
+    if not np.any(fijos % 2 == 0) or len(fijos) < 2:
+        raise ValueError("Apoyos insuficientes: la viga es un mecanismo.")
+    sistema = anular_fijos(ensamblar_banda(k), fijos)
+    return nodos, k, sistema, fijos, nodo_apoyo, x_apoyo, restriccion
+
+
+def crear_nodos(longitud, puntos):
+    nodos = np.unique(np.clip(np.concatenate([[0.0, longitud], puntos]), 0.0, longitud))
+    # Nodos casi coincidentes darían elementos de rigidez enorme: se queda el primero de
+    # cada grupo (el último grupo, en L). Los puntos del grupo se llevan a ese nodo con
+    # nodo_cercano
+    nodos = nodos[np.insert(np.diff(nodos) > _SEPARACION_MINIMA * longitud, 0, True)]
+    nodos[-1] = longitud
+    return nodos
+
+
+def primero_en_nodo(nodo_apoyo, restringe):
+    # Apoyos en el mismo nodo comparten el grado de libertad: su reacción se le da al
+    # primero que lo restringe y los demás quedan en cero
+    primero = np.zeros(len(nodo_apoyo), dtype=bool)
+    indices = np.flatnonzero(restringe)
+    _, unicos = np.unique(nodo_apoyo[indices], return_index=True)
+    primero[indices[unicos]] = True
+    return primero
+
+
+def nodo_cercano(nodos, x):
+    # Índice del nodo más próximo a cada x (searchsorted solo mandaría al nodo siguiente
+    # los puntos fundidos con uno anterior)
+    x = np.asarray(x, dtype=float)
+    derecho = np.clip(np.searchsorted(nodos, x), 1, len(nodos) - 1)
+    izquierdo = derecho - 1
+    return np.where(x - nodos[izquierdo] <= nodos[derecho] - x, izquierdo, derecho)
+
+
+def sumar_diagonal(sistema, gdl, valores):
+    # Resortes: rigidez propia de un grado de libertad (se acumula si se repite)
+    np.add.at(sistema[_BANDA], gdl, valores)
+    return sistema
+
+
+def anular_fijos(sistema, fijos):
+    # Fila y columna de cada grado restringido a cero y uno en la diagonal
+    n_gdl = sistema.shape[1]
+    for desplazamiento in range(-_BANDA, _BANDA + 1):
+        columna = fijos + desplazamiento
+        valida = (columna >= 0) & (columna < n_gdl)
+        sistema[_BANDA - desplazamiento, columna[valida]] = 0.0  # Fila del grado fijo
+        sistema[_BANDA + desplazamiento, fijos[valida]] = 0.0  # Columna del grado fijo
+    sistema[_BANDA, fijos] = 1.0
+    return sistema
+
+
+def _densa(sistema):
+    # La matriz completa a partir de la banda: K[i, j] = ab[u + i - j, j]
+    n_gdl = sistema.shape[1]
+    k = np.zeros((n_gdl, n_gdl))
+    for desplazamiento in range(-_BANDA, _BANDA + 1):
+        columna = np.arange(max(0, -desplazamiento), min(n_gdl, n_gdl - desplazamiento))
+        k[columna + desplazamiento, columna] = sistema[_BANDA + desplazamiento, columna]
+    return k
+
+
+def desplazamientos(sistema, fijos, f):
+    # f puede tener varias columnas (un caso de carga por columna)
+    libre = f.copy()
+    libre[fijos] = 0.0
+    try:
+        if sistema.shape[1] <= _GDL_DENSO:
+            u = np.linalg.solve(_densa(sistema), libre)
+        else:
+            from scipy.linalg import solve_banded
+
+            u = solve_banded((_BANDA, _BANDA), sistema, libre)
+    except np.linalg.LinAlgError:  # scipy.linalg.LinAlgError es la misma clase
+        raise ValueError("Apoyos insuficientes: la viga es un mecanismo.") from None
+    if not np.all(np.isfinite(u)):
+        raise ValueError("Apoyos insuficientes: la viga es un mecanismo.")
+    return u
+
+
+def residuo_nodal(k, u, f):
+    # K·u - f elemento a elemento (en los grados restringidos son las reacciones)
+    n_elementos = len(k)
+    extremos = np.einsum(
+        "eij,e...j->e...i", k, np.lib.stride_tricks.sliding_window_view(u, 4, axis=0)[::2]
+    )
+    residuo = -f
+    residuo[: 2 * n_elementos] += np.moveaxis(extremos[..., :2], -1, 1).reshape(2 * n_elementos, *u.shape[1:])
+    residuo[2:] += np.moveaxis(extremos[..., 2:], -1, 1).reshape(2 * n_elementos, *u.shape[1:])
+    return residuo
+
+
+def resolver_continua_cargas(longitud, apoyos, columnas, EI=1.0):
+    _, _, _, posicion, fin = columnas
+    nodos, k, sistema, fijos, nodo_apoyo, x_apoyo, restriccion = _sistema(
+        longitud, apoyos, np.concatenate([posicion, fin]), EI
+    )
+    f = cargas_nodales(nodos, columnas)
+    u = desplazamientos(sistema, fijos, f)
+
+    residuo = residuo_nodal(k, u, f)
+    fuerzas = np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 1] == 1), residuo[2 * nodo_apoyo], 0.0)
+    momentos_apoyo = np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 2] == 1), residuo[2 * nodo_apoyo + 1], 0.0)
+
+    momento = terminos_momento(columnas) + terminos_reacciones(x_apoyo, fuerzas, momentos_apoyo)
+    # Cortes en las posiciones reales y no en los nodos: una carga fundida con un nodo
+    # vecino activa su término en su propia posición
+    return construir_diagramas(
+        longitud,
+        momento,
+        np.concatenate([nodos, x_apoyo, posicion, fin]),
+        list(zip(x_apoyo, fuerzas, momentos_apoyo)),
+        [(nodos[0], 0, u[0]), (nodos[0], 1, u[1])],
+        EI,
+    )
+
+
+def reacciones_unitarias(longitud, apoyos, posiciones, EI=1.0):
+    # Reacciones por una carga unitaria hacia abajo en cada posición: una sola matriz
+    # en banda resuelta con una columna por posición. Devuelve (x_apoyo, fuerzas,
+    # momentos), las dos últimas de forma posiciones × apoyos
+    posiciones = np.clip(np.asarray(posiciones, dtype=float), 0.0, longitud)
+    nodos, k, sistema, fijos, nodo_apoyo, x_apoyo, restriccion = _sistema(longitud, apoyos, posiciones, EI)
+    f = np.zeros((2 * len(nodos), len(posiciones)))
+    f[2 * nodo_cercano(nodos, posiciones), np.arange(len(posiciones))] = -1.0
+    u = desplazamientos(sistema, fijos, f)
+
+    residuo = residuo_nodal(k, u, f)
+    fuerzas = np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 1] == 1)[:, None], residuo[2 * nodo_apoyo], 0.0)
+    momentos = np.where(primero_en_nodo(nodo_apoyo, restriccion[:, 2] == 1)[:, None], residuo[2 * nodo_apoyo + 1], 0.0)
+    return x_apoyo, fuerzas.T, momentos.T
@@ -0,0 +1,436 @@
+from math import comb
+
+import numpy as np
+
+from cargas import DISTRIBUIDA, MOMENTO, PUNTUAL
+
+# Motor de funciones de singularidad (Macaulay) para vigas.
+# Cortante, momento, giro y flecha se guardan como polinomios exactos por tramos,
+# con cortes en las posiciones de cargas y apoyos.
+
+GRADO_MAX = 5  # Flecha de una carga distribuida lineal: <x - a>^5
+TOLERANCIA_POSICION = 1e-9  # Lo que una posición puede pasarse de la viga por redondeo, relativo a L
+
+_BINOMIOS = np.array(
+    [[comb(n, i) for i in range(GRADO_MAX + 2)] for n in range(GRADO_MAX + 2)], dtype=float
+)
+
+
+def _como_tabla(datos, columnas):
+    if datos is None:
+        return np.zeros((0, columnas))
+    return np.asarray(datos, dtype=float).reshape(-1, columnas)
+
+
+def _potencias(x, grado):
+    # x^0 ... x^grado en el último eje, por productos sucesivos
+    x = np.asarray(x, dtype=float)
+    potencias = np.ones(x.shape + (grado + 1,))
+    if grado:
+        potencias[..., 1:] = np.cumprod(np.broadcast_to(x[..., None], x.shape + (grado,)), axis=-1)
+    return potencias
+
+
+def expandir_potencias(a, n, c, grado):
+    # Coeficientes de c * (x - a)^n en potencias de x: c * C(n, i) * (-a)^(n - i)
+    # (C(n, i) = 0 para i > n, así que no hace falta enmascarar)
+    exponente = np.clip(n[..., None] - np.arange(grado + 1), 0, grado)
+    potencias = np.take_along_axis(_potencias(-a, grado), exponente, axis=-1)
+    return c[..., None] * _BINOMIOS[n, : grado + 1] * potencias
+
+
+def desplazar_origen(coef, x0):
+    # Reescribe polinomios en x como polinomios en t = x - x0 (más estable al evaluar)
+    grado = coef.shape[-1] - 1
+    potencias = _potencias(x0, grado)
+    locales = np.zeros_like(coef)
+    for j in range(grado + 1):
+        p = np.arange(j, grado + 1)
+        locales[..., j] = np.sum(_BINOMIOS[p, j] * coef[..., p] * potencias[..., p - j], axis=-1)
+    return locales
+
+
+class TerminosSingulares:
+    # Suma de términos c * <x - a>^n
+    def __init__(self, a, n, c):
+        self.a = np.asarray(a, dtype=float).ravel()
+        self.n = np.asarray(n, dtype=int).ravel()
+        self.c = np.asarray(c, dtype=float).ravel()
+
+    def __add__(self, otro):
+        return TerminosSingulares(
+            np.concatenate([self.a, otro.a]),
+            np.concatenate([self.n, otro.n]),
+            np.concatenate([self.c, otro.c]),
+        )
+
+    def derivada(self):
+        # La derivada de <x - a>^0 es un impulso: no aporta a la función por tramos
+        activos = self.n > 0
+        return TerminosSingulares(
+            self.a[activos], self.n[activos] - 1, self.c[activos] * self.n[activos]
+        )
+
+    def integral(self):
+        return TerminosSingulares(self.a, self.n + 1, self.c / (self.n + 1))
+
+    def escalar(self, factor):
+        return TerminosSingulares(self.a, self.n, self.c * factor)
+
+    def evaluar(self, x):
+        # Evaluación directa, O(términos × puntos): sólo para pocos puntos
+        x = np.asarray(x, dtype=float)
+        d = x[..., None] - self.a
+        return np.sum(np.where(d >= 0, self.c * np.maximum(d, 0) ** self.n, 0.0), axis=-1)
+
+    def por_tramos(self, cortes):
+        cortes = np.asarray(cortes, dtype=float)
+        n_tramos = len(cortes) - 1
+        grado = int(self.n.max()) if len(self.n) else 0
+
+        # Cada término se activa en el primer tramo que empieza en (o después de) su posición
+        inicio = np.searchsorted(cortes, self.a, side="left")
+        dentro = inicio < n_tramos
+        a, n, c, inicio = self.a[dentro], self.n[dentro], self.c[dentro], inicio[dentro]
+
+        aporte = expandir_potencias(a, n, c, grado)
+        saltos = np.zeros((n_tramos, grado + 1))
+        for k in range(grado + 1):
+            saltos[:, k] = np.bincount(inicio, weights=aporte[:, k], minlength=n_tramos)
+        locales = desplazar_origen(np.cumsum(saltos, axis=0), cortes[:-1])
+        return PolinomioPorTramos(cortes, locales)
+
+
+class PolinomioPorTramos:
+    # coef[k, j] multiplica a (x - cortes[k])^j en el tramo [cortes[k], cortes[k + 1])
+    def __init__(self, cortes, coef):
+        self.cortes = np.asarray(cortes, dtype=float)
+        self.coef = np.asarray(coef, dtype=float)
+
+    @property
+    def n_tramos(self):
+        return len(self.cortes) - 1
+
+    def _tramo(self, x):
+        return np.clip(np.searchsorted(self.cortes, x, side="right") - 1, 0, self.n_tramos - 1)
+
+    def _evaluar_en(self, k, x):
+        # Polinomio del tramo k evaluado en x (fuera del tramo da el límite lateral)
+        t = x - self.cortes[k]
+        valor = np.zeros_like(t)
+        for j in range(self.coef.shape[1] - 1, -1, -1):
+            valor = valor * t + self.coef[k, j]
+        return valor
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        return self._evaluar_en(self._tramo(x), x)
+
+    def refinar(self, cortes, grado=None):
+        # El mismo polinomio sobre cortes más finos (que incluyen los propios), con
+        # los coeficientes rellenados hasta `grado`
+        cortes = np.asarray(cortes, dtype=float)
+        grado = self.coef.shape[1] - 1 if grado is None else grado
+        k = self._tramo(cortes[:-1])
+        coef = np.zeros((len(k), grado + 1))
+        coef[:, : self.coef.shape[1]] = self.coef[k]
+        return PolinomioPorTramos(cortes, desplazar_origen(coef, cortes[:-1] - self.cortes[k]))
+
+    def derivada(self):
+        grado = self.coef.shape[1] - 1
+        if grado == 0:
+            return PolinomioPorTramos(self.cortes, np.zeros((self.n_tramos, 1)))
+        return PolinomioPorTramos(self.cortes, self.coef[:, 1:] * np.arange(1, grado + 1))
+
+    def integral(self):
+        # Primitiva continua que vale cero en el primer corte: se integra cada tramo y
+        # se acumulan los incrementos de los tramos anteriores
+        grado = self.coef.shape[1]
+        coef = np.zeros((self.n_tramos, grado + 1))
+        coef[:, 1:] = self.coef / np.arange(1, grado + 1)
+        h = np.diff(self.cortes)
+        incremento = np.zeros(self.n_tramos)
+        for j in range(grado, 0, -1):
+            incremento = (incremento + coef[:, j]) * h
+        coef[1:, 0] = np.cumsum(incremento[:-1])
+        return PolinomioPorTramos(self.cortes, coef)
+
+    def valores_en_cortes(self):
+        # Valor a la derecha de cada corte inicial y límite por la izquierda de cada corte final
+        h = np.diff(self.cortes)
+        derecha = self.coef[:, 0]
+        izquierda = np.zeros(self.n_tramos)
+        for j in range(self.coef.shape[1] - 1, -1, -1):
+            izquierda = izquierda * h + self.coef[:, j]
+        return derecha, izquierda
+
+    def puntos_criticos(self):
+        # Raíces de la derivada dentro de cada tramo
+        d = self.derivada().coef
+        h = np.diff(self.cortes)
+        escala = np.abs(d).max(axis=1, keepdims=True)
+        significativo = np.abs(d) > 1e-12 * np.where(escala > 0, escala, 1.0)
+        ultimo = d.shape[1] - 1 - np.argmax(significativo[:, ::-1], axis=1)
+        grados = np.where(significativo.any(axis=1), ultimo, 0)
+
+        xs = []
+        for g in np.unique(grados):
+            if g == 0:
+                continue
+            filas = np.flatnonzero(grados == g)
+            p = d[filas, : g + 1]
+            if g == 1:
+                raices = (-p[:, 0] / p[:, 1])[:, None]
+            elif g == 2:
+                disc = p[:, 1] ** 2 - 4 * p[:, 2] * p[:, 0]
+                raiz = np.sqrt(np.where(disc >= 0, disc, np.nan))
+                raices = np.stack([-p[:, 1] + raiz, -p[:, 1] - raiz], axis=1) / (2 * p[:, 2:3])
+            else:
+                # Matrices compañeras apiladas: una llamada a eigvals para todos los tramos
+                companera = np.zeros((len(filas), g, g))
+                companera[:, 1:, :-1] = np.eye(g - 1)
+                companera[:, :, -1] = -p[:, :g] / p[:, g : g + 1]
+                valores = np.linalg.eigvals(companera)
+                raices = np.where(np.abs(valores.imag) < 1e-9, valores.real, np.nan)
+            validas = (raices >= 0) & (raices <= h[filas, None])
+            xs.append((self.cortes[filas, None] + raices)[validas])
+        if not xs:
+            return np.zeros(0)
+        return np.concatenate(xs)
+
+    def extremos(self):
+        # (x_max, máximo, x_min, mínimo) exactos, incluidos los saltos en los cortes
+        derecha, izquierda = self.valores_en_cortes()
+        criticos = self.puntos_criticos()
+        x = np.concatenate([self.cortes[:-1], self.cortes[1:], criticos])
+        valores = np.concatenate([derecha, izquierda, self(criticos)])
+        i_max, i_min = np.argmax(valores), np.argmin(valores)
+        return x[i_max], valores[i_max], x[i_min], valores[i_min]
+
+    def muestrear(self, puntos=500):
+        x = np.linspace(self.cortes[0], self.cortes[-1], puntos)
+        return x, self(x)
+
+    def muestrear_adaptativo(self, tolerancia=None, profundidad=40):
+        # Polilínea que se aparta de la curva a lo sumo `tolerancia` (por defecto una
+        # milésima de la amplitud). Parte de los puntos exactos (cortes, extremos e
+        # inflexiones, entre los que la curvatura no cambia de signo) y biseca sólo los
+        # intervalos cuya cuerda se aleja de la curva. En los saltos repite la abscisa.
+        _, maximo, _, minimo = self.extremos()
+        if tolerancia is None:
+            tolerancia = 1e-3 * max(abs(maximo), abs(minimo))
+        tolerancia = max(tolerancia, 1e-12 * max(abs(maximo), abs(minimo), 1.0))
+
+        x = np.unique(
+            np.concatenate([self.cortes, self.puntos_criticos(), self.derivada().puntos_criticos()])
+        )
+        lo, hi = x[:-1], x[1:]
+        lo, hi = lo[hi > lo], hi[hi > lo]
+        sondas = np.array([0.25, 0.5, 0.75])
+        aceptados = []
+        for nivel in range(profundidad + 1):
+            k = self._tramo((lo + hi) / 2)
+            y_lo, y_hi = self._evaluar_en(k, lo), self._evaluar_en(k, hi)
+            t = lo[:, None] + (hi - lo)[:, None] * sondas
+            cuerda = y_lo[:, None] + (y_hi - y_lo)[:, None] * sondas
+            error = np.abs(self._evaluar_en(k[:, None], t) - cuerda).max(axis=1)
+            listo = (error <= tolerancia) | (nivel == profundidad)
+            aceptados.append((lo[listo], hi[listo], y_lo[listo], y_hi[listo]))
+            medio = (lo[~listo] + hi[~listo]) / 2
+            lo, hi = np.concatenate([lo[~listo], medio]), np.concatenate([medio, hi[~listo]])
+            if len(lo) == 0:
+                break
+
+        lo, hi, y_lo, y_hi = (np.concatenate(c) for c in zip(*aceptados))
+        orden = np.argsort(lo)
+        xs = np.stack([lo[orden], hi[orden]], axis=1).ravel()
+        ys = np.stack([y_lo[orden], y_hi[orden]], axis=1).ravel()
+        # Cada intervalo aporta sus dos extremos: se funden los que coinciden en x e y
+        repetido = np.zeros(len(xs), dtype=bool)
+        repetido[1:] = (xs[1:] == xs[:-1]) & (np.abs(ys[1:] - ys[:-1]) <= 1e-9 * tolerancia)
+        return xs[~repetido], ys[~repetido]
+
+
+class Diagramas:
+    def __init__(self, reacciones, cortante, momento, giro, flecha):
+        self.reacciones = reacciones
+        self.cortante = cortante
+        self.momento = momento
+        self.giro = giro
+        self.flecha = flecha
+
+    def resumen(self, nombres):
+        # Texto de resultados de las interfaces: cada reacción con su nombre y la flecha y el
+        # giro de mayor valor absoluto (doble integración exacta del momento con EI = E·I)
+        texto = ""
+        for nombre, (posicion, fuerza, momento) in zip(nombres, self.reacciones):
+            texto += f"{nombre} (x = {posicion} m): {fuerza:.2f} N"
+            if momento:
+                texto += f", {momento:.2f} N·m"
+            texto += "\n"
+        for etiqueta, diagrama, unidad in (("Flecha máxima", self.flecha, "m"), ("Giro máximo", self.giro, "rad")):
+            x_max, maximo, x_min, minimo = diagrama.extremos()
+            x_pico, pico = (x_max, maximo) if abs(maximo) >= abs(minimo) else (x_min, minimo)
+            texto += f"{etiqueta}: {pico:.4g} {unidad} (x = {x_pico:.3f} m)\n"
+        return texto
+
+
+def columnas_de_cargas(puntuales=None, distribuidas=None, momentos=None):
+    # Pasa las tres tablas de cargas a las columnas (tipo, magnitud, magnitud_fin, posicion, fin)
+    puntuales = _como_tabla(puntuales, 2)
+    distribuidas = _como_tabla(distribuidas, 4)
+    momentos = _como_tabla(momentos, 2)
+    tipo = np.repeat(
+        [PUNTUAL, DISTRIBUIDA, MOMENTO], [len(puntuales), len(distribuidas), len(momentos)]
+    )
+    magnitud = np.concatenate([puntuales[:, 0], distribuidas[:, 0], momentos[:, 0]])
+    magnitud_fin = np.concatenate([puntuales[:, 0], distribuidas[:, 1], momentos[:, 0]])
+    posicion = np.concatenate([puntuales[:, 1], distribuidas[:, 2], momentos[:, 1]])
+    fin = np.concatenate([puntuales[:, 1], distribuidas[:, 3], momentos[:, 1]])
+    return tipo, magnitud, magnitud_fin, posicion, fin
+
+
+def fuera_de_la_viga(longitud, x):
+    # Posiciones fuera de [0, L] o no numéricas; lo que sobra por redondeo no cuenta
+    margen = TOLERANCIA_POSICION * longitud
+    x = np.asarray(x, dtype=float)
+    return ~((x >= -margen) & (x <= longitud + margen))
+
+
+def validar_cargas(longitud, columnas):
+    _, _, _, posicion, fin = columnas
+    if np.any(fuera_de_la_viga(longitud, posicion)) or np.any(fuera_de_la_viga(longitud, fin)):
+        raise ValueError(f"Hay cargas fuera de la viga [0, {longitud:g}]")
+
+
+def resultantes(tipo, magnitud, magnitud_fin, posicion, fin):
+    # Fuerza total (hacia abajo) y momento horario respecto de x = 0
+    distribuida = tipo == DISTRIBUIDA
+    tramo = fin - posicion
+    fuerza = np.where(
+        distribuida, (magnitud + magnitud_fin) / 2 * tramo, np.where(tipo == PUNTUAL, magnitud, 0.0)
+    )
+    momento = np.where(
+        distribuida,
+        fuerza * posicion + tramo**2 * (magnitud + 2 * magnitud_fin) / 6,
+        np.where(tipo == PUNTUAL, magnitud * posicion, magnitud),
+    )
+    return fuerza.sum(), momento.sum()
+
+
+def resolver_viga(
+    longitud, puntuales=None, distribuidas=None, momentos=None, apoyos=None, EI=1.0, reacciones=None
+):
+    # Viga isostática sobre dos apoyos simples (por defecto en los extremos).
+    # puntuales: filas (magnitud, posicion), positivas hacia abajo
+    # distribuidas: filas (q_inicio, q_fin, inicio, fin), variación lineal
+    # momentos: filas (magnitud, posicion), positivos en sentido horario
+    # reacciones: (reacc_a, reacc_b) ya conocidas, para no volver a sumar las cargas
+    return resolver_cargas(
+        longitud, columnas_de_cargas(puntuales, distribuidas, momentos), apoyos, EI, reacciones
+    )
+
+
+def terminos_momento(columnas):
+    # Momento flector de las cargas como suma de términos de Macaulay: cada carga
+    # aporta cuatro términos (los que no le corresponden quedan fuera por ser nulos)
+    tipo, magnitud, magnitud_fin, posicion, fin = columnas
+    distribuida = tipo == DISTRIBUIDA
+    tramo = fin - posicion
+    pendiente = np.divide(
+        magnitud_fin - magnitud, tramo, out=np.zeros_like(tramo), where=distribuida & (tramo != 0)
+    )
+    n = len(tipo)
+    a = np.concatenate([posicion, posicion, fin, fin])
+    grado = np.concatenate([np.choose(tipo, [1, 2, 0]), np.full(n, 3), np.full(n, 2), np.full(n, 3)])
+    coef = np.concatenate(
+        [
+            np.choose(tipo, [-magnitud, -magnitud / 2, magnitud]),
+            -pendiente / 6,
+            np.where(distribuida, magnitud_fin / 2, 0.0),
+            pendiente / 6,
+        ]
+    )
+    usados = coef != 0
+    return TerminosSingulares(a[usados], grado[usados], coef[usados])
+
+
+def terminos_reacciones(posiciones, fuerzas, momentos=None):
+    # Fuerzas hacia arriba y momentos antihorarios de los apoyos
+    terminos = TerminosSingulares(posiciones, np.ones(len(fuerzas), dtype=int), fuerzas)
+    if momentos is not None:
+        terminos = terminos + TerminosSingulares(
+            posiciones, np.zeros(len(momentos), dtype=int), -np.asarray(momentos, dtype=float)
+        )
+    return terminos
+
+
+def _constantes(flecha, giro, condiciones):
+    # C1 y C2 de y = flecha(x) + C1·x + C2 que cumplen las condiciones (x, orden, valor),
+    # con orden 0 para flecha y 1 para giro
+    x, orden, valor = (np.asarray(c, dtype=float) for c in zip(*condiciones))
+    matriz = np.column_stack([np.where(orden == 0, x, 1.0), np.where(orden == 0, 1.0, 0.0)])
+    libre = valor - np.where(orden == 0, flecha(x), giro(x))
+    return np.linalg.lstsq(matriz, libre, rcond=None)[0]
+
+
+def deformadas(momento, condiciones, inicio_seccion, flexibilidad):
+    # Giro y flecha con EI constante por tramos de sección: flexibilidad[i] = 1/EI desde
+    # inicio_seccion[i] hasta el inicio siguiente. Doble integración exacta de M/EI,
+    # vectorizada sobre los tramos comunes a momento y secciones.
+    cortes = np.union1d(
+        momento.cortes, np.clip(inicio_seccion, momento.cortes[0], momento.cortes[-1])
+    )
+    seccion = np.clip(np.searchsorted(inicio_seccion, cortes[:-1], side="right") - 1, 0, None)
+    curvatura = momento.refinar(cortes)
+    curvatura.coef *= flexibilidad[seccion, None]
+
+    doble = curvatura.integral().integral()
+    c1, c2 = _constantes(doble, doble.derivada(), condiciones)
+    doble.coef[:, 0] += c1 * cortes[:-1] + c2
+    doble.coef[:, 1] += c1
+    return doble.derivada(), doble
+
+
+def construir_diagramas(longitud, momento, cortes, reacciones, condiciones, EI=1.0):
+    # momento: términos de cargas y reacciones (viga en equilibrio)
+    # condiciones: (x, orden, valor) con orden 0 para flecha y 1 para giro;
+    # se ajustan C1 y C2 en y = ∫∫M/EI + C1·x + C2
+    doble = momento.integral().integral().escalar(1.0 / EI)
+    c1, c2 = _constantes(doble.evaluar, doble.derivada().evaluar, condiciones)
+    flecha = doble + TerminosSingulares([0.0, 0.0], [1, 0], [c1, c2])
+
+    cortes = np.unique(np.clip(cortes, 0.0, longitud))
+    return Diagramas(
+        reacciones,
+        momento.derivada().por_tramos(cortes),
+        momento.por_tramos(cortes),
+        flecha.derivada().por_tramos(cortes),
+        flecha.por_tramos(cortes),
+    )
+
+
+def resolver_cargas(longitud, columnas, apoyos=None, EI=1.0, reacciones=None):
+    # Igual que resolver_viga, con las cargas como columnas de una TablaCargas
+    x_a, x_b = (0.0, float(longitud)) if apoyos is None else map(float, apoyos)
+    validar_cargas(longitud, columnas)
+    if apoyos is not None and (np.any(fuera_de_la_viga(longitud, [x_a, x_b])) or x_a == x_b):
+        raise ValueError(f"Apoyos inválidos ({x_a:g}, {x_b:g}) en una viga de longitud {longitud:g}")
+
+    if reacciones is None:
+        fuerza_total, momento_en_0 = resultantes(*columnas)
+        reacc_b = (momento_en_0 - fuerza_total * x_a) / (x_b - x_a)
+        reacc_a = fuerza_total - reacc_b
+    else:
+        reacc_a, reacc_b = reacciones
+
+    momento = terminos_momento(columnas) + terminos_reacciones([x_a, x_b], [reacc_a, reacc_b])
+    _, _, _, posicion, fin = columnas
+    return construir_diagramas(
+        longitud,
+        momento,
+        np.concatenate([[0.0, longitud, x_a, x_b], posicion, fin]),
+        (reacc_a, reacc_b),
+        [(x_a, 0, 0.0), (x_b, 0, 0.0)],
+        EI,
+    )
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los módulos de MOMENTOS se importan por nombre, como en los scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,21 @@
+import pytest
+
+import arranque
+
+# Los presupuestos son relativos a NumPy; el margen absorbe el ruido entre intérpretes
+MARGEN = 1.25
+
+
+@pytest.fixture(scope="module")
+def base():
+    return arranque.importacion("numpy")[0]
+
+
+@pytest.mark.parametrize("modulo", list(arranque.PRESUPUESTOS))
+def test_importacion_dentro_del_presupuesto(modulo, base):
+    _, problemas = arranque.verificar_modulo(modulo, arranque.PRESUPUESTOS[modulo], base, MARGEN)
+    assert not problemas
+
+
+def test_arranque_cli_relativo_a_numpy():
+    assert arranque.arranque_cli(3) <= arranque.ARRANQUE_CLI * arranque.arranque_numpy(3) * MARGEN
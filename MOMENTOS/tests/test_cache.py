@@ -0,0 +1,85 @@
+import sqlite3
+
+import pytest
+
+from cache import CacheResultados, clave_caso
+from procesar import preparar_caso, resolver_preparado
+from singularidades import columnas_de_cargas
+
+CASO = {
+    "longitud": 12.0,
+    "apoyos": [[0.0, "fixedSupport"], [5.0, "rollerSupport"], [12.0, "rollerSupport"]],
+    "puntuales": [[10.0, 3.0], [4.0, 9.0]],
+    "distribuidas": [[2.0, 2.0, 0.0, 12.0]],
+}
+
+
+def test_clave_no_depende_del_orden():
+    columnas = columnas_de_cargas([(1.0, 2.0), (3.0, 4.0)])
+    invertidas = columnas_de_cargas([(3.0, 4.0), (1.0, 2.0)])
+    apoyos = [(0.0, "simpleSupport"), (10.0, "rollerSupport")]
+    assert clave_caso(10.0, columnas, apoyos) == clave_caso(10.0, invertidas, apoyos[::-1])
+    assert clave_caso(10.0, columnas) != clave_caso(10.0, columnas, EI=2.0)
+
+
+@pytest.mark.parametrize("permutacion", [(0, 1, 2), (2, 0, 1), (1, 2, 0)])
+def test_reacciones_en_el_orden_de_los_apoyos(permutacion):
+    # La caché ya tiene la viga con los apoyos en otro orden: las reacciones vuelven en el
+    # orden pedido, idénticas a resolver sin caché
+    cache = CacheResultados()
+    resolver_preparado("previo", *preparar_caso(dict(CASO, apoyos=CASO["apoyos"][::-1])), cache=cache)
+    caso = dict(CASO, apoyos=[CASO["apoyos"][i] for i in permutacion])
+    directo = resolver_preparado("v", *preparar_caso(caso))
+    guardado = resolver_preparado("v", *preparar_caso(caso), cache=cache)
+    assert cache.aciertos_memoria == 1
+    assert [x for x, _, _ in guardado["reacciones"]] == [x for x, _ in caso["apoyos"]]
+    assert guardado == directo
+
+
+def test_cache_en_disco(tmp_path):
+    ruta = tmp_path / "resultados.sqlite"
+    cache = CacheResultados(str(ruta))
+    primero = resolver_preparado("v", *preparar_caso(CASO), cache=cache)
+    cache.cerrar()
+    cache = CacheResultados(str(ruta))
+    assert resolver_preparado("v", *preparar_caso(CASO), cache=cache) == primero
+    assert cache.aciertos_disco == 1
+    cache.cerrar()
+
+
+def _caso(i):
+    return dict(CASO, puntuales=[[10.0 + i, 3.0]])
+
+
+def _clave(caso):
+    longitud, columnas, apoyos, EI = preparar_caso(caso)
+    return clave_caso(longitud, columnas, apoyos, EI)
+
+
+def test_directorio_se_crea_con_la_primera_escritura(tmp_path):
+    ruta = tmp_path / "sub" / "resultados.sqlite"
+    cache = CacheResultados(str(ruta))
+    assert cache.obtener("no está") is None
+    assert not ruta.parent.exists()
+    resolver_preparado("v", *preparar_caso(CASO), cache=cache)
+    assert ruta.exists()
+    cache.cerrar()
+
+
+def test_tope_de_filas_desaloja_las_menos_usadas(tmp_path):
+    ruta = str(tmp_path / "resultados.sqlite")
+    cache = CacheResultados(ruta, capacidad=1, filas_disco=10)
+    for i in range(10):
+        resolver_preparado(i, *preparar_caso(_caso(i)), cache=cache)
+    resolver_preparado(0, *preparar_caso(_caso(0)), cache=cache)  # El primero vuelve a usarse
+    assert cache.aciertos_disco == 1
+    resolver_preparado(10, *preparar_caso(_caso(10)), cache=cache)  # Pasa el tope
+    cache.cerrar()
+
+    with sqlite3.connect(ruta) as base:
+        (filas,) = base.execute("SELECT COUNT(*) FROM resultados").fetchone()
+    assert filas == 9
+    cache = CacheResultados(ruta, capacidad=1, filas_disco=10)
+    quedan = [i for i in range(11) if cache.obtener(_clave(_caso(i))) is not None]
+    assert quedan == [0, 3, 4, 5, 6, 7, 8, 9, 10]
+    cache.cerrar()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from combinaciones import DIAGRAMAS
+from singularidades import resolver_viga
+from viga import Viga
+
+L, EI = 10.0, 2.0e3
+X = np.linspace(0.0, L, 57)
+COMBINACIONES = {
+    "ELU": {"muerta": 1.35, "viva": 1.5},
+    "ELS": {"muerta": 1.0, "viva": 1.0, "viento": 0.6},
+    "solo viva": {"viva": 1.0},
+}
+
+
+@pytest.fixture
+def viga():
+    viga = Viga(L, EI=EI)
+    viga.agregar_carga_distribuida(2.0, 0.0, L, caso="muerta")
+    viga.agregar_carga_puntual(5.0, 3.0, caso="viva")
+    viga.agregar_carga_distribuida(1.0, 6.0, 9.0, magnitud_fin=3.0, caso="viva")
+    viga.agregar_momento_concentrado(4.0, 7.0, caso="viento")
+    # Un caso sin cargas activas: su única carga se quita
+    viga.agregar_carga_puntual(8.0, 5.0, caso="nieve")
+    viga.eliminar_carga_puntual(5.0, tolerancia=1e-9)
+    return viga
+
+
+def _exactos():
+    # Cada caso resuelto por separado con el cálculo exacto
+    return {
+        "muerta": resolver_viga(L, distribuidas=[(2.0, 2.0, 0.0, L)], EI=EI),
+        "viva": resolver_viga(L, puntuales=[(5.0, 3.0)], distribuidas=[(1.0, 3.0, 6.0, 9.0)], EI=EI),
+        "viento": resolver_viga(L, momentos=[(4.0, 7.0)], EI=EI),
+    }
+
+
+def test_caso_sin_cargas_queda_fuera(viga):
+    assert sorted(viga.diagramas_por_caso()) == ["muerta", "viento", "viva"]
+    with pytest.raises(ValueError, match="nieve"):
+        viga.combinar({"con nieve": {"nieve": 1.5}})
+
+
+@pytest.mark.parametrize("nombre", DIAGRAMAS)
+def test_combinacion_es_la_suma_mayorada(viga, nombre):
+    combinaciones = viga.combinar(COMBINACIONES)
+    por_caso = viga.diagramas_por_caso()
+    exactos = _exactos()
+    for combinacion, factores in COMBINACIONES.items():
+        esperado = sum(factor * getattr(exactos[caso], nombre)(X) for caso, factor in factores.items())
+        escala = max(1.0, np.abs(esperado).max())
+        np.testing.assert_allclose(combinaciones.diagrama(combinacion, nombre)(X), esperado, atol=1e-9 * escala)
+        desde_casos = sum(factor * getattr(por_caso[caso], nombre)(X) for caso, factor in factores.items())
+        np.testing.assert_allclose(desde_casos, esperado, atol=1e-9 * escala)
+        # Los valores muestreados de la envolvente salen del mismo producto de factores
+        fila = combinaciones.nombres.index(combinacion)
+        muestreado = sum(factor * getattr(exactos[caso], nombre)(combinaciones.x) for caso, factor in factores.items())
+        np.testing.assert_allclose(combinaciones.valores[nombre][fila], muestreado, atol=1e-9 * escala)
+
+
+def test_envolvente_de_momentos(viga):
+    combinaciones = viga.combinar(COMBINACIONES)
+    maximo, cual, minimo, _ = combinaciones.envolvente("momento")
+    assert np.all(maximo >= minimo)
+    i = np.argmax(maximo)
+    assert cual[i] == "ELU"
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from elementos import resolver_elementos
+from singularidades import columnas_de_cargas, resolver_cargas
+from viga import Viga
+
+# Comparación con soluciones cerradas
+L, EI, GA, q, P, k = 10.0, 2.0e3, 5.0e3, 3.0, 7.0, 50.0
+SIMPLE = [(0.0, "simpleSupport"), (L, "rollerSupport")]
+UNIFORME = columnas_de_cargas(distribuidas=[(q, q, 0.0, L)])
+MIXTAS = columnas_de_cargas([(P, 3.3)], [(q, 2 * q, 1.0, 8.0)], [(4.0, 6.0)])
+X = np.linspace(0.0, L, 101)
+
+
+def _cerca(calculado, esperado, tolerancia=1e-9):
+    esperado = np.asarray(esperado)
+    assert np.max(np.abs(np.asarray(calculado) - esperado)) <= tolerancia * max(1.0, np.max(np.abs(esperado)))
+
+
+def test_simplemente_apoyada_uniforme():
+    d = resolver_elementos(L, SIMPLE, UNIFORME, EI)
+    _cerca(d.momento(L / 2), q * L**2 / 8)
+    _cerca(d.flecha(L / 2), -5 * q * L**4 / (384 * EI))
+
+
+def test_timoshenko_puntual():
+    d = resolver_elementos(L, SIMPLE, columnas_de_cargas([(P, L / 2)]), EI, GA)
+    _cerca(d.flecha(L / 2), -(P * L**3 / (48 * EI) + P * L / (4 * GA)))
+
+
+def test_timoshenko_uniforme():
+    d = resolver_elementos(L, SIMPLE, UNIFORME, EI, GA)
+    _cerca(d.flecha(L / 2), -(5 * q * L**4 / (384 * EI) + q * L**2 / (8 * GA)))
+
+
+def test_voladizo_timoshenko():
+    d = resolver_elementos(L, [(0.0, "fixedSupport")], UNIFORME, EI, GA)
+    _cerca(d.flecha(L), -(q * L**4 / (8 * EI) + q * L**2 / (2 * GA)))
+
+
+def test_resorte_central():
+    d = resolver_elementos(L, SIMPLE, UNIFORME, EI, resortes=[(L / 2, k, 0.0)])
+    libre = 5 * q * L**4 / (384 * EI)
+    _cerca(d.reacciones[2][1], libre / (L**3 / (48 * EI) + 1 / k))
+
+
+def test_muchos_tramos_momento_en_apoyo_central():
+    # Viga continua de muchos tramos iguales: en los apoyos centrales M -> -qs²/12
+    tramos, s = 2_000, 5.0
+    apoyos = [(i * s, "rollerSupport") for i in range(tramos + 1)]
+    apoyos[0] = (0.0, "simpleSupport")
+    d = resolver_elementos(tramos * s, apoyos, columnas_de_cargas(distribuidas=[(q, q, 0.0, tramos * s)]), EI)
+    _cerca(d.momento(tramos * s / 2), -q * s**2 / 12)
+
+
+def test_cargas_mixtas_contra_integracion_exacta():
+    d = resolver_elementos(L, SIMPLE, MIXTAS, EI)
+    _cerca(d.flecha(X), resolver_cargas(L, MIXTAS, EI=EI).flecha(X))
+
+
+@pytest.fixture
+def viga_mixta():
+    viga = Viga(L, EI=EI)
+    viga.agregar_carga_puntual(P, 3.3)
+    viga.agregar_carga_distribuida(q, 1.0, 8.0, 2 * q)
+    viga.agregar_momento_concentrado(4.0, 6.0)
+    return viga
+
+
+def test_seccion_variable_tupla(viga_mixta):
+    # Los inicios de una tupla entran en la malla
+    viga_mixta.definir_seccion(2 * EI, 4.0, 7.0)
+    viga_mixta.definir_seccion(EI / 2, 7.0)
+    d = resolver_elementos(L, SIMPLE, MIXTAS, (np.array([0.0, 4.0, 7.0]), np.array([EI, 2 * EI, EI / 2])))
+    _cerca(d.flecha(X), viga_mixta.calcular_diagramas().flecha(X))
+
+
+def test_seccion_variable_funcion(viga_mixta):
+    # Una función se evalúa en el medio de cada elemento, así que sus saltos van en nodos
+    # que ya existen (3.3 y 8.0, puntos de carga)
+    viga_mixta.definir_seccion(3 * EI, 3.3, 8.0)
+    d = resolver_elementos(L, SIMPLE, MIXTAS, lambda x: np.where((x > 3.3) & (x < 8.0), 3 * EI, EI))
+    _cerca(d.flecha(X), viga_mixta.calcular_diagramas().flecha(X))
+
+
+def test_voladizo_con_ga_por_tramos():
+    # La flecha por cortante es ∫ V/GA con V = q(L - x)
+    a = 4.0
+    d = resolver_elementos(L, [(0.0, "fixedSupport")], UNIFORME, EI, (np.array([0.0, a]), np.array([GA, 2 * GA])))
+    cortante = q * (a * L - a**2 / 2) / GA + q * (L - a) ** 2 / (2 * 2 * GA)
+    _cerca(d.flecha(L), -(q * L**4 / (8 * EI) + cortante))
+
+
+def test_carga_junto_al_apoyo_va_al_nodo_fundido():
+    # A menos de la separación mínima de un apoyo la carga va a ese nodo, no al siguiente
+    d = resolver_elementos(L, SIMPLE, columnas_de_cargas([(10.0, 1e-12), (1.0, 7.0)]))
+    _cerca([f for _, f, _ in d.reacciones], [10.0 + 1.0 * 3 / L, 1.0 * 7 / L])
+
+
+def test_apoyos_repetidos_no_duplican_la_reaccion():
+    apoyos = [(0.0, "simpleSupport"), (0.0, "rollerSupport"), (L, "rollerSupport")]
+    d = resolver_elementos(L, apoyos, columnas_de_cargas([(10.0, L / 2)]))
+    _cerca([f for _, f, _ in d.reacciones], [5.0, 0.0, 5.0])
+
+
+@pytest.mark.parametrize(
+    "apoyos, resortes",
+    [
+        ([(0.0, "simpleSupport"), (0.0, "rollerSupport")], None),
+        ([(5.0, "rollerSupport"), (5.0 + 1e-12, "rollerSupport")], None),
+        ([(0.0, "rollerSupport")], [(0.0, k, 0.0)]),
+    ],
+)
+def test_mecanismo_por_grados_distintos(apoyos, resortes):
+    with pytest.raises(ValueError, match="mecanismo"):
+        resolver_elementos(L, apoyos, columnas_de_cargas([(10.0, L / 2)]), resortes=resortes)
+
+
+def test_resorte_en_otro_nodo_evita_el_mecanismo():
+    d = resolver_elementos(L, [(0.0, "rollerSupport")], columnas_de_cargas([(10.0, L / 2)]), resortes=[(L, k, 0.0)])
+    _cerca(sum(f for _, f, _ in d.reacciones), 10.0)
+
+
+@pytest.mark.parametrize(
+    "apoyos, resortes",
+    [
+        ([(0.0, "simpleSupport"), (20.0, "rollerSupport")], None),
+        ([(-1.0, "simpleSupport"), (L, "rollerSupport")], None),
+        (SIMPLE, [(L + 1.0, k, 0.0)]),
+    ],
+)
+def test_apoyo_fuera_de_la_viga(apoyos, resortes):
+    with pytest.raises(ValueError, match="fuera de la viga"):
+        resolver_elementos(L, apoyos, columnas_de_cargas([(10.0, L / 2)]), resortes=resortes)
@@ -0,0 +1,111 @@
+import pytest
+
+pytest.importorskip("tkinter")
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+import f2
+
+
+class _Valor:
+    # Sustituye a las variables de Tk: sólo se usa get()
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+@pytest.fixture
+def app():
+    # BeamAnalyzer sin ventana: figura Agg y las listas de datos
+    app = f2.BeamAnalyzer.__new__(f2.BeamAnalyzer)
+    app.beam_length = _Valor(10.0)
+    app.loads = []
+    app.supports = [{"type": "simpleSupport", "position": 0.0}]
+    app.figure, app.ax = plt.subplots()
+    app.create_plot_artists()
+    app.update_plot()
+    yield app
+    plt.close(app.figure)
+
+
+def _carga(x, tipo="pointLoad"):
+    return {"type": tipo, "magnitude": 1.0, "position": x, "start": 1.0, "end": 4.0}
+
+
+def _contar_redibujos(app):
+    llamadas = []
+    redibujar = app.render.redibujar
+    app.render.redibujar = lambda: (llamadas.append(1), redibujar())
+    return llamadas
+
+
+def test_agregar_y_quitar_cargas_solo_hace_blit(app):
+    app.loads.append(_carga(1.0))
+    app.update_plot()
+    llamadas = _contar_redibujos(app)
+    for i in range(2, 40):
+        app.loads.append(_carga(i / 4))
+        app.update_plot()
+    del app.loads[5]
+    app.update_plot()
+    assert not llamadas
+
+
+def test_leyenda_solo_con_lo_presente(app):
+    def etiquetas():
+        return [texto.get_text() for texto in app.ax.get_legend().get_texts()]
+
+    assert etiquetas() == ["Apoyo Simple"]
+    llamadas = _contar_redibujos(app)
+    app.supports.append({"type": "rollerSupport", "position": 10.0})
+    app.loads.append(_carga(0.0, "distributedLoad"))
+    app.update_plot()
+    assert etiquetas() == ["Apoyo Simple", "Apoyo Deslizante", "Carga Distribuida"]
+    assert len(llamadas) == 1
+
+    # Otro apoyo del mismo tipo no cambia la leyenda ni el fondo
+    app.supports.append({"type": "rollerSupport", "position": 5.0})
+    app.update_plot()
+    assert len(llamadas) == 1
+
+    app.supports.clear()
+    app.loads.clear()
+    app.update_plot()
+    assert app.ax.get_legend() is None
+
+
+def _valores(mensaje):
+    # {etiqueta: valor} de las líneas "Etiqueta: valor unidad (x = ...)"
+    return {linea.split(":")[0]: float(linea.split(":")[1].split()[0]) for linea in mensaje.splitlines()}
+
+
+# E·I = 2000·100000 como en la ventana; carga uniforme q en todo el vano o puntual P al centro
+EI, q, P = 2.0e8, 3.0, 7.0
+
+
+@pytest.mark.parametrize(
+    "carga, flecha, giro",
+    [
+        (
+            {"type": "distributedLoad", "magnitude": q, "position": 0.0, "start": 0.0, "end": 10.0},
+            5 * q * 10.0**4 / (384 * EI),
+            q * 10.0**3 / (24 * EI),
+        ),
+        (_carga(5.0) | {"magnitude": P}, P * 10.0**3 / (48 * EI), P * 10.0**2 / (16 * EI)),
+    ],
+)
+def test_flecha_y_giro_contra_forma_cerrada(app, carga, flecha, giro):
+    app.young_modulus, app.inertia = _Valor(2000.0), _Valor(100000.0)
+    app.supports.append({"type": "rollerSupport", "position": 10.0})
+    app.loads.append(carga)
+    mensajes = []
+    app.results_label = type("Etiqueta", (), {"config": lambda self, text: mensajes.append(text)})()
+    app.show_results(app.solve_inputs()())
+    valores = _valores(mensajes[-1])
+    assert valores["Flecha máxima"] == pytest.approx(-flecha, rel=1e-3)
+    assert abs(valores["Giro máximo"]) == pytest.approx(giro, rel=1e-3)
+    assert valores["Reacción en simpleSupport (x = 0.0 m)"] == pytest.approx(valores["Reacción en rollerSupport (x = 10.0 m)"])
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+import fff
+
+# E·I = 2000·100000 como en la ventana; viga simplemente apoyada de 10 m
+L, EI, q, P = 10.0, 2.0e8, 3.0, 7.0
+
+
+class _Valor:
+    # Sustituye a las variables de Tk: sólo se usa get()
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+@pytest.mark.parametrize(
+    "carga, flecha, giro",
+    [
+        ({"type": "distributedLoad", "magnitude": q, "start": 0.0, "end": L}, 5 * q * L**4 / (384 * EI), q * L**3 / (24 * EI)),
+        ({"type": "pointLoad", "magnitude": P, "position": L / 2}, P * L**3 / (48 * EI), P * L**2 / (16 * EI)),
+    ],
+)
+def test_flecha_y_giro_contra_forma_cerrada(monkeypatch, carga, flecha, giro):
+    app = fff.BeamAnalyzer.__new__(fff.BeamAnalyzer)
+    app.beam_length, app.young_modulus, app.inertia = _Valor(L), _Valor(2000.0), _Valor(100000.0)
+    app.left_support = app.right_support = _Valor("Simple")
+    app.loads = [carga]
+    mensajes = []
+    monkeypatch.setattr(fff.messagebox, "showinfo", lambda titulo, mensaje: mensajes.append(mensaje))
+    app.calculate_results()
+
+    valores = {linea.split(":")[0]: float(linea.split(":")[1].split()[0]) for linea in mensajes[0].splitlines()}
+    assert valores["Flecha máxima"] == pytest.approx(-flecha, rel=1e-3)
+    assert abs(valores["Giro máximo"]) == pytest.approx(giro, rel=1e-3)
+    assert valores["Reacción apoyo izquierdo (x = 0.0 m)"] == pytest.approx(L * q / 2 if carga["type"] == "distributedLoad" else P / 2)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from viga import Viga
+
+# Malla de 0.1 m y ejes separados un número entero de pasos: la envolvente por líneas de
+# influencia no interpola y debe coincidir con resolver la viga en cada posición del tren
+L, PUNTOS = 10.0, 101
+PASO = L / (PUNTOS - 1)
+EPS = 1e-9
+
+
+def _barrido(ejes, sentidos):
+    # Envolventes por fuerza bruta: una Viga con cargas puntuales por cada posición del
+    # tren sobre la malla, con los ejes detrás del primero (o delante, si se invierte)
+    secciones = np.linspace(0.0, L, PUNTOS)
+    interiores = secciones[1:-1]
+    momentos, izquierda, derecha = [], [], []
+    distancias = np.array([d for _, d in ejes]) - min(d for _, d in ejes)
+    for sentido in sentidos:
+        for s in range(-round(distancias.max() / PASO), PUNTOS + round(distancias.max() / PASO)):
+            viga = Viga(L)
+            for (magnitud, _), d in zip(ejes, distancias):
+                x = round(s * PASO - sentido * d, 9)
+                if 0.0 <= x <= L:
+                    viga.agregar_carga_puntual(magnitud, x)
+            diagramas = viga.calcular_diagramas()
+            momentos.append(diagramas.momento(secciones))
+            izquierda.append(diagramas.cortante(interiores - EPS))
+            derecha.append(diagramas.cortante(interiores + EPS))
+    cortantes = np.concatenate([izquierda, derecha])
+    return np.max(momentos, axis=0), np.min(momentos, axis=0), cortantes.max(axis=0), cortantes.min(axis=0)
+
+
+@pytest.mark.parametrize("ejes", [[(10.0, 0.0)], [(10.0, 0.0), (4.0, 1.5)]])
+@pytest.mark.parametrize("ambos_sentidos", [False, True])
+def test_envolventes_contra_barrido(ejes, ambos_sentidos):
+    envolventes = Viga(L).envolventes_tren(ejes, puntos=PUNTOS, ambos_sentidos=ambos_sentidos)
+    momento_max, momento_min, cortante_max, cortante_min = _barrido(ejes, (1, -1) if ambos_sentidos else (1,))
+    np.testing.assert_allclose(envolventes.momento_max, momento_max, atol=1e-9)
+    np.testing.assert_allclose(envolventes.momento_min, momento_min, atol=1e-9)
+    np.testing.assert_allclose(envolventes.cortante_max[1:-1], cortante_max, atol=1e-9)
+    np.testing.assert_allclose(envolventes.cortante_min[1:-1], cortante_min, atol=1e-9)
+
+
+def test_sentido_importa_con_ejes_distintos():
+    ejes = [(10.0, 0.0), (4.0, 1.5)]
+    ida = Viga(L).envolventes_tren(ejes, puntos=PUNTOS, ambos_sentidos=False)
+    ambos = Viga(L).envolventes_tren(ejes, puntos=PUNTOS)
+    assert np.all(ambos.momento_max >= ida.momento_max - 1e-12)
+    assert np.any(ambos.momento_max > ida.momento_max + 1e-6)
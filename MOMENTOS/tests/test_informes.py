@@ -0,0 +1,53 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+pytest.importorskip("docx")
+pytest.importorskip("matplotlib")
+
+from docx import Document
+
+from informes import main
+
+CASOS = [
+    {"id": "a", "longitud": 10, "puntuales": [[5, 4]]},
+    {"id": "b", "longitud": 10, "EI": 0, "puntuales": [[5, 4]]},
+    {
+        "id": "c",
+        "longitud": 12,
+        "apoyos": [[12, "rollerSupport"], [0, "fixedSupport"], [5, "rollerSupport"]],
+        "puntuales": [[10, 3], [4, 9]],
+    },
+    {"id": "d", "longitud": 12, "apoyos": [[0, "fixedSupport"], [5, "rollerSupport"], [12, "rollerSupport"]],
+     "puntuales": [[10, 3], [4, 9]]},
+]
+
+
+def _generar(tmp_path, capsys, *opciones):
+    entrada = tmp_path / "casos.jsonl"
+    entrada.write_text("".join(json.dumps(caso) + "\n" for caso in CASOS))
+    ruta = tmp_path / "informes.zip"
+    main([str(entrada), "-o", str(ruta), *opciones])
+    resumenes = [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+    with zipfile.ZipFile(ruta) as archivo:
+        documentos = {nombre: Document(io.BytesIO(archivo.read(nombre))) for nombre in archivo.namelist()}
+    return resumenes, documentos
+
+
+def test_caso_invalido_no_pierde_el_bloque(tmp_path, capsys):
+    resumenes, documentos = _generar(tmp_path, capsys)
+    assert [r["id"] for r in resumenes] == ["a", "b", "c", "d"]
+    assert "error" in resumenes[1]
+    assert sorted(documentos) == sorted(r["archivo"] for r in resumenes if "archivo" in r)
+
+
+def test_reacciones_en_el_orden_de_los_datos(tmp_path, capsys):
+    # "d" reutiliza de la caché el resultado de "c", con los apoyos en otro orden
+    resumenes, documentos = _generar(tmp_path, capsys)
+    for resumen in resumenes[2:]:
+        apoyos, _, reacciones, *_ = documentos[resumen["archivo"]].tables
+        x_datos = [fila.cells[1].text for fila in apoyos.rows[1:]]
+        x_reacciones = [fila.cells[0].text for fila in reacciones.rows[1:]]
+        assert x_reacciones == x_datos
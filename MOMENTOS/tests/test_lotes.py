@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from lotes import VigaBatch
+from singularidades import resolver_viga
+
+
+def _lote(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    L = rng.uniform(5, 15, n)
+    puntuales = (rng.uniform(-10, 10, (n, 4)), rng.uniform(0, 1, (n, 4)) * L[:, None])
+    tramos = np.sort(rng.uniform(0, 1, (n, 2, 2)), axis=-1) * L[:, None, None]
+    distribuidas = (rng.uniform(-5, 5, (n, 2)), rng.uniform(-5, 5, (n, 2)), tramos[..., 0], tramos[..., 1])
+    momentos = (rng.uniform(-20, 20, (n, 1)), rng.uniform(0, 1, (n, 1)) * L[:, None])
+    return VigaBatch(L, puntuales, distribuidas, momentos)
+
+
+@pytest.mark.parametrize("bloque", [7, 2**11])
+def test_lote_contra_la_viga_exacta(bloque):
+    lote = _lote(40)
+    r = lote.resolver(EI=2.0, bloque=bloque)
+    for i in range(len(lote)):
+        d = resolver_viga(
+            lote.longitud[i],
+            np.column_stack([c[i] for c in lote.puntuales]),
+            np.column_stack([c[i] for c in lote.distribuidas]),
+            np.column_stack([c[i] for c in lote.momentos]),
+            EI=2.0,
+        )
+        _, m_max, _, m_min = d.momento.extremos()
+        _, v_max, _, v_min = d.cortante.extremos()
+        _, y_max, _, y_min = d.flecha.extremos()
+        assert (r.reacc_a[i], r.reacc_b[i]) == pytest.approx(d.reacciones)
+        assert r.momento_max[i] == pytest.approx(m_max, abs=1e-9)
+        assert r.momento_min[i] == pytest.approx(m_min, abs=1e-9)
+        assert r.cortante_max[i] == pytest.approx(max(v_max, -v_min), abs=1e-9)
+        assert r.flecha_max[i] == pytest.approx(max(y_max, -y_min), rel=1e-9)
+        assert abs(d.flecha(r.x_flecha_max[i])) == pytest.approx(r.flecha_max[i], rel=1e-9)
+
+
+def test_bloques_no_cambian_el_resultado():
+    lote = _lote(100, semilla=1)
+    entero, partido = lote.resolver(), lote.resolver(bloque=16)
+    for nombre in ("momento_max", "momento_min", "cortante_max", "flecha_max", "x_flecha_max"):
+        np.testing.assert_allclose(getattr(partido, nombre), getattr(entero, nombre), rtol=1e-9, atol=1e-9)
@@ -0,0 +1,27 @@
+import builtins
+import math
+
+import montecarlo
+
+
+def test_sin_resource_el_pico_es_nan(monkeypatch):
+    # En Windows no existe el módulo resource: montecarlo se importa igual
+    importar = builtins.__import__
+
+    def sin_resource(nombre, *args, **kwargs):
+        if nombre == "resource":
+            raise ImportError(nombre)
+        return importar(nombre, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", sin_resource)
+    assert math.isnan(montecarlo._pico_mb())
+
+
+def test_montecarlo_desde_la_viga():
+    from viga import Viga
+
+    viga = Viga(10.0)
+    viga.agregar_carga_distribuida(2.0, 0.0, 10.0)
+    resultado = viga.montecarlo(20_000, {0: {"magnitud": montecarlo.Normal(2.0, 0.1)}}, semilla=1)
+    assert resultado.n == 20_000
+    assert abs(resultado.momento.media - 2.0 * 10.0**2 / 8) < 5 * 0.1 * 10.0**2 / 8 / 20_000**0.5
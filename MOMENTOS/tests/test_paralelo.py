@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+import cache
+from paralelo import resolver_en_paralelo, verificar
+from procesar import resolver_casos
+
+
+def _casos(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    casos = []
+    for i in range(n):
+        L = float(rng.uniform(2.0, 20.0))
+        caso = {
+            "id": f"v{i}",
+            "longitud": L,
+            "puntuales": [[float(rng.uniform(-5, 20)), float(rng.uniform(0, L))] for _ in range(rng.integers(0, 4))],
+            "distribuidas": [sorted([float(rng.uniform(0, L)) for _ in range(2)]) for _ in range(rng.integers(0, 2))],
+            "momentos": [[float(rng.uniform(-10, 10)), float(rng.uniform(0, L))] for _ in range(rng.integers(0, 2))],
+            "EI": float(rng.uniform(1e3, 1e5)),
+        }
+        caso["distribuidas"] = [[2.0, 3.0, a, b] for a, b in caso["distribuidas"]]
+        if i % 3 == 1:
+            caso["apoyos"] = [[0.0, "fixedSupport"], [L / 2, "rollerSupport"], [L, "rollerSupport"]]
+        casos.append(caso)
+    # Casos inválidos en medio del lote
+    casos[5] = dict(casos[5], EI=0)
+    casos[11] = {"id": "sin longitud", "puntuales": [[1.0, 1.0]]}
+    casos[17] = dict(casos[17], apoyos=[[0.0, "rollerSupport"]])
+    casos[23] = {"id": 24, "error": "JSON inválido"}
+    return casos
+
+
+def _segmentos():
+    return {nombre for nombre in os.listdir("/dev/shm") if nombre.startswith("psm_")}
+
+
+def test_paralelo_identico_a_la_serie():
+    distintos, _, _ = verificar(_casos(60), procesos=2, tamano_bloque=7)
+    assert distintos == []
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="sin /dev/shm para contar segmentos")
+def test_cerrar_antes_de_tiempo_libera_los_segmentos():
+    antes = _segmentos()
+    resultados = resolver_en_paralelo(_casos(60), procesos=2, tamano_bloque=4, en_vuelo=6)
+    assert next(resultados)["id"] == "v0"
+    resultados.close()
+    assert _segmentos() <= antes
+
+
+def test_dos_procesos_escriben_la_misma_cache(tmp_path):
+    ruta = str(tmp_path / "resultados.sqlite")
+    casos = _casos(80)
+    serie = list(resolver_casos(casos))
+    assert list(resolver_en_paralelo(casos, procesos=2, tamano_bloque=5, ruta_cache=ruta)) == serie
+    assert list(resolver_en_paralelo(casos, procesos=2, tamano_bloque=5, ruta_cache=ruta)) == serie
+    validos = len({r["id"] for r in serie if "error" not in r})
+    with sqlite3.connect(ruta) as base:
+        (filas,) = base.execute("SELECT COUNT(*) FROM resultados").fetchone()
+    assert filas == validos
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="los hijos deben heredar la espera")
+def test_base_bloqueada_falla_solo_los_casos(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "resultados.sqlite")
+    list(resolver_en_paralelo(_casos(30)[:1], procesos=1, ruta_cache=ruta))  # Crea la base
+    monkeypatch.setattr(cache, "ESPERA_BLOQUEO_S", 0.05)
+    bloqueo = sqlite3.connect(ruta)
+    bloqueo.execute("BEGIN IMMEDIATE")  # Otro escritor con la base tomada
+    try:
+        resultados = list(resolver_en_paralelo(_casos(30), procesos=2, tamano_bloque=5, ruta_cache=ruta))
+    finally:
+        bloqueo.rollback()
+        bloqueo.close()
+    assert [r["id"] for r in resultados] == [c.get("id") for c in _casos(30)]
+    assert all("error" in r for r in resultados)
+    assert any("locked" in r["error"] for r in resultados)
@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+from procesar import leer_csv, leer_jsonl, main, resolver_casos
+
+
+@pytest.mark.parametrize(
+    "caso",
+    [
+        {"longitud": 10, "EI": 0, "puntuales": [[1, 5]]},
+        {"longitud": 0, "puntuales": [[1, 5]]},
+        {"longitud": -1, "puntuales": [[1, 5]]},
+        {"longitud": float("nan"), "puntuales": [[1, 5]]},
+        {"longitud": 10, "EI": float("inf")},
+        {"longitud": 10, "puntuales": [[float("nan"), 5]]},
+    ],
+)
+def test_caso_invalido_da_registro_de_error(caso):
+    (resultado,) = resolver_casos([dict(caso, id="malo")])
+    assert resultado["id"] == "malo" and resultado["error"]
+
+
+def test_caso_invalido_no_detiene_el_lote(monkeypatch, capsys):
+    lineas = [
+        {"id": "a", "longitud": 10, "puntuales": [[2, 5]]},
+        {"id": "b", "longitud": 10, "EI": 0, "puntuales": [[2, 5]]},
+        {"id": "c", "longitud": 10, "puntuales": [[2, 5]]},
+    ]
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(json.dumps(c) + "\n" for c in lineas)))
+    main([])
+    resultados = [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+    assert [r["id"] for r in resultados] == ["a", "b", "c"]
+    assert "error" in resultados[1] and resultados[0]["reacciones"] == resultados[2]["reacciones"]
+
+
+def test_leer_jsonl_linea_ilegible():
+    (caso,) = leer_jsonl(["{no es json\n"])
+    assert caso["id"] == 1 and "error" in caso
+
+
+def test_csv_sin_columna_caso_es_un_error_claro():
+    with pytest.raises(ValueError, match="caso"):
+        list(leer_csv(["longitud,tipo,posicion,magnitud\n", "10,puntual,5,1\n"]))
+
+
+def test_csv_fila_corta_es_un_error_de_su_caso():
+    lineas = [
+        "longitud,tipo,posicion,magnitud,caso\n",
+        "10,puntual,5,1,a\n",
+        "10,puntual\n",
+        "10,puntual,5,1,c\n",
+    ]
+    casos = list(leer_csv(lineas))
+    assert [c["id"] for c in casos] == ["a", None, "c"]
+    assert "error" in casos[1] and "error" not in casos[0] and "error" not in casos[2]
+    resultados = list(resolver_casos(casos))
+    assert "error" in resultados[1] and resultados[0]["reacciones"] == resultados[2]["reacciones"]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from rigidez import resolver_continua, resolver_continua_cargas
+from singularidades import columnas_de_cargas, resolver_viga
+
+L = 10.0
+SIMPLE = [(0.0, "simpleSupport"), (L, "rollerSupport")]
+
+
+def test_carga_junto_al_apoyo_va_al_nodo_fundido():
+    # A menos de la separación mínima de un apoyo la carga va a ese nodo, no al siguiente
+    d = resolver_continua_cargas(L, SIMPLE, columnas_de_cargas([(10.0, 1e-12), (1.0, 7.0)]))
+    assert [f for _, f, _ in d.reacciones] == pytest.approx([10.0 + 3 / L, 7 / L])
+
+
+@pytest.mark.parametrize(
+    "puntuales, x",
+    [
+        ([(10.0, 5.0), (10.0, 5.0 + 1e-12)], 7.5),
+        ([(10.0, 5.0), (10.0, 4.4e-16)], 1.0),
+        ([(10.0, 5.0), (10.0, L - 1e-12)], 7.5),
+    ],
+)
+def test_diagramas_con_cargas_fundidas(puntuales, x):
+    # Las reacciones salen de los nodos fundidos, pero el diagrama usa las posiciones reales
+    d = resolver_continua(L, SIMPLE, puntuales=puntuales)
+    exacto = resolver_viga(L, puntuales=puntuales)
+    assert d.momento(x) == pytest.approx(exacto.momento(x), abs=1e-9)
+    assert d.cortante(x) == pytest.approx(exacto.cortante(x), abs=1e-9)
+    xs = np.linspace(0.0, L, 41)
+    np.testing.assert_allclose(d.momento(xs), exacto.momento(xs), atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "apoyos",
+    [
+        [(0.0, "simpleSupport"), (0.0, "rollerSupport")],
+        [(5.0, "rollerSupport"), (5.0 + 1e-12, "rollerSupport")],
+        [(0.0, "rollerSupport")],
+    ],
+)
+def test_mecanismo_por_posiciones_distintas(apoyos):
+    with pytest.raises(ValueError, match="mecanismo"):
+        resolver_continua(L, apoyos, puntuales=[(10.0, 5.0)])
+
+
+def test_apoyos_repetidos_no_duplican_la_reaccion():
+    apoyos = [(0.0, "simpleSupport"), (0.0, "rollerSupport"), (L, "rollerSupport")]
+    d = resolver_continua(L, apoyos, puntuales=[(10.0, 5.0)])
+    assert [f for _, f, _ in d.reacciones] == pytest.approx([5.0, 0.0, 5.0])
+
+
+@pytest.mark.parametrize("x", [12.0, -1.0, float("nan")])
+def test_apoyo_fuera_de_la_viga(x):
+    with pytest.raises(ValueError, match="apoyos fuera"):
+        resolver_continua(L, [(0.0, "simpleSupport"), (x, "rollerSupport")], puntuales=[(10.0, 5.0)])
+
+
+@pytest.mark.parametrize("puntuales, distribuidas", [([(1.0, 11.0)], None), (None, [(1.0, 1.0, -2.0, 3.0)])])
+def test_cargas_fuera_de_la_viga_en_ambos_caminos(puntuales, distribuidas):
+    with pytest.raises(ValueError, match="cargas fuera"):
+        resolver_continua(L, SIMPLE, puntuales, distribuidas)
+    with pytest.raises(ValueError, match="cargas fuera"):
+        resolver_viga(L, puntuales, distribuidas)
+
+
+def test_redondeo_en_el_extremo_se_acepta():
+    d = resolver_continua(L, SIMPLE, puntuales=[(10.0, L * (1 + 1e-12))])
+    exacto = resolver_viga(L, puntuales=[(10.0, L * (1 + 1e-12))])
+    assert [f for _, f, _ in d.reacciones] == pytest.approx(list(exacto.reacciones), abs=1e-9)
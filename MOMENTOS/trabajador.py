@@ -0,0 +1,66 @@
+import queue
+import threading
+
+from instrumentos import contar, fase
+
+# Cálculos fuera del bucle principal de Tkinter.
+# Un único hilo de trabajo por ventana atiende sólo la petición más reciente: las que
+# llegan mientras otra está en curso reemplazan a las que esperaban, y el resultado de
+# un cálculo ya superado se descarta. Los resultados vuelven al hilo de Tk por una cola
+# que se revisa con root.after (Tk no admite llamadas desde otros hilos).
+
+INTERVALO_REVISION_MS = 20
+
+
+class Trabajador:
+    def __init__(self, root):
+        self.root = root
+        self._condicion = threading.Condition()
+        self._pendiente = None
+        self._generacion = 0
+        self._resultados = queue.SimpleQueue()
+        threading.Thread(target=self._bucle, daemon=True).start()
+        self.root.after(INTERVALO_REVISION_MS, self._revisar)
+
+    def enviar(self, calcular, al_terminar, al_fallar=None):
+        # calcular() corre en el hilo de trabajo y no debe tocar widgets; al_terminar y
+        # al_fallar reciben el resultado o la excepción en el hilo de Tk
+        with self._condicion:
+            self._generacion += 1
+            self._pendiente = (self._generacion, calcular, al_terminar, al_fallar)
+            self._condicion.notify()
+
+    def cancelar(self):
+        # Descarta la petición que espera y el resultado de la que esté en curso
+        with self._condicion:
+            self._generacion += 1
+            self._pendiente = None
+
+    def vigente(self, generacion):
+        return generacion == self._generacion
+
+    def _bucle(self):
+        while True:
+            with self._condicion:
+                while self._pendiente is None:
+                    self._condicion.wait()
+                generacion, calcular, al_terminar, al_fallar = self._pendiente
+                self._pendiente = None
+            try:
+                with fase("trabajador.calculo"):
+                    resultado = calcular()
+                self._resultados.put((generacion, al_terminar, resultado))
+            except Exception as error:  # Se informa en el hilo de Tk
+                self._resultados.put((generacion, al_fallar, error))
+
+    def _revisar(self):
+        while True:
+            try:
+                generacion, entregar, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if not self.vigente(generacion):
+                contar("trabajador.descartados")
+            elif entregar is not None:
+                entregar(valor)
+        self.root.after(INTERVALO_REVISION_MS, self._revisar)
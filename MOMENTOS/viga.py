@@ -0,0 +1,238 @@
+import numpy as np
+
+from cargas import DISTRIBUIDA, MOMENTO, PUNTUAL, TablaCargas
+from combinaciones import Combinaciones
+from influencia import LineasInfluencia
+from instrumentos import contar, medido
+from singularidades import deformadas, resolver_cargas
+
+CASO_GENERAL = "general"
+
+
+class Viga:
+    # Viga simplemente apoyada en x = 0 y x = longitud.
+    # Lleva totales de fuerza y momento actualizados en cada alta/baja de carga,
+    # y una caché de resultados invalidada por un contador de versión.
+    # La sección (EI) es constante por tramos; se guarda como flexibilidad 1/EI por
+    # tramo, que no cambia al cambiar las cargas.
+    def __init__(self, longitud, EI=1.0):
+        self._longitud = longitud
+        self.cargas = TablaCargas()
+        self.inicio_seccion = np.array([0.0])
+        self.flexibilidad = np.array([1.0 / EI])
+
+        self.suma_fuerzas = 0.0
+        self.momento_total = 0.0  # Horario, respecto de x = 0
+        self.version = 0
+        self._cache = {}
+        self._influencia = {}  # Por (longitud, puntos): no depende de las cargas
+        self.casos = {CASO_GENERAL: 0}  # Nombre del caso de carga -> código en la tabla
+
+    @property
+    def longitud(self):
+        return self._longitud
+
+    @longitud.setter
+    def longitud(self, valor):
+        self._longitud = valor
+        self.version += 1
+
+    def _acumular(self, fuerza, momento):
+        self.suma_fuerzas += fuerza
+        self.momento_total += momento
+        self.version += 1
+
+    def _memo(self, clave, calcular):
+        version, valor = self._cache.get(clave, (None, None))
+        if version != self.version:
+            contar("viga.cache_fallos")
+            valor = calcular()
+            self._cache[clave] = (self.version, valor)
+        return valor
+
+    # Listas de tuplas para dibujar; los cálculos usan directamente las columnas de la tabla
+    @property
+    def cargas_puntuales(self):
+        return self.cargas.filas(PUNTUAL)
+
+    @property
+    def cargas_distribuidas(self):
+        return self.cargas.filas(DISTRIBUIDA)  # (q_inicio, q_fin, inicio, fin)
+
+    @property
+    def momentos_concentrados(self):
+        return self.cargas.filas(MOMENTO)
+
+    def definir_seccion(self, EI, inicio=0.0, fin=None):
+        # Rigidez EI en [inicio, fin); el resto de los tramos conserva la suya
+        fin = self.longitud if fin is None else fin
+        inicios = np.union1d(self.inicio_seccion, [inicio, fin])
+        inicios = inicios[inicios < self.longitud]  # En L no empieza ningún tramo
+        flexibilidad = self.flexibilidad[np.searchsorted(self.inicio_seccion, inicios, side="right") - 1]
+        flexibilidad[(inicios >= inicio) & (inicios < fin)] = 1.0 / EI
+        # Tramos contiguos con la misma sección se funden
+        distinto = np.concatenate([[True], flexibilidad[1:] != flexibilidad[:-1]])
+        self.inicio_seccion, self.flexibilidad = inicios[distinto], flexibilidad[distinto]
+        self.version += 1
+
+    def copia(self):
+        # Instantánea independiente de cargas y sección, con la caché vacía
+        copia = Viga(self.longitud)
+        copia.cargas = self.cargas.copiar()
+        copia.inicio_seccion, copia.flexibilidad = self.inicio_seccion.copy(), self.flexibilidad.copy()
+        copia.suma_fuerzas, copia.momento_total = self.suma_fuerzas, self.momento_total
+        copia.casos = dict(self.casos)
+        return copia
+
+    def _codigo_caso(self, caso):
+        return self.casos.setdefault(caso, len(self.casos))
+
+    def agregar_carga_puntual(self, magnitud, posicion, caso=CASO_GENERAL):
+        self.cargas.agregar(PUNTUAL, magnitud, posicion, caso=self._codigo_caso(caso))
+        self._acumular(magnitud, magnitud * posicion)
+
+    def eliminar_carga_puntual(self, posicion, tolerancia=0.1):
+        filas = self.cargas.buscar(posicion, tolerancia, PUNTUAL)
+        _, magnitud, _, posiciones, _ = self.cargas.columnas()
+        self._acumular(
+            -float(magnitud[filas].sum()), -float(np.dot(magnitud[filas], posiciones[filas]))
+        )
+        self.cargas.eliminar(filas)
+
+    def mover_carga_puntual(self, fila, posicion):
+        # Mueve la carga de esa fila de la tabla y devuelve su fila nueva
+        magnitud, anterior = self.cargas.fila(fila)
+        self._acumular(0.0, magnitud * (posicion - anterior))
+        return self.cargas.mover(fila, posicion)
+
+    def agregar_carga_distribuida(self, magnitud, inicio, fin, magnitud_fin=None, caso=CASO_GENERAL):
+        # Uniforme si no se indica magnitud_fin; si no, varía linealmente
+        if magnitud_fin is None:
+            magnitud_fin = magnitud
+        self.cargas.agregar(DISTRIBUIDA, magnitud, inicio, fin, magnitud_fin, self._codigo_caso(caso))
+        resultante = (magnitud + magnitud_fin) / 2 * (fin - inicio)
+        self._acumular(
+            resultante, resultante * inicio + (fin - inicio) ** 2 * (magnitud + 2 * magnitud_fin) / 6
+        )
+
+    def agregar_momento_concentrado(self, magnitud, posicion, caso=CASO_GENERAL):
+        self.cargas.agregar(MOMENTO, magnitud, posicion, caso=self._codigo_caso(caso))
+        self._acumular(0.0, magnitud)
+
+    def calcular_reacciones(self):
+        return self._memo("reacciones", self._reacciones)
+
+    @medido("viga.reacciones")
+    def _reacciones(self):
+        reacc_b = self.momento_total / self.longitud
+        reacc_a = self.suma_fuerzas - reacc_b
+        return reacc_a, reacc_b
+
+    def calcular_diagramas(self):
+        return self._memo("diagramas", self._diagramas)
+
+    @medido("viga.diagramas")
+    def _diagramas(self):
+        return self._resolver_columnas(self.cargas.columnas(), self.calcular_reacciones())
+
+    def _resolver_columnas(self, columnas, reacciones=None):
+        # Diagramas de esas cargas con la sección de la viga
+        if len(self.flexibilidad) == 1:
+            return resolver_cargas(
+                self.longitud, columnas, EI=1.0 / self.flexibilidad[0], reacciones=reacciones
+            )
+        diagramas = resolver_cargas(self.longitud, columnas, reacciones=reacciones)
+        diagramas.giro, diagramas.flecha = deformadas(
+            diagramas.momento,
+            [(0.0, 0, 0.0), (self.longitud, 0, 0.0)],
+            self.inicio_seccion,
+            self.flexibilidad,
+        )
+        return diagramas
+
+    def resolver_elementos(self, apoyos=None, resortes=None, GA=None, tamano_maximo=None):
+        # Modo de elementos finitos con la sección de la viga: apoyos y resortes
+        # arbitrarios (por defecto, los extremos simplemente apoyados); ver elementos.py
+        from elementos import resolver_elementos
+
+        if apoyos is None:
+            apoyos = [(0.0, "simpleSupport"), (self.longitud, "rollerSupport")]
+        return resolver_elementos(
+            self.longitud, apoyos, self.cargas.columnas(), EI=(self.inicio_seccion, 1.0 / self.flexibilidad),
+            GA=GA, resortes=resortes, tamano_maximo=tamano_maximo,
+        )
+
+    def montecarlo(self, muestras, inciertas=None, E=None, I=None, semilla=None):
+        # Momento, flecha y cortante máximos de muestras con cargas, posiciones y rigidez
+        # inciertas, acumulados en memoria constante; ver montecarlo.py
+        from montecarlo import simular
+
+        return simular(self, muestras, inciertas, E, I, semilla)
+
+    def calcular_momentos(self, puntos=None, tolerancia=None):
+        # Sin `puntos`, muestreo adaptativo con los cortes y extremos exactos;
+        # con `puntos`, malla uniforme (la que usa el diagrama incremental)
+        clave = ("momentos_adaptativo", tolerancia) if puntos is None else ("momentos_malla", puntos)
+        return self._memo(clave, lambda: self._muestrear_momentos(puntos, tolerancia))
+
+    @medido("viga.muestreo")
+    def _muestrear_momentos(self, puntos, tolerancia):
+        momento = self.calcular_diagramas().momento
+        if puntos is None:
+            return momento.muestrear_adaptativo(tolerancia)
+        return momento.muestrear(puntos)
+
+    def calcular_deformada(self, tolerancia=None):
+        # (x, giro, flecha) con el muestreo adaptativo de la flecha
+        def calcular():
+            diagramas = self.calcular_diagramas()
+            x, flecha = diagramas.flecha.muestrear_adaptativo(tolerancia)
+            return x, diagramas.giro(x), flecha
+
+        return self._memo(("deformada", tolerancia), calcular)
+
+    def diagramas_por_caso(self):
+        # Un cálculo por caso de carga con alguna carga activa
+        return self._memo("casos", self._diagramas_por_caso)
+
+    @medido("viga.casos")
+    def _diagramas_por_caso(self):
+        columnas, codigos, activas = self.cargas.columnas(), self.cargas.casos(), self.cargas.activas()
+        diagramas = {}
+        for nombre, codigo in self.casos.items():
+            filas = activas & (codigos == codigo)
+            if filas.any():
+                diagramas[nombre] = self._resolver_columnas(tuple(c[filas] for c in columnas))
+        return diagramas
+
+    def combinar(self, combinaciones, puntos=501):
+        # combinaciones: {nombre: {caso: factor}}; ver Combinaciones
+        return Combinaciones(self.longitud, self.diagramas_por_caso(), combinaciones, puntos)
+
+    def lineas_influencia(self, puntos=201):
+        clave = (self.longitud, puntos)
+        if clave not in self._influencia:
+            self._influencia[clave] = LineasInfluencia(self.longitud, puntos=puntos)
+        return self._influencia[clave]
+
+    def envolventes_tren(self, ejes, puntos=201, ambos_sentidos=True):
+        # ejes: filas (magnitud, posición relativa en el tren)
+        return self.lineas_influencia(puntos).envolventes(ejes, ambos_sentidos)
+
+    def graficar_momentos(self):
+        dibujar_momentos(*self.calcular_momentos())
+
+
+def dibujar_momentos(x, momentos):
+    # Separado del cálculo para que una interfaz pueda calcular en segundo plano.
+    # pyplot se importa aquí: el cálculo no debe pagar su carga ni necesitar pantalla
+    import matplotlib.pyplot as plt
+
+    plt.plot(x, momentos, label="Momento Flector")
+    plt.axhline(0, color="black", linewidth=0.8, linestyle="--")
+    plt.title("Diagrama de Momentos Flectores")
+    plt.xlabel("Longitud (m)")
+    plt.ylabel("Momento Flector (kNm)")
+    plt.legend()
+    plt.grid()
+    plt.show()